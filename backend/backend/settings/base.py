@@ -24,11 +24,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'workouts.middleware.MetricsMiddleware',
+    'workouts.middleware.RequestTimingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'workouts.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -65,6 +68,54 @@ DATABASES = {
     }
 }
 
+# Cache (local memory by default; point CACHE_BACKEND at
+# django.core.cache.backends.filebased.FileBasedCache to share across workers)
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'fitapp'),
+    }
+}
+
+# Analytics results are cached per user and invalidated by bumping a
+# per-user data version on every workout write
+ANALYTICS_CACHE_ALIAS = 'default'
+ANALYTICS_CACHE_TIMEOUT = int(os.environ.get('ANALYTICS_CACHE_TIMEOUT', str(60 * 60 * 24)))
+
+# Workout history pages (?page_size= / ?cursor= on /api/workouts/)
+WORKOUT_PAGE_SIZE = int(os.environ.get('WORKOUT_PAGE_SIZE', '20'))
+WORKOUT_MAX_PAGE_SIZE = 100
+
+# Delta sync (/api/sync/): deletions are remembered this long; older
+# tokens get a full resync
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', '90'))
+
+# The global exercise catalog only changes between deploys
+EXERCISE_CATALOG_MAX_AGE = int(os.environ.get('EXERCISE_CATALOG_MAX_AGE', str(60 * 60 * 24)))
+
+# Per-request SQL count and timings as a Server-Timing header, plus a
+# JSON log line on 'workouts.performance' for requests slower than
+# REQUEST_TIMING_SLOW_MS; the middleware drops out entirely when disabled
+REQUEST_TIMING_ENABLED = os.environ.get('REQUEST_TIMING_ENABLED', 'false').lower() == 'true'
+REQUEST_TIMING_SLOW_MS = int(os.environ.get('REQUEST_TIMING_SLOW_MS', '500'))
+
+# Request counts and latency histograms per route, served in Prometheus
+# format at /api/metrics/ (staff only). With several gunicorn workers, point
+# METRICS_DIR at a directory they share; each worker writes its values there
+# every METRICS_FLUSH_INTERVAL seconds and a scrape merges them. Files not
+# rewritten for METRICS_STALE_AFTER seconds (exited workers) are deleted
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+METRICS_DIR = os.environ.get('METRICS_DIR') or None
+METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', '5'))
+METRICS_STALE_AFTER = float(os.environ.get('METRICS_STALE_AFTER', '600'))
+
+# When enabled, staff can profile a single request with an X-Profile header
+# or ?profile= flag; reports are written to PROFILING_DIR, keeping the
+# newest PROFILING_MAX_REPORTS. Untouched requests pay only the flag check
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true'
+PROFILING_DIR = os.environ.get('PROFILING_DIR', os.path.join(BASE_DIR, 'profiles'))
+PROFILING_MAX_REPORTS = int(os.environ.get('PROFILING_MAX_REPORTS', '20'))
+
 # Static files
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
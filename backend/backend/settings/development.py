@@ -5,6 +5,8 @@ SECRET_KEY = 'django-insecure-5&3zc_@lt9kbcn_w=%!eg-6ly*1o^bhhg&$g2_-md$&+yruxbj
 ALLOWED_HOSTS = ['localhost', '127.0.0.1']
 
 # Development-specific settings
+REQUEST_TIMING_ENABLED = os.environ.get('REQUEST_TIMING_ENABLED', 'true').lower() == 'true'
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:8000",
     "http://127.0.0.1:8000",
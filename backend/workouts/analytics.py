@@ -1,116 +1,477 @@
 # backend/workouts/analytics.py
 
-from datetime import datetime, timedelta
-from django.db.models import F, Sum
-from django.db.models.functions import ExtractWeek, ExtractYear
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+import numpy as np
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncDay, TruncMonth, TruncWeek, TruncYear
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from django.utils import timezone
-from .models import Workout, PerformedExercise
+from django.utils.dateparse import parse_date, parse_datetime
+from .catalog import get_muscle_matrix
+from .models import (
+    DailyMuscleGroupStats, DailyStats, Exercise, PerformedExercise, PerformedSet, PersonalRecord, Workout,
+)
+from .muscle_load import MuscleLoadMatrix, muscle_loads
+from .exceptions.exceptions import InvalidQueryParameterError
+
+# Upper bound for the top-workouts endpoint's ``limit`` parameter
+MAX_TOP_WORKOUTS = 100
+
+# Sections /api/analytics/dashboard/ can return
+DASHBOARD_SECTIONS = ('weekly_volume', 'weekly_frequency', 'top_workouts', 'current_week')
+
+# Bucket sizes /api/analytics/muscle-groups/ accepts
+MUSCLE_GROUP_PERIODS = ('week', 'month')
+
+# Estimated 1RM formulas for progression, mapped to their precomputed column
+E1RM_FORMULAS = {
+    'epley': 'estimated_1rm',
+    'brzycki': 'estimated_1rm_brzycki',
+}
+
+# Bucket sizes the daily rollups can be composed into
+ROLLUP_PERIODS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+    'year': TruncYear,
+}
 
 def calculate_volume_per_set(performed_exercise):
     """Calculate total volume for a performed exercise"""
-    volume = 0
-    for reps, weight in zip(performed_exercise.reps_per_set, 
-                          performed_exercise.weights_per_set or [0] * len(performed_exercise.reps_per_set)):
-        volume += reps * (weight or 0)  # handle None weights as 0
-    return volume
+    return performed_exercise.calculate_volume()
 
-def get_weekly_volume_data(user, start_date=None, end_date=None):
-    """Get weekly workout volume data for a user"""
-    # Default to last 6 months if no dates provided
+def parse_timezone(name):
+    """Resolve an IANA timezone name for week bucketing, defaulting to UTC"""
+    if not name or name.upper() == 'UTC':
+        return dt_timezone.utc
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise InvalidQueryParameterError(f"Unknown timezone '{name}'.")
+
+def _default_range(start_date, end_date):
+    """Default to the last 6 months when no dates are provided"""
     if not end_date:
         end_date = timezone.now()
     if not start_date:
         start_date = end_date - timedelta(days=180)
+    return start_date, end_date
+
+def parse_date_param(value, name):
+    """
+    Parse an ISO 8601 date or datetime query parameter into an aware datetime.
+
+    Accepts a trailing 'Z' or an explicit offset; naive values and bare dates
+    are taken as UTC.
+    """
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            parsed = datetime.combine(day, time.min) if day else None
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise InvalidQueryParameterError(f"Invalid {name} '{value}'.")
+    if timezone.is_naive(parsed):
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed
+
+def _local_day_range(start_date=None, end_date=None, tz=dt_timezone.utc):
+    """
+    Widen a requested range to whole days local to tz.
+
+    Runs from midnight on the first day to the last instant of the last one.
+    Default ranges end at now(), so without this every request would query
+    (and cache) a slightly different range.
+    """
+    start_date, end_date = _default_range(start_date, end_date)
+    return (
+        datetime.combine(start_date.astimezone(tz).date(), time.min, tzinfo=tz),
+        datetime.combine(end_date.astimezone(tz).date(), time.max, tzinfo=tz),
+    )
+
+def range_cache_key(start_date=None, end_date=None, tz=dt_timezone.utc):
+    """
+    Stable cache key for a requested range: the days it spans, local to tz.
+
+    Every range-based query widens its bounds with ``_local_day_range``, so
+    two requests that span the same local days read the same rows. Within a
+    day the end only moves past sessions logged since, and logging one
+    bumps the data version anyway.
+    """
+    start_date, end_date = _local_day_range(start_date, end_date, tz)
+    return f"{start_date.date()}..{end_date.date()}"
 
-    # Get all workouts in date range
-    workouts = Workout.objects.filter(
-        user=user,
-        date__range=(start_date, end_date)
-    ).prefetch_related('performed_exercises')
-
-    # Initialize weekly volume dictionary
-    weekly_volumes = {}
-
-    for workout in workouts:
-        # Get the ISO week number and year
-        year = workout.date.isocalendar()[0]
-        week = workout.date.isocalendar()[1]
-        week_key = f"{year}-W{week:02d}"
-
-        # Calculate total volume for this workout
-        workout_volume = 0
-        for performed_exercise in workout.performed_exercises.all():
-            workout_volume += calculate_volume_per_set(performed_exercise)
-
-        # Add to weekly totals and count
-        if week_key not in weekly_volumes:
-            weekly_volumes[week_key] = {
-                'total_volume': 0,
-                'workout_count': 0
-            }
-        weekly_volumes[week_key]['total_volume'] += workout_volume
-        weekly_volumes[week_key]['workout_count'] += 1
-
-    # Calculate averages and format response
+def _week_key(week_start):
+    """Format the Monday a week was truncated to as an ISO week key"""
+    year, week, _ = week_start.isocalendar()
+    return f"{year}-W{week:02d}"
+
+def get_rollup_buckets(user, period='week', start_date=None, end_date=None, by_muscle_group=False):
+    """
+    Compose a user's daily rollups into day/week/month/year buckets.
+
+    Reads DailyStats (or DailyMuscleGroupStats when ``by_muscle_group``), so
+    the cost depends on the number of days in range rather than the number
+    of logged sets. The range is widened to whole UTC days.
+    """
+    start_date, end_date = _local_day_range(start_date, end_date)
+    model = DailyMuscleGroupStats if by_muscle_group else DailyStats
+    group_by = ['bucket', 'muscle_group'] if by_muscle_group else ['bucket']
+    totals = {
+        'total_volume': Sum('total_volume'),
+        'set_count': Sum('set_count'),
+        'rep_count': Sum('rep_count'),
+    }
+    if not by_muscle_group:
+        totals['workout_count'] = Sum('workout_count')
+    return (
+        model.objects.filter(
+            user=user,
+            day__range=(start_date.date(), end_date.date()),
+        )
+        .annotate(bucket=ROLLUP_PERIODS[period]('day'))
+        .values(*group_by)
+        .annotate(**totals)
+        .order_by(*group_by)
+    )
+
+def _weekly_buckets(user, start_date, end_date, tz):
+    """
+    Group a user's workouts into ISO weeks in the database.
+
+    UTC weeks are composed from the daily rollups. Other timezones cannot
+    be derived from UTC days, so those truncate raw workout dates in ``tz``
+    instead; either way each bucket carries the summed ``total_volume`` and
+    workout count in a single query.
+    """
+    if tz is dt_timezone.utc:
+        return [
+            {**row, 'week_start': row['bucket']}
+            for row in get_rollup_buckets(user, 'week', start_date, end_date)
+            if row['workout_count']
+        ]
+    start_date, end_date = _local_day_range(start_date, end_date, tz)
+    return (
+        Workout.objects.filter(user=user, date__range=(start_date, end_date))
+        .annotate(week_start=TruncWeek('date', tzinfo=tz))
+        .values('week_start')
+        .annotate(total_volume=Sum('total_volume'), workout_count=Count('id'))
+        .order_by('week_start')
+    )
+
+def _format_weekly_volume(buckets):
     formatted_data = []
-    for week_key, data in sorted(weekly_volumes.items()):
-        avg_volume = data['total_volume'] / data['workout_count']
+    for bucket in buckets:
+        total_volume = bucket['total_volume'] or 0
+        avg_volume = total_volume / bucket['workout_count']
         formatted_data.append({
-            'week': week_key,
+            'week': _week_key(bucket['week_start']),
             'avgVolumePerWorkout': round(avg_volume, 2),
-            'totalVolume': round(data['total_volume'], 2),
-            'workoutCount': data['workout_count']
+            'totalVolume': round(total_volume, 2),
+            'workoutCount': bucket['workout_count']
         })
-
     return formatted_data
 
+def _format_weekly_frequency(buckets):
+    return [
+        {
+            'week': _week_key(bucket['week_start']),
+            'workoutCount': bucket['workout_count'],
+        }
+        for bucket in buckets
+    ]
+
+def get_weekly_volume_data(user, start_date=None, end_date=None, tz=dt_timezone.utc):
+    """Get weekly workout volume data for a user"""
+    return _format_weekly_volume(_weekly_buckets(user, start_date, end_date, tz))
+
 def get_top_workouts_by_volume(user, limit=5):
-    """Get the top workouts by total volume for a user"""
-    workouts = Workout.objects.filter(user=user).prefetch_related('performed_exercises')
-    
-    # Calculate volume for each workout
-    workout_volumes = []
-    for workout in workouts:
-        total_volume = 0
-        for performed_exercise in workout.performed_exercises.all():
-            total_volume += calculate_volume_per_set(performed_exercise)
-            
-        workout_volumes.append({
-            'id': workout.id,
-            'date': workout.date,
-            'name': workout.name,
-            'total_volume': total_volume,
-            'exercise_count': workout.performed_exercises.count()
-        })
-    
-    # Sort by volume and get top N
-    sorted_workouts = sorted(workout_volumes, key=lambda x: x['total_volume'], reverse=True)[:limit]
-    
-    return sorted_workouts
+    """
+    Get the top workouts by total volume for a user.
+
+    Runs as a top-N scan over the (user, -total_volume, -date, -id) index,
+    so equal volumes come back newest first in a stable order; the exercise
+    count is a correlated subquery so it is only evaluated for the rows kept.
+    """
+    limit = max(1, min(limit, MAX_TOP_WORKOUTS))
+    exercise_count = (
+        PerformedExercise.objects.filter(workout=OuterRef('pk'))
+        .order_by()
+        .values('workout')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    workouts = (
+        Workout.objects.filter(user=user)
+        .order_by('-total_volume', '-date', '-id')
+        .annotate(exercise_count=Coalesce(Subquery(exercise_count), 0))
+        .values('id', 'date', 'name', 'total_volume', 'exercise_count')
+    )
+    return list(workouts[:limit])
 
-def get_weekly_workout_frequency(user, start_date=None, end_date=None):
+def get_weekly_workout_frequency(user, start_date=None, end_date=None, tz=dt_timezone.utc):
     """Get weekly workout frequency (count of workouts) for a user"""
-    if not end_date:
-        end_date = timezone.now()
-    if not start_date:
-        start_date = end_date - timedelta(days=180)
+    return _format_weekly_frequency(_weekly_buckets(user, start_date, end_date, tz))
+
+def _current_week_stats(weekly_volumes, end_date, tz):
+    """Totals for the ISO week containing end_date and the week before it"""
+    by_week = {row['week']: row for row in weekly_volumes}
+    local_end = end_date.astimezone(tz)
+
+    def week_stats(moment):
+        key = _week_key(moment)
+        row = by_week.get(key, {})
+        return {
+            'week': key,
+            'totalVolume': row.get('totalVolume', 0),
+            'workoutCount': row.get('workoutCount', 0),
+            'avgVolumePerWorkout': row.get('avgVolumePerWorkout', 0),
+        }
+
+    return {
+        **week_stats(local_end),
+        'previous': week_stats(local_end - timedelta(days=7)),
+    }
+
+def get_dashboard_data(user, sections=DASHBOARD_SECTIONS, start_date=None, end_date=None,
+                       tz=dt_timezone.utc, top_limit=5):
+    """
+    Compute several dashboard sections from one weekly bucket read.
+
+    Weekly volume, weekly frequency and current-week stats all come from the
+    same rollup (or raw, for non-UTC timezones) query; top workouts adds the
+    indexed top-N query only when requested.
+    """
+    start_date, end_date = _default_range(start_date, end_date)
+    data = {}
+    if set(sections) & {'weekly_volume', 'weekly_frequency', 'current_week'}:
+        buckets = list(_weekly_buckets(user, start_date, end_date, tz))
+        weekly_volumes = _format_weekly_volume(buckets)
+        if 'weekly_volume' in sections:
+            data['weekly_volumes'] = weekly_volumes
+        if 'weekly_frequency' in sections:
+            data['weekly_frequency'] = _format_weekly_frequency(buckets)
+        if 'current_week' in sections:
+            data['current_week'] = _current_week_stats(weekly_volumes, end_date, tz)
+    if 'top_workouts' in sections:
+        data['top_workouts'] = get_top_workouts_by_volume(user, top_limit)
+    return data
+
+def _period_key(period, bucket_start):
+    return _week_key(bucket_start) if period == 'week' else bucket_start.strftime('%Y-%m')
+
+def _muscle_group_buckets(user, period, start_date, end_date, tz):
+    """
+    (bucket start, muscle group, sets, reps, volume) rows, grouped in the database.
+
+    UTC buckets are composed from DailyMuscleGroupStats. Other timezones
+    join the raw rows to Exercise and truncate workout dates in ``tz``,
+    with one grouped query for volume and one for set and rep counts.
+    """
+    if tz is dt_timezone.utc:
+        return [
+            (row['bucket'], row['muscle_group'], row['set_count'], row['rep_count'], row['total_volume'])
+            for row in get_rollup_buckets(user, period, start_date, end_date, by_muscle_group=True)
+        ]
+    start_date, end_date = _local_day_range(start_date, end_date, tz)
+    trunc = ROLLUP_PERIODS[period]
+    volumes = (
+        PerformedExercise.objects.filter(workout__user=user, workout__date__range=(start_date, end_date))
+        .annotate(bucket=trunc('workout__date', tzinfo=tz))
+        .values_list('bucket', 'exercise__muscle_group')
+        .annotate(total_volume=Sum('volume'))
+    )
+    sets = (
+        PerformedSet.objects.filter(
+            performed_exercise__workout__user=user,
+            performed_exercise__workout__date__range=(start_date, end_date),
+        )
+        .annotate(bucket=trunc('performed_exercise__workout__date', tzinfo=tz))
+        .values_list('bucket', 'performed_exercise__exercise__muscle_group')
+        .annotate(set_count=Count('id'), rep_count=Sum('reps'))
+    )
+    counts = {(bucket, group): (set_count, rep_count or 0) for bucket, group, set_count, rep_count in sets}
+    return sorted(
+        (bucket.date(), group, *counts.get((bucket, group), (0, 0)), volume or 0)
+        for bucket, group, volume in volumes
+    )
+
+def get_muscle_group_distribution(user, period='week', start_date=None, end_date=None, tz=dt_timezone.utc):
+    """
+    Sets, reps and volume per muscle group for each week or month, plus range totals.
+
+    Grouping happens in the database, so only one row per (bucket, muscle
+    group) reaches Python however many sets the range covers.
+    """
+    buckets, totals = {}, {}
+    for bucket_start, group, set_count, rep_count, volume in _muscle_group_buckets(
+        user, period, start_date, end_date, tz
+    ):
+        if not (set_count or volume):
+            continue
+        key = _period_key(period, bucket_start)
+        entry = buckets.setdefault(key, {'period': key, 'start': bucket_start, 'groups': {}})
+        entry['groups'][group] = {'sets': set_count, 'reps': rep_count, 'volume': round(volume, 2)}
+        total = totals.setdefault(group, {'sets': 0, 'reps': 0, 'volume': 0})
+        total['sets'] += set_count
+        total['reps'] += rep_count
+        total['volume'] += volume
+    for total in totals.values():
+        total['volume'] = round(total['volume'], 2)
+    return {
+        'period': period,
+        'buckets': list(buckets.values()),
+        'totals': totals,
+    }
+
+def get_muscle_load(user, period='week', start_date=None, end_date=None, tz=dt_timezone.utc, matrix=None):
+    """
+    Weighted load per fine-grained muscle for each week or month.
+
+    Volume is summed per (bucket, exercise) in the database, laid out as a
+    buckets x exercises array and multiplied by the catalog's exercise x
+    muscle weight matrix (see MuscleLoadMatrix). Custom exercises get their
+    weight rows from one extra query. Volume of exercises with no muscles
+    listed is reported as ``unassigned_volume``.
+    """
+    start_date, end_date = _local_day_range(start_date, end_date, tz)
+    matrix = matrix or get_muscle_matrix()
+    rows = list(
+        PerformedExercise.objects.filter(workout__user=user, workout__date__range=(start_date, end_date))
+        .annotate(bucket=ROLLUP_PERIODS[period]('workout__date', tzinfo=tz))
+        .values_list('bucket', 'exercise_id')
+        .annotate(total_volume=Sum('volume'))
+        .order_by()
+    )
+
+    buckets = sorted({bucket for bucket, _, _ in rows})
+    catalog_ids = sorted({exercise_id for _, exercise_id, _ in rows if exercise_id in matrix})
+    custom_ids = sorted({exercise_id for _, exercise_id, _ in rows if exercise_id not in matrix})
+    muscles = list(matrix.muscles)
+    weights = matrix.weights_for(catalog_ids, muscles)
+    if custom_ids:
+        custom = MuscleLoadMatrix(
+            Exercise.objects.filter(pk__in=custom_ids).values('id', 'primaryMuscles', 'secondaryMuscles')
+        )
+        muscles += [muscle for muscle in custom.muscles if muscle not in matrix.muscles]
+        weights = np.vstack([
+            np.pad(weights, ((0, 0), (0, len(muscles) - weights.shape[1]))),
+            custom.weights_for(custom_ids, muscles),
+        ])
+
+    columns = {exercise_id: column for column, exercise_id in enumerate(catalog_ids + custom_ids)}
+    positions = {bucket: position for position, bucket in enumerate(buckets)}
+    volumes = np.zeros((len(buckets), len(columns)))
+    if rows:
+        bucket_at, column_at, volume = zip(*(
+            (positions[bucket], columns[exercise_id], total) for bucket, exercise_id, total in rows
+        ))
+        volumes[bucket_at, column_at] = volume
+
+    loads = muscle_loads(volumes, weights)
+    unassigned = volumes[:, ~weights.any(axis=1)].sum()
+    return {
+        'period': period,
+        'muscles': muscles,
+        'periods': [_period_key(period, bucket.astimezone(tz).date()) for bucket in buckets],
+        'loads': loads.round(2).tolist(),
+        'totals': dict(zip(muscles, loads.sum(axis=0).round(2).tolist())),
+        'unassigned_volume': round(float(unassigned), 2),
+    }
+
+def get_exercise_progression(user, exercise_id, start_date=None, end_date=None, formula='epley'):
+    """
+    Per-session bests for one exercise, oldest first, flagging new records.
+
+    A single query over the per-session columns precomputed on
+    PerformedExercise (no set JSON is parsed), served by the
+    (exercise, workout) index. Records are tracked over the whole history
+    up to end_date so sessions inside the requested range are flagged
+    against everything before them.
+    """
+    rows = PerformedExercise.objects.filter(workout__user=user, exercise_id=exercise_id)
+    if end_date:
+        rows = rows.filter(workout__date__lte=end_date)
+    rows = rows.order_by('workout__date', 'workout_id', 'id').values_list(
+        'workout_id', 'workout__date', 'best_weight', 'best_weight_reps', 'max_reps',
+        E1RM_FORMULAS[formula], 'volume',
+    )
+
+    sessions = []
+    for workout_id, date, weight, weight_reps, max_reps, e1rm, volume in rows:
+        if sessions and sessions[-1]['workout_id'] == workout_id:
+            # The same exercise logged twice in one workout counts as one session
+            session = sessions[-1]
+            if (weight, weight_reps) > (session['best_set']['weight'], session['best_set']['reps']):
+                session['best_set'] = {'weight': weight, 'reps': weight_reps}
+            session['max_reps'] = max(session['max_reps'], max_reps)
+            session['estimated_1rm'] = max(session['estimated_1rm'], e1rm)
+            session['volume'] += volume
+            continue
+        sessions.append({
+            'workout_id': workout_id,
+            'date': date,
+            'best_set': {'weight': weight, 'reps': weight_reps},
+            'estimated_1rm': e1rm,
+            'max_reps': max_reps,
+            'volume': volume,
+        })
+
+    records = {'estimated_1rm': 0, 'weight': 0, 'max_reps': 0, 'volume': 0}
+    for session in sessions:
+        values = {
+            'estimated_1rm': session['estimated_1rm'],
+            'weight': session['best_set']['weight'],
+            'max_reps': session['max_reps'],
+            'volume': session['volume'],
+        }
+        session['records'] = [name for name, value in values.items() if value > records[name]]
+        for name in session['records']:
+            records[name] = values[name]
+
+    if start_date:
+        sessions = [session for session in sessions if session['date'] >= start_date]
+    return {
+        'exercise_id': exercise_id,
+        'formula': formula,
+        'sessions': sessions,
+        'records': records,
+    }
 
-    workouts = Workout.objects.filter(
-        user=user,
-        date__range=(start_date, end_date)
-    ).only('date')
-
-    weekly_counts = {}
-    for workout in workouts:
-        year, week, _ = workout.date.isocalendar()
-        week_key = f"{year}-W{week:02d}"
-        weekly_counts[week_key] = weekly_counts.get(week_key, 0) + 1
-
-    # Format and sort by week key ascending
-    formatted = []
-    for week_key, count in sorted(weekly_counts.items()):
-        formatted.append({
-            'week': week_key,
-            'workoutCount': count,
+def get_personal_records(user, exercise_id=None):
+    """
+    A user's personal records by exercise: the bests over every set plus
+    the best set at each rep count. One read of the maintained
+    PersonalRecord rows; no history is scanned.
+    """
+    records = PersonalRecord.objects.filter(user=user).select_related('exercise').only(
+        'exercise__name', 'exercise__muscle_group', 'reps', 'weight', 'estimated_1rm', 'volume',
+    )
+    if exercise_id is not None:
+        records = records.filter(exercise_id=exercise_id)
+    by_exercise = {}
+    for record in records.order_by('exercise__name', 'exercise_id', 'reps'):
+        entry = by_exercise.setdefault(record.exercise_id, {
+            'exercise': {
+                'id': record.exercise_id,
+                'name': record.exercise.name,
+                'muscle_group': record.exercise.muscle_group,
+            },
+            'best': None,
+            'rep_maxes': [],
         })
-    return formatted
\ No newline at end of file
+        values = {
+            'weight': record.weight,
+            'estimated_1rm': record.estimated_1rm,
+            'volume': record.volume,
+        }
+        if record.reps == PersonalRecord.ANY_REPS:
+            entry['best'] = values
+        else:
+            entry['rep_maxes'].append({'reps': record.reps, **values})
+    return list(by_exercise.values())
@@ -0,0 +1,82 @@
+# backend/workouts/analytics_cache.py
+
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+# Per-process hit/miss counters, exposed through cache_stats()
+_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+_stats_lock = threading.Lock()
+
+def _cache():
+    return caches[settings.ANALYTICS_CACHE_ALIAS]
+
+def _count(counter):
+    with _stats_lock:
+        _stats[counter] += 1
+
+def _version_key(user_id):
+    return f"analytics:version:{user_id}"
+
+def get_data_version(user_id):
+    """
+    Current data version for a user.
+
+    A missing version is seeded from the clock rather than 1, so a version
+    lost to eviction or a restart can never collide with an older one.
+    """
+    cache = _cache()
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+def bump_data_version(user_id):
+    """
+    Make every cached analytics entry for a user unreachable.
+
+    Runs after the surrounding transaction commits so a concurrent reader
+    can never cache pre-commit data under the new version.
+    """
+    def bump():
+        cache = _cache()
+        try:
+            cache.incr(_version_key(user_id))
+        except ValueError:
+            cache.set(_version_key(user_id), time.time_ns(), None)
+        _count('invalidations')
+    transaction.on_commit(bump)
+
+def _entry_key(user_id, version, endpoint, params):
+    normalized = '&'.join(f"{name}={params[name]}" for name in sorted(params))
+    digest = hashlib.md5(normalized.encode()).hexdigest()
+    return f"analytics:{user_id}:{version}:{endpoint}:{digest}"
+
+def cached_analytics(user, endpoint, params, compute):
+    """
+    Return compute() for this user/endpoint/params, cached until the user's data changes
+    """
+    cache = _cache()
+    key = _entry_key(user.pk, get_data_version(user.pk), endpoint, params)
+    value = cache.get(key)
+    if value is not None:
+        _count('hits')
+        return value
+    _count('misses')
+    value = compute()
+    cache.set(key, value, settings.ANALYTICS_CACHE_TIMEOUT)
+    return value
+
+def cache_stats():
+    """Snapshot of this process's analytics cache counters"""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else None
+    return stats
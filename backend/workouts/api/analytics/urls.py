@@ -4,4 +4,10 @@ from . import views
 urlpatterns = [
     path('weekly-volume/', views.weekly_volume_analytics, name='weekly-volume-analytics'),
     path('top-workouts/', views.top_workouts_by_volume, name='top-workouts-by-volume'),
+    path('dashboard/', views.analytics_dashboard, name='analytics-dashboard'),
+    path('muscle-groups/', views.muscle_group_distribution, name='muscle-group-distribution'),
+    path('muscle-load/', views.muscle_load, name='muscle-load'),
+    path('exercises/<int:exercise_id>/progression/', views.exercise_progression, name='exercise-progression'),
+    path('records/', views.personal_records, name='personal-records'),
+    path('cache-stats/', views.analytics_cache_stats, name='analytics-cache-stats'),
 ]
@@ -1,27 +1,65 @@
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from datetime import datetime
-from ...analytics import get_weekly_volume_data, get_top_workouts_by_volume, calculate_volume_per_set
+from ...analytics import (
+    DASHBOARD_SECTIONS,
+    E1RM_FORMULAS,
+    MAX_TOP_WORKOUTS,
+    MUSCLE_GROUP_PERIODS,
+    calculate_volume_per_set,
+    get_dashboard_data,
+    get_exercise_progression,
+    get_muscle_group_distribution,
+    get_muscle_load,
+    get_personal_records,
+    get_top_workouts_by_volume,
+    get_weekly_volume_data,
+    parse_date_param,
+    parse_timezone,
+    range_cache_key,
+)
+from ...analytics_cache import cache_stats, cached_analytics
+from ...catalog import catalog_version, get_muscle_matrix
+from ...conditional import analytics_watermark, conditional_get
+from ...exceptions.exceptions import ExerciseNotFoundError, InvalidQueryParameterError
 from ...models import Workout
+from ...services.exercise_service import ExerciseService
+
+def _range_params(request):
+    """Parse the shared start_date / end_date / tz query parameters"""
+    return (
+        parse_date_param(request.query_params.get('start_date'), 'start_date'),
+        parse_date_param(request.query_params.get('end_date'), 'end_date'),
+        parse_timezone(request.query_params.get('tz')),
+    )
+
+def _limit_param(request, default=5):
+    """
+    Top-workouts ?limit=, clamped here rather than in the query so that
+    equivalent limits share one cache entry
+    """
+    try:
+        limit = int(request.query_params.get('limit', default))
+    except ValueError:
+        limit = default
+    return max(1, min(limit, MAX_TOP_WORKOUTS))
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(analytics_watermark)
 def weekly_volume_analytics(request):
-    # Get date range from query params if provided
-    start_date = request.query_params.get('start_date')
-    end_date = request.query_params.get('end_date')
-
-    # Parse dates if provided
-    if start_date:
-        start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-    if end_date:
-        end_date = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-
-    data = get_weekly_volume_data(
-        user=request.user,
-        start_date=start_date,
-        end_date=end_date
+    start_date, end_date, tz = _range_params(request)
+
+    data = cached_analytics(
+        request.user,
+        'weekly-volume',
+        {'range': range_cache_key(start_date, end_date, tz), 'tz': tz},
+        lambda: get_weekly_volume_data(
+            user=request.user,
+            start_date=start_date,
+            end_date=end_date,
+            tz=tz
+        )
     )
 
     return Response({
@@ -30,18 +68,177 @@ def weekly_volume_analytics(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(analytics_watermark)
 def top_workouts_by_volume(request):
-    limit = request.query_params.get('limit', 5)
-    try:
-        limit = int(limit)
-    except ValueError:
-        limit = 5
-        
-    data = get_top_workouts_by_volume(
-        user=request.user,
-        limit=limit
+    limit = _limit_param(request)
+
+    data = cached_analytics(
+        request.user,
+        'top-workouts',
+        {'limit': limit},
+        lambda: get_top_workouts_by_volume(
+            user=request.user,
+            limit=limit
+        )
     )
     
     return Response({
         'top_workouts': data
     })
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@conditional_get(analytics_watermark)
+def analytics_dashboard(request):
+    """
+    Several analytics sections in one response, chosen with ?sections=a,b
+    """
+    raw_sections = request.query_params.get('sections')
+    sections = DASHBOARD_SECTIONS
+    if raw_sections:
+        sections = tuple(sorted({name.strip() for name in raw_sections.split(',') if name.strip()}))
+        unknown = set(sections) - set(DASHBOARD_SECTIONS)
+        if unknown or not sections:
+            raise InvalidQueryParameterError(
+                f"Unknown sections {sorted(unknown)}; choose from {', '.join(DASHBOARD_SECTIONS)}."
+            )
+    start_date, end_date, tz = _range_params(request)
+    limit = _limit_param(request)
+
+    data = cached_analytics(
+        request.user,
+        'dashboard',
+        {
+            'sections': ','.join(sections),
+            'range': range_cache_key(start_date, end_date, tz),
+            'tz': tz,
+            'limit': limit,
+        },
+        lambda: get_dashboard_data(
+            user=request.user,
+            sections=sections,
+            start_date=start_date,
+            end_date=end_date,
+            tz=tz,
+            top_limit=limit
+        )
+    )
+
+    return Response(data)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@conditional_get(analytics_watermark)
+def muscle_group_distribution(request):
+    """
+    Sets, reps and volume per muscle group, bucketed with ?period=week|month
+    """
+    period = request.query_params.get('period', 'week')
+    if period not in MUSCLE_GROUP_PERIODS:
+        raise InvalidQueryParameterError(f"Unknown period '{period}'; use {' or '.join(MUSCLE_GROUP_PERIODS)}.")
+    start_date, end_date, tz = _range_params(request)
+
+    data = cached_analytics(
+        request.user,
+        'muscle-groups',
+        {'period': period, 'range': range_cache_key(start_date, end_date, tz), 'tz': tz},
+        lambda: get_muscle_group_distribution(
+            user=request.user,
+            period=period,
+            start_date=start_date,
+            end_date=end_date,
+            tz=tz
+        )
+    )
+
+    return Response(data)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@conditional_get(analytics_watermark)
+def muscle_load(request):
+    """
+    Weighted per-muscle load (primary 1.0, secondary 0.5) per ?period=week|month
+    """
+    period = request.query_params.get('period', 'week')
+    if period not in MUSCLE_GROUP_PERIODS:
+        raise InvalidQueryParameterError(f"Unknown period '{period}'; use {' or '.join(MUSCLE_GROUP_PERIODS)}.")
+    start_date, end_date, tz = _range_params(request)
+    # The weights come from the catalog, so its version is part of the key
+    version = catalog_version()
+
+    data = cached_analytics(
+        request.user,
+        'muscle-load',
+        {'period': period, 'range': range_cache_key(start_date, end_date, tz), 'tz': tz, 'catalog': version},
+        lambda: get_muscle_load(
+            user=request.user,
+            period=period,
+            start_date=start_date,
+            end_date=end_date,
+            tz=tz,
+            matrix=get_muscle_matrix(version)
+        )
+    )
+
+    return Response(data)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@conditional_get(analytics_watermark)
+def exercise_progression(request, exercise_id):
+    """
+    Per-session best set, estimated 1RM, volume and records for one exercise.
+    ?formula=epley|brzycki picks the 1RM estimate.
+    """
+    if not ExerciseService.get_user_exercises(request.user).filter(pk=exercise_id).exists():
+        raise ExerciseNotFoundError()
+    formula = request.query_params.get('formula', 'epley')
+    if formula not in E1RM_FORMULAS:
+        raise InvalidQueryParameterError(f"Unknown formula '{formula}'; use {' or '.join(E1RM_FORMULAS)}.")
+    start_date = parse_date_param(request.query_params.get('start_date'), 'start_date')
+    end_date = parse_date_param(request.query_params.get('end_date'), 'end_date')
+
+    data = cached_analytics(
+        request.user,
+        'exercise-progression',
+        {
+            'exercise': exercise_id,
+            'formula': formula,
+            # Unbounded by default, so the exact bounds are the key
+            'range': f"{start_date and start_date.isoformat()}..{end_date and end_date.isoformat()}",
+        },
+        lambda: get_exercise_progression(
+            user=request.user,
+            exercise_id=exercise_id,
+            start_date=start_date,
+            end_date=end_date,
+            formula=formula
+        )
+    )
+
+    return Response(data)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@conditional_get(analytics_watermark)
+def personal_records(request):
+    """
+    Personal records per exercise, optionally for one ?exercise_id=
+    """
+    exercise_id = request.query_params.get('exercise_id')
+    if exercise_id is not None:
+        try:
+            exercise_id = int(exercise_id)
+        except ValueError:
+            raise InvalidQueryParameterError(f"Invalid exercise_id '{exercise_id}'.")
+
+    return Response({
+        'records': get_personal_records(request.user, exercise_id)
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def analytics_cache_stats(request):
+    """Hit/miss counters for the analytics cache in this worker process"""
+    return Response(cache_stats())
@@ -0,0 +1,29 @@
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from ...exceptions.exceptions import InvalidQueryParameterError
+from ...services.export_service import ExportService
+
+EXPORT_TYPES = {
+    'csv': ('text/csv', ExportService.csv_lines),
+    'ndjson': ('application/x-ndjson', ExportService.ndjson_lines),
+}
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_workouts(request):
+    """
+    Stream the user's full workout history as CSV (one row per set) or
+    NDJSON (one workout per line), chosen with ?type=csv|ndjson
+    """
+    export_type = request.query_params.get('type', 'csv')
+    if export_type not in EXPORT_TYPES:
+        raise InvalidQueryParameterError(f"Unknown export type '{export_type}'; use csv or ndjson.")
+    content_type, render = EXPORT_TYPES[export_type]
+
+    response = StreamingHttpResponse(render(ExportService.rows(request.user)), content_type=content_type)
+    filename = f"workouts-{timezone.now():%Y%m%d}.{export_type}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'private, no-store'
+    return response
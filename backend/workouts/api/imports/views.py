@@ -0,0 +1,37 @@
+import io
+
+from rest_framework import status
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from ...exceptions.exceptions import InvalidImportFileError, InvalidQueryParameterError
+from ...services.import_service import DEFAULT_IMPORT_BATCH_SIZE, ImportService
+
+MAX_IMPORT_BATCH_SIZE = 2000
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser])
+def import_workouts(request):
+    """
+    Import workout history from an uploaded CSV ("file"). Optional form
+    fields: batch_size, and create_missing=1 to add unknown exercise names
+    as custom exercises instead of skipping them.
+    """
+    upload = request.FILES.get('file')
+    if upload is None:
+        raise InvalidImportFileError('Upload a CSV file in the "file" field.')
+    try:
+        batch_size = int(request.data.get('batch_size', DEFAULT_IMPORT_BATCH_SIZE))
+    except ValueError:
+        raise InvalidQueryParameterError('batch_size must be an integer.')
+    batch_size = max(1, min(batch_size, MAX_IMPORT_BATCH_SIZE))
+    create_missing = request.data.get('create_missing') in ('1', 'true', 'True')
+
+    stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    try:
+        report = ImportService.import_csv(request.user, stream, batch_size, create_missing)
+    except UnicodeDecodeError:
+        raise InvalidImportFileError('The file must be UTF-8 encoded CSV.')
+    return Response(report, status=status.HTTP_201_CREATED if report['workouts'] else status.HTTP_200_OK)
@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.prometheus_metrics, name='prometheus-metrics'),
+]
@@ -0,0 +1,24 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from ...serializers import ExerciseSerializer, PerformedExerciseSerializer, WorkoutSyncSerializer
+from ...services.sync_service import SyncService
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sync_changes(request):
+    """
+    Workouts, performed exercises and custom exercises changed since
+    ?since=<token>, plus the ids deleted since then. Store the returned
+    token and pass it on the next call; omit it for a full snapshot.
+    """
+    since = request.query_params.get('since')
+    changes = SyncService.changes(request.user, SyncService.decode_token(since) if since else None)
+    return Response({
+        'token': changes['token'],
+        'full': changes['full'],
+        'workouts': WorkoutSyncSerializer(changes['workouts'], many=True).data,
+        'performed_exercises': PerformedExerciseSerializer(changes['performed_exercises'], many=True).data,
+        'exercises': ExerciseSerializer(changes['exercises'], many=True).data,
+        'deleted': changes['deleted'],
+    })
@@ -0,0 +1,139 @@
+# backend/workouts/benchmarks.py
+
+import statistics
+import time
+from zoneinfo import ZoneInfo
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from . import analytics
+from .models import PerformedExercise
+from .synthetic import seed_users
+from .views import ExerciseViewSet, WorkoutViewSet
+
+# Data sizes as (users, workouts per user, performed exercises per workout);
+# the first user is measured, the others make the tables realistically shared
+BENCHMARK_SIZES = {
+    'small': (3, 50, 5),
+    'medium': (3, 400, 5),
+    'large': (3, 1500, 6),
+}
+DEFAULT_REPEAT = 5
+# A case regresses when it runs more queries than the baseline, or is both
+# this much slower (relative) and at least MIN_REGRESSION_MS slower
+DEFAULT_TOLERANCE = 0.25
+MIN_REGRESSION_MS = 2.0
+
+_factory = APIRequestFactory()
+
+def _api(viewset, actions, params=None):
+    view = viewset.as_view(actions)
+
+    def call(context):
+        request = _factory.get('/', params or {})
+        force_authenticate(request, context['user'])
+        response = view(request)
+        response.render()
+        return response
+    return call
+
+def _analytics(function, **kwargs):
+    def call(context):
+        return function(context['user'], **{
+            name: context[value[1:]] if isinstance(value, str) and value.startswith('$') else value
+            for name, value in kwargs.items()
+        })
+    return call
+
+# Hot paths, by name; '$name' arguments are filled from the benchmark context
+BENCHMARK_CASES = {
+    'workouts.list': _api(WorkoutViewSet, {'get': 'list'}),
+    'workouts.list.summary': _api(WorkoutViewSet, {'get': 'list'}, {'summary': '1'}),
+    'workouts.list.page': _api(WorkoutViewSet, {'get': 'list'}, {'page_size': '20'}),
+    'exercises.list': _api(ExerciseViewSet, {'get': 'list'}),
+    'analytics.weekly_volume': _analytics(analytics.get_weekly_volume_data, start_date='$start', end_date='$end'),
+    'analytics.weekly_volume.tz': _analytics(
+        analytics.get_weekly_volume_data, start_date='$start', end_date='$end', tz=ZoneInfo('Europe/Berlin'),
+    ),
+    'analytics.weekly_frequency': _analytics(
+        analytics.get_weekly_workout_frequency, start_date='$start', end_date='$end',
+    ),
+    'analytics.top_workouts': _analytics(analytics.get_top_workouts_by_volume, limit=10),
+    'analytics.dashboard': _analytics(analytics.get_dashboard_data, start_date='$start', end_date='$end'),
+    'analytics.rollup_buckets.month': _analytics(
+        lambda user, **kwargs: list(analytics.get_rollup_buckets(user, **kwargs)),
+        period='month', start_date='$start', end_date='$end',
+    ),
+    'analytics.muscle_groups': _analytics(
+        analytics.get_muscle_group_distribution, start_date='$start', end_date='$end',
+    ),
+    'analytics.muscle_load': _analytics(analytics.get_muscle_load, start_date='$start', end_date='$end'),
+    'analytics.exercise_progression': _analytics(analytics.get_exercise_progression, exercise_id='$exercise_id'),
+    'analytics.personal_records': _analytics(analytics.get_personal_records),
+}
+
+def measure(call, context, repeat=DEFAULT_REPEAT):
+    """
+    Median and worst latency (ms) over ``repeat`` runs after one warm-up
+    run, and the query count of the last run
+    """
+    call(context)
+    timings = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            call(context)
+            timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'queries': len(queries),
+    }
+
+def run_size(size, cases=None, repeat=DEFAULT_REPEAT, progress=None):
+    """
+    Seed one data size, time every case against it, then roll the data back
+    """
+    users, workouts, exercises = BENCHMARK_SIZES[size]
+    cases = cases or list(BENCHMARK_CASES)
+    results = {}
+    with transaction.atomic():
+        created, _ = seed_users(users, workouts, exercises, seed=size, prefix=f'bench-{size}-')
+        user = created[0]
+        history = PerformedExercise.objects.filter(workout__user=user)
+        first, last = (history.order_by(field).values_list('workout__date', flat=True).first()
+                       for field in ('workout__date', '-workout__date'))
+        context = {
+            'user': user,
+            'start': first,
+            'end': last,
+            'exercise_id': history.values_list('exercise_id', flat=True).first(),
+        }
+        for name in cases:
+            results[name] = measure(BENCHMARK_CASES[name], context, repeat)
+            if progress:
+                progress(size, name, results[name])
+        transaction.set_rollback(True)
+    return results
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Regressions of ``results`` against ``baseline`` (both {size: {case: stats}}),
+    as (size, case, reason) tuples
+    """
+    regressions = []
+    for size, cases in results.items():
+        for name, stats in cases.items():
+            before = baseline.get(size, {}).get(name)
+            if before is None:
+                continue
+            if stats['queries'] > before['queries']:
+                regressions.append((size, name, f"queries {before['queries']} -> {stats['queries']}"))
+            slower = stats['median_ms'] - before['median_ms']
+            if slower >= MIN_REGRESSION_MS and stats['median_ms'] > before['median_ms'] * (1 + tolerance):
+                regressions.append((
+                    size, name, f"median {before['median_ms']:.1f} -> {stats['median_ms']:.1f} ms",
+                ))
+    return regressions
@@ -0,0 +1,105 @@
+# backend/workouts/catalog.py
+
+import hashlib
+import threading
+
+from django.db.models import Count, Max
+from django.utils.http import quote_etag
+from rest_framework.renderers import JSONRenderer
+
+from .exceptions.exceptions import InvalidQueryParameterError
+from .models import Exercise
+from .muscle_load import MuscleLoadMatrix
+from .search import ExerciseSearchIndex
+from .serializers import ExerciseSerializer
+
+# Distinct ?fields= projections kept per catalog snapshot
+MAX_CACHED_PROJECTIONS = 16
+
+# Serialized global catalog for this process, replaced when the version changes
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+def catalog_version():
+    """
+    Row count and latest change of the global catalog, in one aggregate query
+    """
+    stats = Exercise.objects.filter(owner__isnull=True).aggregate(
+        count=Count('id'),
+        last_modified=Max('updated_at'),
+    )
+    last_modified = stats['last_modified']
+    return f"{stats['count']}:{last_modified and last_modified.timestamp()}"
+
+def parse_fields_param(value):
+    """
+    Validate a comma-separated ?fields= list against ExerciseSerializer;
+    returns the fields in serializer order, or None for all of them
+    """
+    if not value:
+        return None
+    available = list(ExerciseSerializer().fields)
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = requested - set(available)
+    if unknown or not requested:
+        raise InvalidQueryParameterError(
+            f"Unknown fields {sorted(unknown)}; choose from {', '.join(available)}."
+        )
+    return tuple(name for name in available if name in requested)
+
+def project(rows, fields):
+    if fields is None:
+        return list(rows)
+    return [{name: row[name] for name in fields} for row in rows]
+
+def _snapshot_for(version):
+    global _snapshot
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot['version'] != version:
+            queryset = Exercise.objects.filter(owner__isnull=True).order_by('id')
+            _snapshot = {
+                'version': version,
+                'rows': [dict(row) for row in ExerciseSerializer(queryset, many=True).data],
+                'projections': {},
+            }
+        return _snapshot
+
+def get_catalog(fields=None):
+    """
+    The global catalog as ``(etag, rows, rendered_json)``.
+
+    Rows are serialized once per catalog version and process; each ``fields``
+    projection and its rendered JSON are cached alongside them. The ETag is
+    strong and identical for every user, since the catalog is shared.
+    """
+    version = catalog_version()
+    snapshot = _snapshot_for(version)
+    projection = snapshot['projections'].get(fields)
+    if projection is None:
+        rows = project(snapshot['rows'], fields)
+        raw = f"{version}|{','.join(fields or ())}"
+        projection = (quote_etag(hashlib.md5(raw.encode()).hexdigest()), rows, JSONRenderer().render(rows))
+        if len(snapshot['projections']) < MAX_CACHED_PROJECTIONS:
+            snapshot['projections'][fields] = projection
+    return projection
+
+def get_search_index():
+    """
+    Search index over the global catalog, built once per catalog version
+    """
+    snapshot = _snapshot_for(catalog_version())
+    with _snapshot_lock:
+        if 'search_index' not in snapshot:
+            snapshot['search_index'] = ExerciseSearchIndex(snapshot['rows'])
+        return snapshot['search_index']
+
+def get_muscle_matrix(version=None):
+    """
+    Exercise x muscle weight matrix over the global catalog, built once per
+    catalog version; pass ``version`` when the caller already has it
+    """
+    snapshot = _snapshot_for(version or catalog_version())
+    with _snapshot_lock:
+        if 'muscle_matrix' not in snapshot:
+            snapshot['muscle_matrix'] = MuscleLoadMatrix(snapshot['rows'])
+        return snapshot['muscle_matrix']
@@ -0,0 +1,100 @@
+# backend/workouts/conditional.py
+
+import hashlib
+from datetime import datetime, time, timezone as dt_timezone
+from functools import wraps
+
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+
+from .models import Exercise, Tombstone, Workout
+
+def _latest(*moments):
+    return max(filter(None, moments), default=None)
+
+def _latest_deletion(user):
+    """
+    When the user last deleted anything. Deletes leave no updated_at behind,
+    so Last-Modified takes this into account; the row counts in the tokens
+    only cover ETags.
+    """
+    return Tombstone.objects.filter(user=user).aggregate(deleted_at=Max('deleted_at'))['deleted_at']
+
+def _workout_state(user):
+    """Latest update and row counts across a user's workouts and performed exercises"""
+    stats = Workout.objects.filter(user=user).aggregate(
+        workouts=Count('id', distinct=True),
+        workouts_at=Max('updated_at'),
+        performed=Count('performed_exercises'),
+        performed_at=Max('performed_exercises__updated_at'),
+    )
+    updated_at = _latest(stats['workouts_at'], stats['performed_at'])
+    return updated_at, f"{stats['workouts']}:{stats['performed']}:{updated_at and updated_at.timestamp()}"
+
+def _exercise_state(user):
+    """Latest update and row count across the global catalog plus the user's custom exercises"""
+    stats = Exercise.objects.filter(Q(owner__isnull=True) | Q(owner=user)).aggregate(
+        count=Count('id'),
+        updated_at=Max('updated_at'),
+    )
+    updated_at = stats['updated_at']
+    return updated_at, f"{stats['count']}:{updated_at and updated_at.timestamp()}"
+
+def workout_watermark(user):
+    updated_at, token = _workout_state(user)
+    return _latest(updated_at, _latest_deletion(user)), token
+
+def exercise_watermark(user):
+    updated_at, token = _exercise_state(user)
+    return _latest(updated_at, _latest_deletion(user)), token
+
+def analytics_watermark(user):
+    """
+    Workout and exercise watermarks combined, since analytics also read
+    exercise muscle groups and muscles (custom and catalog). Rolls over
+    daily as well, since default date ranges end "now".
+    """
+    workouts_at, workouts_token = _workout_state(user)
+    exercises_at, exercises_token = _exercise_state(user)
+    today = datetime.combine(timezone.now().date(), time.min, tzinfo=dt_timezone.utc)
+    last_modified = _latest(workouts_at, exercises_at, _latest_deletion(user), today)
+    return last_modified, f"{workouts_token}:{exercises_token}:{today.date()}"
+
+def conditional_get(watermark):
+    """
+    Answer GETs with 304 Not Modified when the client's validators still match.
+
+    ``watermark(user)`` returns ``(last_modified, token)``. The ETag hashes
+    the token with the user and full request path, so it is computed without
+    touching the serializer. Works on DRF function views (below @api_view)
+    and on viewset methods.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            request = args[0] if isinstance(args[0], Request) else args[1]
+            last_modified, token = watermark(request.user)
+            raw = f"{request.user.pk}|{request.get_full_path()}|{token}"
+            etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+            # HTTP dates have one-second resolution: a second change within
+            # the same second would keep the date, so a date that recent is
+            # neither sent nor checked, and clients fall back to the ETag
+            if timestamp is not None and (timezone.now() - last_modified).total_seconds() < 1:
+                timestamp = None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view(*args, **kwargs)
+            if 200 <= response.status_code < 300 or response.status_code == 304:
+                response['ETag'] = etag
+                if timestamp is not None:
+                    response['Last-Modified'] = http_date(timestamp)
+                response['Cache-Control'] = 'private, no-cache'
+                patch_vary_headers(response, ('Authorization',))
+            return response
+        return wrapper
+    return decorator
@@ -29,4 +29,14 @@ class InvalidWorkoutDataError(APIException):
 class InvalidExerciseDataError(APIException):
     status_code = status.HTTP_400_BAD_REQUEST
     default_detail = 'Invalid exercise data provided.'
-    default_code = 'invalid_exercise_data'
\ No newline at end of file
+    default_code = 'invalid_exercise_data'
+
+class InvalidQueryParameterError(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = 'Invalid query parameter provided.'
+    default_code = 'invalid_query_parameter'
+
+class InvalidImportFileError(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = 'The uploaded file could not be imported.'
+    default_code = 'invalid_import_file'
@@ -0,0 +1,231 @@
+# backend/workouts/loadtest.py
+
+import math
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+from urllib.parse import urlsplit
+
+import requests
+
+from .synthetic import SYNTHETIC_PASSWORD
+
+# Relative weight of each scenario a logged-in user runs next
+DEFAULT_MIX = {'dashboard': 3, 'history': 2, 'log_workout': 1}
+PERCENTILES = (50, 95, 99)
+# Average pause between a user's actions (s); actual pauses vary 0.5x-1.5x
+DEFAULT_THINK_TIME = 1.0
+# Actions per session before the user logs in again
+DEFAULT_SESSION_ACTIONS = 10
+HISTORY_PAGE_SIZE = 20
+HISTORY_PAGES = 3
+REQUEST_TIMEOUT = 30
+
+def percentile(values, pct):
+    """Nearest-rank percentile of already sorted ``values``"""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+def parse_mix(text):
+    """
+    'dashboard=3,history=2' -> {'dashboard': 3.0, 'history': 2.0}; raises
+    ValueError for unknown scenarios or weights that are not positive
+    """
+    mix = {}
+    for part in filter(None, (part.strip() for part in text.split(','))):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown scenario '{name}'; choose from {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(weight or 1)
+        if mix[name] <= 0:
+            raise ValueError(f"Scenario '{name}' needs a positive weight")
+    if not mix:
+        raise ValueError('The scenario mix is empty')
+    return mix
+
+class LoadStats:
+    """Latency samples and failures per endpoint label, shared by all virtual users"""
+
+    def __init__(self):
+        self.samples = {}
+        self.failures = {}
+        self._lock = threading.Lock()
+
+    def record(self, label, elapsed, status):
+        # 304 is a successful conditional GET; None means no response at all
+        with self._lock:
+            self.samples.setdefault(label, []).append(elapsed)
+            if status is None or status >= 400:
+                self.failures.setdefault(label, Counter())[status or 'error'] += 1
+
+    def summary(self, duration):
+        """Throughput and latency percentiles (ms) per endpoint, and in total"""
+        with self._lock:
+            samples = {label: sorted(values) for label, values in self.samples.items()}
+            failures = {label: dict(counts) for label, counts in self.failures.items()}
+
+        def describe(values, failed):
+            return {
+                'requests': len(values),
+                'failures': failed,
+                'rps': round(len(values) / duration, 2) if duration else 0.0,
+                **{f'p{pct}_ms': round(percentile(values, pct) * 1000, 1) for pct in PERCENTILES},
+                'max_ms': round(values[-1] * 1000, 1) if values else 0.0,
+            }
+
+        return {
+            'duration_s': round(duration, 2),
+            'total': describe(
+                sorted(value for values in samples.values() for value in values),
+                sum(sum(counts.values()) for counts in failures.values()),
+            ),
+            'endpoints': {
+                label: {**describe(values, sum(failures.get(label, {}).values())), 'statuses': failures.get(label, {})}
+                for label, values in sorted(samples.items())
+            },
+        }
+
+class VirtualUser:
+    """
+    One scripted client: logs in through /api/login/, then runs scenarios
+    picked from the mix with think time in between, as the frontend would
+    """
+
+    def __init__(self, base_url, username, password, stats, rng, think_time=DEFAULT_THINK_TIME):
+        self.base_url = base_url.rstrip('/')
+        self.username = username
+        self.password = password
+        self.stats = stats
+        self.rng = rng
+        self.think_time = think_time
+        self.session = requests.Session()
+        self.exercise_ids = []
+        self.catalog_etag = None
+
+    def request(self, label, method, path, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, f'{self.base_url}{path}', timeout=REQUEST_TIMEOUT, **kwargs)
+        except requests.RequestException:
+            self.stats.record(label, time.perf_counter() - started, None)
+            return None
+        self.stats.record(label, time.perf_counter() - started, response.status_code)
+        return response
+
+    def login(self):
+        self.session.headers.pop('Authorization', None)
+        response = self.request('login', 'POST', '/api/login/', json={
+            'username': self.username, 'password': self.password,
+        })
+        if response is None or response.status_code != 200:
+            return False
+        self.session.headers['Authorization'] = f"Bearer {response.json()['access']}"
+        return True
+
+    def dashboard(self):
+        """The home page: analytics dashboard and the first page of history"""
+        self.request('analytics.dashboard', 'GET', '/api/analytics/dashboard/', params={'limit': 5})
+        return self.request('workouts.page', 'GET', '/api/workouts/', params={
+            'summary': 1, 'page_size': HISTORY_PAGE_SIZE,
+        })
+
+    def history(self):
+        """Scroll a few pages of workout history and open one workout"""
+        response = self.request('workouts.page', 'GET', '/api/workouts/', params={
+            'summary': 1, 'page_size': HISTORY_PAGE_SIZE,
+        })
+        seen = []
+        for number in range(HISTORY_PAGES):
+            if response is None or response.status_code != 200:
+                break
+            page = response.json()
+            seen += [workout['id'] for workout in page['results']]
+            if not page['next'] or number == HISTORY_PAGES - 1:
+                break
+            self.pause(0.25)
+            link = urlsplit(page['next'])
+            response = self.request('workouts.page', 'GET', f'{link.path}?{link.query}')
+        if seen:
+            self.request('workouts.detail', 'GET', f'/api/workouts/{self.rng.choice(seen)}/')
+
+    def log_workout(self):
+        """Pick exercises from the catalog, save a workout with its sets, return home"""
+        headers = {'If-None-Match': self.catalog_etag} if self.catalog_etag else {}
+        response = self.request('exercises.catalog', 'GET', '/api/exercises/catalog/',
+                                params={'fields': 'id'}, headers=headers)
+        if response is not None and response.status_code == 200:
+            self.exercise_ids = [exercise['id'] for exercise in response.json()]
+            self.catalog_etag = response.headers.get('ETag')
+        if not self.exercise_ids:
+            return
+        rng = self.rng
+        performed = []
+        for exercise_id in rng.sample(self.exercise_ids, min(rng.randint(3, 6), len(self.exercise_ids))):
+            sets = rng.randint(3, 5)
+            weight = rng.choice((20, 40, 60, 80, 100)) + rng.choice((0, 2.5, 5))
+            performed.append({
+                'exercise_id': exercise_id,
+                'sets': sets,
+                'reps_per_set': [rng.randint(5, 12) for _ in range(sets)],
+                'weights_per_set': [weight] * sets,
+            })
+        date = datetime.now(dt_timezone.utc) - timedelta(minutes=rng.randint(30, 120))
+        self.request('workouts.create', 'POST', '/api/workouts/', json={
+            'date': date.isoformat(), 'name': 'Load test session', 'performed_exercises': performed,
+        })
+        self.dashboard()
+
+    def pause(self, scale=1.0):
+        if self.think_time:
+            time.sleep(self.think_time * scale * self.rng.uniform(0.5, 1.5))
+
+    def run(self, mix, deadline, session_actions=DEFAULT_SESSION_ACTIONS):
+        names, weights = zip(*mix.items())
+        while time.monotonic() < deadline:
+            if not self.login():
+                self.pause()
+                continue
+            for _ in range(session_actions):
+                if time.monotonic() >= deadline:
+                    return
+                getattr(self, self.rng.choices(names, weights)[0])()
+                self.pause()
+
+def run_load(
+    base_url,
+    usernames,
+    concurrency,
+    duration,
+    mix=None,
+    password=SYNTHETIC_PASSWORD,
+    think_time=DEFAULT_THINK_TIME,
+    session_actions=DEFAULT_SESSION_ACTIONS,
+    ramp_up=0.0,
+    seed=0,
+):
+    """
+    Run ``concurrency`` virtual users, cycling through ``usernames``, for
+    ``duration`` seconds against a running server, starting them evenly
+    over ``ramp_up`` seconds. Returns LoadStats.summary() for the run.
+    """
+    stats = LoadStats()
+    started = time.monotonic()
+    deadline = started + ramp_up + duration
+    threads = []
+    for number in range(concurrency):
+        user = VirtualUser(
+            base_url, usernames[number % len(usernames)], password, stats,
+            random.Random(f'{seed}:{number}'), think_time,
+        )
+        thread = threading.Thread(target=user.run, args=(mix or DEFAULT_MIX, deadline, session_actions), daemon=True)
+        threads.append(thread)
+        thread.start()
+        if ramp_up and concurrency > 1:
+            time.sleep(ramp_up / concurrency)
+    for thread in threads:
+        thread.join()
+    return stats.summary(time.monotonic() - started)
@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...benchmarks import (
+    BENCHMARK_CASES, BENCHMARK_SIZES, DEFAULT_REPEAT, DEFAULT_TOLERANCE, compare, run_size,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the workout list, exercise list and analytics hot paths against seeded data of "
+        "several sizes, and flag regressions against a stored baseline. Seeded data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='small,medium',
+                            help=f"Comma-separated data sizes: {', '.join(BENCHMARK_SIZES)}")
+        parser.add_argument('--cases', help='Comma-separated case names (default: all)')
+        parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed runs per case')
+        parser.add_argument('--baseline', default=str(Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'),
+                            help='Baseline JSON to compare against')
+        parser.add_argument('--save-baseline', action='store_true',
+                            help='Write these results to the baseline file instead of comparing')
+        parser.add_argument('--output', help='Also write the results as JSON here')
+        parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                            help='Relative slowdown allowed before a case is flagged')
+        parser.add_argument('--strict', action='store_true', help='Exit with an error when anything regressed')
+
+    def handle(self, *args, **options):
+        sizes = [size.strip() for size in options['sizes'].split(',') if size.strip()]
+        cases = [name.strip() for name in options['cases'].split(',')] if options['cases'] else None
+        unknown = set(sizes) - set(BENCHMARK_SIZES) | set(cases or ()) - set(BENCHMARK_CASES)
+        if unknown:
+            raise CommandError(f"Unknown sizes or cases: {', '.join(sorted(unknown))}")
+
+        def progress(size, name, stats):
+            self.stdout.write(
+                f"  {size:<7} {name:<36} {stats['median_ms']:>9.2f} ms median "
+                f"{stats['max_ms']:>9.2f} ms max {stats['queries']:>4} queries"
+            )
+
+        try:
+            results = {size: run_size(size, cases, max(1, options['repeat']), progress) for size in sizes}
+        except ValueError as error:
+            raise CommandError(f"{error} Load the catalog (migrate) before benchmarking.")
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2))
+        baseline_path = Path(options['baseline'])
+        if options['save_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Saved baseline to {baseline_path}"))
+            return
+        if not baseline_path.exists():
+            self.stdout.write(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+            return
+
+        regressions = compare(results, json.loads(baseline_path.read_text()), options['tolerance'])
+        for size, name, reason in regressions:
+            self.stdout.write(self.style.ERROR(f"  REGRESSION {size} {name}: {reason}"))
+        if regressions and options['strict']:
+            raise CommandError(f"{len(regressions)} benchmark regression(s)")
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.models import User
+
+from ...exceptions.exceptions import InvalidImportFileError
+from ...services.import_service import DEFAULT_IMPORT_BATCH_SIZE, ImportService
+
+
+class Command(BaseCommand):
+    help = "Import workout history for a user from a CSV file (one row per set)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to import')
+        parser.add_argument('--user', required=True, help='Username to import the workouts for')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_IMPORT_BATCH_SIZE,
+                            help='Workouts written per transaction')
+        parser.add_argument('--create-missing', action='store_true',
+                            help='Add unknown exercise names as custom exercises instead of skipping them')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+                report = ImportService.import_csv(
+                    user, stream, max(1, options['batch_size']), options['create_missing']
+                )
+        except (OSError, UnicodeDecodeError) as error:
+            raise CommandError(f"Could not read {options['path']}: {error}")
+        except InvalidImportFileError as error:
+            raise CommandError(str(error.detail))
+
+        for error in report['errors']:
+            self.stderr.write(f"  {error}")
+        if report['unknown_exercises']:
+            self.stderr.write(f"  unknown exercises skipped: {', '.join(report['unknown_exercises'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['workouts']} workout(s), {report['performed_exercises']} exercise(s) and "
+            f"{report['sets']} set(s) from {report['rows']} row(s) in {report['elapsed_seconds']:.1f}s "
+            f"({report['rows_per_second']} rows/s); {report['skipped_rows']} row(s) skipped"
+        ))
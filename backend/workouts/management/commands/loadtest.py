@@ -0,0 +1,90 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...loadtest import (
+    DEFAULT_MIX, DEFAULT_SESSION_ACTIONS, DEFAULT_THINK_TIME, PERCENTILES, parse_mix, run_load,
+)
+from ...synthetic import SYNTHETIC_PASSWORD
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive a running server with scripted user sessions (login, dashboard, history scrolling, "
+        "workout logging) and report throughput and latency percentiles per endpoint. Log in as "
+        "users created by seed_synthetic; log_workout sessions write to that server's database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000', help='Server to load')
+        parser.add_argument('--concurrency', default='10',
+                            help='Concurrent virtual users; a comma-separated list runs each level in turn')
+        parser.add_argument('--duration', type=float, default=60, help='Seconds per level, after ramp-up')
+        parser.add_argument('--ramp-up', type=float, default=5, help='Seconds over which users start')
+        parser.add_argument('--mix', default=','.join(f'{name}={weight}' for name, weight in DEFAULT_MIX.items()),
+                            help='Scenario weights, e.g. dashboard=3,history=2,log_workout=1')
+        parser.add_argument('--think-time', type=float, default=DEFAULT_THINK_TIME,
+                            help='Average seconds between a user\'s actions (0 for a closed loop)')
+        parser.add_argument('--session-actions', type=int, default=DEFAULT_SESSION_ACTIONS,
+                            help='Actions before a user logs in again')
+        parser.add_argument('--prefix', default='synthetic', help='Username prefix used by seed_synthetic')
+        parser.add_argument('--users', type=int,
+                            help='Seeded users to log in as (default: one per virtual user)')
+        parser.add_argument('--password', default=SYNTHETIC_PASSWORD)
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the scenario choices')
+        parser.add_argument('--output', help='Also write the results as JSON here')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+            levels = [int(level) for level in options['concurrency'].split(',') if level.strip()]
+        except ValueError as error:
+            raise CommandError(error)
+        if not levels or min(levels) < 1:
+            raise CommandError('--concurrency needs positive integers')
+        usernames = [f"{options['prefix']}{number:04d}" for number in range(options['users'] or max(levels))]
+
+        results = {}
+        for level in levels:
+            self.stdout.write(f"{level} user(s) for {options['duration']:g}s against {options['base_url']} ...")
+            summary = run_load(
+                options['base_url'], usernames, level, options['duration'], mix,
+                password=options['password'], think_time=options['think_time'],
+                session_actions=max(1, options['session_actions']), ramp_up=options['ramp_up'],
+                seed=options['seed'],
+            )
+            results[level] = summary
+            self.report(summary)
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2))
+        if len(levels) > 1:
+            self.stdout.write(
+                f"\n{'concurrency':>11} {'req/s':>7}  " + '  '.join(f"{f'p{pct} ms':>7}" for pct in PERCENTILES)
+                + f" {'failures':>8}"
+            )
+            for level, summary in results.items():
+                total = summary['total']
+                self.stdout.write(
+                    f"{level:>11} {total['rps']:>7.1f}  "
+                    + '  '.join(f"{total[f'p{pct}_ms']:>7.0f}" for pct in PERCENTILES)
+                    + f" {total['failures']:>8}"
+                )
+
+    def report(self, summary):
+        header = f"  {'endpoint':<22} {'requests':>8} {'req/s':>7} " + ' '.join(
+            f"{f'p{pct} ms':>8}" for pct in PERCENTILES
+        ) + f" {'max ms':>8} {'failures':>8}"
+        self.stdout.write(header)
+        rows = [*summary['endpoints'].items(), ('total', summary['total'])]
+        for label, stats in rows:
+            line = (
+                f"  {label:<22} {stats['requests']:>8} {stats['rps']:>7.1f} "
+                + ' '.join(f"{stats[f'p{pct}_ms']:>8.1f}" for pct in PERCENTILES)
+                + f" {stats['max_ms']:>8.1f} {stats['failures']:>8}"
+            )
+            self.stdout.write(self.style.ERROR(line) if stats['failures'] else line)
+            if stats.get('statuses'):
+                self.stdout.write(f"    statuses: {stats['statuses']}")
+        self.stdout.write(f"  {summary['duration_s']}s elapsed\n")
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...services.sync_service import SyncService
+
+
+class Command(BaseCommand):
+    help = "Delete sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS"
+
+    def handle(self, *args, **options):
+        removed = SyncService.prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {removed} tombstone(s) older than {settings.SYNC_TOMBSTONE_RETENTION_DAYS} day(s)"
+        ))
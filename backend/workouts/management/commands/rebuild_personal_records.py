@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.models import User
+
+from ...services.personal_record_service import PersonalRecordService
+
+
+class Command(BaseCommand):
+    help = "Rebuild personal records from raw performed exercises, for one user or everyone"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only rebuild records for this username')
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Users loaded per batch when rebuilding everyone')
+
+    def handle(self, *args, **options):
+        if options['user']:
+            try:
+                users = [User.objects.get(username=options['user'])]
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+        else:
+            users = User.objects.order_by('pk').iterator(chunk_size=options['batch_size'])
+
+        started = time.monotonic()
+        user_count = record_count = 0
+        for user in users:
+            record_count += PersonalRecordService.rebuild(user)
+            user_count += 1
+            if user_count % options['batch_size'] == 0:
+                self.stdout.write(f"  {user_count} users rebuilt...")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {record_count} record(s) for {user_count} user(s) in {elapsed:.1f}s"
+        ))
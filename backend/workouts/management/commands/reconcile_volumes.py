@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.models import User
+
+from ...models import Workout
+from ...services.workout_service import WorkoutService
+
+
+class Command(BaseCommand):
+    help = "Recompute performed exercise volumes from their sets and fix drifted Workout.total_volume values"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only reconcile workouts for this username')
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without writing')
+
+    def handle(self, *args, **options):
+        workouts = Workout.objects.all()
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+            workouts = workouts.filter(user=user)
+
+        drifted = WorkoutService.reconcile_total_volume(workouts, dry_run=options['dry_run'])
+        verb = 'would be corrected' if options['dry_run'] else 'corrected'
+        self.stdout.write(self.style.SUCCESS(f"{drifted} workout(s) {verb}"))
@@ -0,0 +1,69 @@
+import time
+from datetime import datetime, time as dt_time, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.models import User
+from django.utils.dateparse import parse_date
+
+from ...synthetic import DEFAULT_BATCH_SIZE, SYNTHETIC_PASSWORD, seed_users, synthetic_users
+
+
+class Command(BaseCommand):
+    help = "Generate deterministic synthetic users and workout histories from the exercise catalog"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Users to create')
+        parser.add_argument('--workouts', type=int, default=200, help='Workouts per user')
+        parser.add_argument('--exercises', type=int, default=5, help='Performed exercises per workout')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed gives the same data')
+        parser.add_argument('--end-date', help='Day the histories end (YYYY-MM-DD); defaults to yesterday')
+        parser.add_argument('--prefix', default='synthetic', help='Username prefix, followed by a number')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help='Workouts written per transaction')
+        parser.add_argument('--reset', action='store_true',
+                            help='Delete users seeded earlier with this prefix first; other accounts are never touched')
+        parser.add_argument('--force', action='store_true', help='Run even though DEBUG is off')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('DEBUG is off, so this may be a production database; pass --force to seed it anyway')
+        end = None
+        if options['end_date']:
+            day = parse_date(options['end_date'])
+            if day is None:
+                raise CommandError(f"Invalid --end-date '{options['end_date']}'")
+            end = datetime.combine(day, dt_time.min, tzinfo=dt_timezone.utc)
+
+        usernames = [f"{options['prefix']}{number:04d}" for number in range(options['users'])]
+        taken = sorted(User.objects.filter(username__in=usernames).exclude(
+            pk__in=synthetic_users(options['prefix'])
+        ).values_list('username', flat=True))
+        if taken:
+            raise CommandError(f"Real accounts use these usernames: {', '.join(taken)}; choose another --prefix")
+
+        existing = synthetic_users(options['prefix'])
+        if existing.exists():
+            if not options['reset']:
+                raise CommandError(
+                    f"Synthetic users starting with '{options['prefix']}' already exist; pass --reset to replace them"
+                )
+            deleted = existing.count()
+            existing.delete()
+            self.stdout.write(f"  deleted {deleted} existing user(s)")
+
+        started = time.monotonic()
+        try:
+            _, counts = seed_users(
+                options['users'], options['workouts'], options['exercises'],
+                seed=options['seed'], prefix=options['prefix'], end=end, batch_size=max(1, options['batch_size']),
+            )
+        except ValueError as error:
+            raise CommandError(f"{error} Load the catalog (migrate) before seeding.")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {counts['users']} user(s), {counts['workouts']} workout(s), "
+            f"{counts['performed_exercises']} exercise(s) and {counts['sets']} set(s) in {elapsed:.1f}s "
+            f"(password '{SYNTHETIC_PASSWORD}')"
+        ))
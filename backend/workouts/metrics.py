@@ -0,0 +1,228 @@
+# backend/workouts/metrics.py
+
+import json
+import logging
+import math
+import os
+import secrets
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger('workouts.performance')
+
+# Request latency buckets in seconds (upper bounds; +Inf is implicit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+
+    def empty(self):
+        return 0.0
+
+    def add(self, state, amount):
+        return state + amount
+
+    def merge(self, left, right):
+        return left + right
+
+    def samples(self, labels, state):
+        yield self.name, _format_labels(self.labelnames, labels), state
+
+class Histogram:
+    """
+    Fixed-bucket histogram; each label set keeps per-bucket (non-cumulative)
+    counts, then sum and count
+    """
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+
+    def empty(self):
+        return [0] * (len(self.buckets) + 1) + [0.0, 0]
+
+    def add(self, state, value):
+        position = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        state[position] += 1
+        state[-2] += value
+        state[-1] += 1
+        return state
+
+    def merge(self, left, right):
+        return [a + b for a, b in zip(left, right)]
+
+    def samples(self, labels, state):
+        cumulative = 0
+        for bound, count in zip((*self.buckets, math.inf), state):
+            cumulative += count
+            yield (
+                f'{self.name}_bucket',
+                _format_labels(self.labelnames, labels, [('le', '+Inf' if bound == math.inf else repr(float(bound)))]),
+                cumulative,
+            )
+        yield f'{self.name}_sum', _format_labels(self.labelnames, labels), state[-2]
+        yield f'{self.name}_count', _format_labels(self.labelnames, labels), state[-1]
+
+class MetricsRegistry:
+    """
+    Counters and histograms for this worker process, rendered in the
+    Prometheus text format.
+
+    With ``directory`` set, the worker also writes its values to
+    ``<directory>/metrics-<pid>-<token>.json`` at most every
+    ``flush_interval`` seconds, and exposition merges every worker's file,
+    so any gunicorn worker can answer a scrape. Files of exited workers are
+    kept for ``stale_after`` seconds, so merged counters don't go backwards
+    on every worker restart; the random token stops a new worker with a
+    reused pid from overwriting one. Older files are deleted by the next
+    scrape, which keeps the directory bounded. A worker idle for that long
+    loses its file too, and its next flush writes it again in full.
+    """
+
+    def __init__(self, directory=None, flush_interval=5.0, stale_after=600.0):
+        self.metrics = {}
+        self.values = {}
+        self.directory = Path(directory) if directory else None
+        self.flush_interval = flush_interval
+        self.stale_after = stale_after
+        self._flushed_at = 0.0
+        self._lock = threading.Lock()
+        # (pid, token) naming this process's file; redrawn after a fork
+        self._file_id = None
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        self.values[metric.name] = {}
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def record(self, metric, labels, value=1):
+        labels = tuple(str(label) for label in labels)
+        with self._lock:
+            values = self.values[metric.name]
+            values[labels] = metric.add(values.get(labels, metric.empty()), value)
+            # Claimed under the lock so only one thread flushes per interval
+            due = self.directory is not None and time.monotonic() - self._flushed_at >= self.flush_interval
+            if due:
+                self._flushed_at = time.monotonic()
+        if due:
+            self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: [
+                    [list(labels), state if isinstance(state, float) else list(state)]
+                    for labels, state in values.items()
+                ]
+                for name, values in self.values.items()
+            }
+
+    def _path(self):
+        pid = os.getpid()
+        if self._file_id is None or self._file_id[0] != pid:
+            self._file_id = (pid, secrets.token_hex(4))
+        return self.directory / f'metrics-{pid}-{self._file_id[1]}.json'
+
+    def flush(self):
+        """
+        Write this worker's values to its file, atomically. Runs in the
+        request path, so a failed write is logged rather than raised.
+        """
+        path = self._path()
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # A temporary file per flush, so concurrent flushes never share one
+            descriptor, temporary = tempfile.mkstemp(dir=self.directory, prefix=f'{path.stem}.', suffix='.tmp')
+            try:
+                with os.fdopen(descriptor, 'w') as handle:
+                    json.dump(self.snapshot(), handle)
+                os.replace(temporary, path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        except OSError:
+            logger.warning('Could not write metrics to %s', path, exc_info=True)
+
+    def collect(self):
+        """
+        Merged values for exposition: this process live, plus every other
+        worker's last flushed file in shared-file mode. Files (and temporary
+        files left by a crashed flush) older than ``stale_after`` are deleted.
+        """
+        snapshots = [self.snapshot()]
+        if self.directory and self.directory.exists():
+            own = self._path()
+            stale_before = time.time() - self.stale_after
+            for path in self.directory.glob('metrics-*'):
+                try:
+                    if path.stat().st_mtime < stale_before:
+                        path.unlink()
+                    elif path.suffix == '.json' and path != own:
+                        snapshots.append(json.loads(path.read_text()))
+                except (OSError, ValueError):
+                    continue
+        merged = {name: {} for name in self.metrics}
+        for snapshot in snapshots:
+            for name, entries in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None:
+                    continue
+                for labels, state in entries:
+                    labels = tuple(labels)
+                    current = merged[name].get(labels)
+                    merged[name][labels] = state if current is None else metric.merge(current, state)
+        return merged
+
+    def render(self):
+        lines = []
+        for name, values in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f'# HELP {name} {metric.help}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            for labels in sorted(values):
+                for sample, label_text, value in metric.samples(labels, values[labels]):
+                    lines.append(f'{sample}{label_text} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+registry = MetricsRegistry(
+    directory=getattr(settings, 'METRICS_DIR', None),
+    flush_interval=getattr(settings, 'METRICS_FLUSH_INTERVAL', 5.0),
+    stale_after=getattr(settings, 'METRICS_STALE_AFTER', 600.0),
+)
+
+REQUESTS = registry.counter(
+    'http_requests_total', 'HTTP requests by route, method and status', ('route', 'method', 'status'),
+)
+REQUEST_LATENCY = registry.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route and method', ('route', 'method'),
+)
@@ -0,0 +1,274 @@
+# backend/workouts/middleware.py
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .metrics import REQUEST_LATENCY, REQUESTS, registry
+
+logger = logging.getLogger('workouts.performance')
+
+# Repeated statements listed in a slow-request log line
+MAX_REPEATED_STATEMENTS = 5
+
+# Functions listed in a profile report, by cumulative time
+PROFILE_TOP_FUNCTIONS = 40
+
+# X-Profile / ?profile= values that profile a request
+PROFILE_MODES = {'1', 'download'}
+
+# Methods labelled as-is in metrics; anything else is counted as 'other'
+METRIC_METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+# The timings of the request RequestTimingMiddleware is measuring, if any
+_request_timing = ContextVar('request_timing', default=None)
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper hook counting statements and their time.
+    SQL is recorded before parameters are bound, so N+1 queries collapse
+    into one statement with a count.
+    """
+
+    def __init__(self, keep_log=False):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+        self.statement_time = Counter()
+        # Every statement in order, with its parameters, when keep_log is set
+        self.log = [] if keep_log else None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            self.statements[sql] += 1
+            self.statement_time[sql] += elapsed
+            if self.log is not None:
+                self.log.append((elapsed, sql, params))
+
+    def repeated(self, limit=MAX_REPEATED_STATEMENTS):
+        return [
+            {'sql': sql, 'count': count, 'ms': round(self.statement_time[sql] * 1000, 2)}
+            for sql, count in self.statements.most_common(limit)
+            if count > 1
+        ]
+
+class SerializerTimingMixin:
+    """
+    Serializer mixin adding the time spent in to_representation to the
+    ``serialize`` timing of the current request. Nested and per-item calls
+    are counted once, by the outermost serializer.
+    """
+
+    def to_representation(self, instance):
+        timing = _request_timing.get()
+        if timing is None or timing.get('serializing'):
+            return super().to_representation(instance)
+        timing['serializing'] = True
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            timing['serialize'] = timing.get('serialize', 0.0) + time.perf_counter() - started
+            timing['serializing'] = False
+
+class RequestTimingMiddleware:
+    """
+    Per-request SQL count, DB time, view time, serializer time and render time.
+
+    Emitted as a Server-Timing header on every response, and logged as one
+    JSON line (with the most repeated statements) when the request takes
+    longer than REQUEST_TIMING_SLOW_MS. ``view`` covers the view itself;
+    ``serialize`` is the part of it spent in serializers using
+    SerializerTimingMixin; ``render`` is turning the response into bytes.
+    Not installed unless REQUEST_TIMING_ENABLED is set.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_TIMING_ENABLED', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'REQUEST_TIMING_SLOW_MS', 500)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request._timing = {'started': time.perf_counter()}
+        token = _request_timing.set(request._timing)
+        try:
+            with connection.execute_wrapper(recorder):
+                response = self.get_response(request)
+        finally:
+            _request_timing.reset(token)
+        finished = time.perf_counter()
+
+        timing = request._timing
+        view_started = timing.get('view_started', finished)
+        view_finished = timing.get('view_finished', finished)
+        durations = {
+            'db': recorder.duration * 1000,
+            'view': (view_finished - view_started) * 1000,
+            'serialize': timing.get('serialize', 0.0) * 1000,
+            'render': (finished - view_finished) * 1000,
+            'total': (finished - timing['started']) * 1000,
+        }
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={durations["db"]:.1f};desc="{recorder.count} queries"',
+            *(f'{name};dur={durations[name]:.1f}' for name in ('view', 'serialize', 'render', 'total')),
+        ])
+
+        if durations['total'] >= self.slow_ms:
+            match = getattr(request, 'resolver_match', None)
+            logger.warning(json.dumps({
+                'event': 'slow_request',
+                'method': request.method,
+                'path': request.path,
+                'route': match.url_name if match else None,
+                'status': response.status_code,
+                'queries': recorder.count,
+                **{f'{name}_ms': round(value, 1) for name, value in durations.items()},
+                'repeated_sql': recorder.repeated(),
+            }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._timing['view_started'] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Called for DRF responses once the view returns, before rendering
+        request._timing['view_finished'] = time.perf_counter()
+        return response
+
+class MetricsMiddleware:
+    """
+    Counts requests and records their latency per resolved URL name
+    (``weekly-volume-analytics``, ``workout-list``, ...). Requests that
+    match no route share the ``unmatched`` label so bad paths cannot grow
+    the label set. Not installed unless METRICS_ENABLED is set.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        route = (match.url_name or match.route) if match else 'unmatched'
+        method = request.method if request.method in METRIC_METHODS else 'other'
+        registry.record(REQUESTS, (route, method, response.status_code))
+        registry.record(REQUEST_LATENCY, (route, method), elapsed)
+        return response
+
+class ProfilingMiddleware:
+    """
+    Profiles a single request for staff, on demand.
+
+    Send ``X-Profile: 1`` (or ``?profile=1``) to store a cProfile dump and a
+    text report with every SQL statement under PROFILING_DIR, which keeps
+    the newest PROFILING_MAX_REPORTS; the response is returned as usual
+    with the report name in ``X-Profile-Report``. Send ``download`` instead
+    of ``1`` to get the text report back in place of the response. Other
+    values, requests without the flag, and non-staff users pass straight
+    through. Not installed unless PROFILING_ENABLED is set.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.directory = Path(settings.PROFILING_DIR)
+        self.max_reports = getattr(settings, 'PROFILING_MAX_REPORTS', 20)
+
+    def __call__(self, request):
+        mode = request.META.get('HTTP_X_PROFILE') or request.GET.get('profile')
+        if mode not in PROFILE_MODES or not self._is_staff(request):
+            return self.get_response(request)
+
+        recorder = QueryRecorder(keep_log=True)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        elapsed = time.perf_counter() - started
+
+        report = self.report(request, response, elapsed, recorder, profiler)
+        if mode == 'download':
+            download = HttpResponse(report, content_type='text/plain; charset=utf-8')
+            download['Content-Disposition'] = 'attachment; filename="profile.txt"'
+            return download
+
+        match = getattr(request, 'resolver_match', None)
+        stamp = datetime.now(dt_timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+        name = f"{stamp}-{match.url_name if match and match.url_name else 'request'}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(self.directory / f'{name}.prof')
+        (self.directory / f'{name}.txt').write_text(report)
+        self.prune()
+        response['X-Profile-Report'] = name
+        return response
+
+    def prune(self):
+        """Delete all but the newest max_reports reports; names start with their timestamp"""
+        reports = sorted(self.directory.glob('*.txt'), reverse=True)
+        for report in reports[self.max_reports:]:
+            report.unlink(missing_ok=True)
+            report.with_suffix('.prof').unlink(missing_ok=True)
+
+    def _is_staff(self, request):
+        """
+        Session users are already on the request; API clients send a JWT,
+        which DRF only checks later, so it is verified here
+        """
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return user.is_staff
+        try:
+            authenticated = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        return bool(authenticated and authenticated[0].is_staff)
+
+    def report(self, request, response, elapsed, recorder, profiler):
+        lines = [
+            f'{request.method} {request.get_full_path()} -> {response.status_code}',
+            f'{elapsed * 1000:.1f} ms total, {recorder.count} queries, {recorder.duration * 1000:.1f} ms in SQL',
+            '',
+            'SQL, in order:',
+        ]
+        for number, (duration, sql, params) in enumerate(recorder.log, start=1):
+            lines.append(f'{number:4d}. {duration * 1000:8.2f} ms  {sql}  {list(params or ())}')
+        repeated = recorder.repeated()
+        if repeated:
+            lines += ['', 'Repeated SQL:']
+            lines += [f"{entry['count']:4d}x {entry['ms']:8.2f} ms  {entry['sql']}" for entry in repeated]
+        stats = io.StringIO()
+        pstats.Stats(profiler, stream=stats).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+        lines += ['', f'Profile, top {PROFILE_TOP_FUNCTIONS} by cumulative time:', stats.getvalue()]
+        return '\n'.join(lines)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 04:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0010_workout_user_volume_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='performedexercise',
+            name='volume',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 500
+
+def calc_volume(pe):
+    reps = pe.reps_per_set or []
+    weights = pe.weights_per_set or []
+    total = 0
+    for i, r in enumerate(reps):
+        w = weights[i] if i < len(weights) else 0
+        try:
+            total += float(r or 0) * float(w or 0)
+        except (TypeError, ValueError):
+            continue
+    return max(int(round(total)), 0)
+
+def forwards(apps, schema_editor):
+    Workout = apps.get_model('workouts', 'Workout')
+    PerformedExercise = apps.get_model('workouts', 'PerformedExercise')
+
+    batch = []
+    for pe in PerformedExercise.objects.only('id', 'reps_per_set', 'weights_per_set').iterator(chunk_size=BATCH_SIZE):
+        pe.volume = calc_volume(pe)
+        batch.append(pe)
+        if len(batch) >= BATCH_SIZE:
+            PerformedExercise.objects.bulk_update(batch, ['volume'])
+            batch = []
+    if batch:
+        PerformedExercise.objects.bulk_update(batch, ['volume'])
+
+    # Workout totals become the sum of their performed exercises
+    totals = (
+        PerformedExercise.objects.filter(workout=OuterRef('pk'))
+        .order_by()
+        .values('workout')
+        .annotate(total=Sum('volume'))
+        .values('total')
+    )
+    Workout.objects.update(total_volume=Coalesce(Subquery(totals), 0))
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0011_performedexercise_volume'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-18 04:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0012_backfill_performedexercise_volume'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PerformedSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField()),
+                ('reps', models.PositiveIntegerField()),
+                ('weight', models.FloatField(default=0)),
+                ('performed_exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='performed_sets', to='workouts.performedexercise')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('performed_exercise', 'position'), name='performed_set_position_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+def to_number(value, cast):
+    try:
+        return max(cast(value or 0), 0)
+    except (TypeError, ValueError):
+        return 0
+
+def forwards(apps, schema_editor):
+    PerformedExercise = apps.get_model('workouts', 'PerformedExercise')
+    PerformedSet = apps.get_model('workouts', 'PerformedSet')
+
+    batch = []
+    rows = PerformedExercise.objects.only('id', 'reps_per_set', 'weights_per_set').iterator(chunk_size=BATCH_SIZE)
+    for pe in rows:
+        reps = pe.reps_per_set or []
+        weights = pe.weights_per_set or []
+        for position, r in enumerate(reps):
+            w = weights[position] if position < len(weights) else 0
+            batch.append(PerformedSet(
+                performed_exercise_id=pe.id,
+                position=position,
+                reps=to_number(r, int),
+                weight=to_number(w, float),
+            ))
+        if len(batch) >= BATCH_SIZE:
+            PerformedSet.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+            batch = []
+    if batch:
+        PerformedSet.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+
+def backwards(apps, schema_editor):
+    apps.get_model('workouts', 'PerformedSet').objects.all().delete()
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0013_performedset'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,76 @@
+from datetime import timezone as dt_timezone
+
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+BATCH_SIZE = 1000
+
+def forwards(apps, schema_editor):
+    Workout = apps.get_model('workouts', 'Workout')
+    PerformedExercise = apps.get_model('workouts', 'PerformedExercise')
+    PerformedSet = apps.get_model('workouts', 'PerformedSet')
+    DailyStats = apps.get_model('workouts', 'DailyStats')
+    DailyMuscleGroupStats = apps.get_model('workouts', 'DailyMuscleGroupStats')
+
+    days = {}
+    per_day = (
+        Workout.objects.annotate(day=TruncDate('date', tzinfo=dt_timezone.utc))
+        .values('user_id', 'day')
+        .annotate(workout_count=Count('id'), total_volume=Sum('total_volume'))
+    )
+    for row in per_day:
+        days[(row['user_id'], row['day'])] = DailyStats(
+            user_id=row['user_id'],
+            day=row['day'],
+            workout_count=row['workout_count'],
+            total_volume=row['total_volume'] or 0,
+        )
+
+    groups = {}
+    volumes = (
+        PerformedExercise.objects.annotate(day=TruncDate('workout__date', tzinfo=dt_timezone.utc))
+        .values('workout__user_id', 'day', 'exercise__muscle_group')
+        .annotate(total_volume=Sum('volume'))
+    )
+    for row in volumes:
+        key = (row['workout__user_id'], row['day'], row['exercise__muscle_group'])
+        groups[key] = DailyMuscleGroupStats(
+            user_id=key[0], day=key[1], muscle_group=key[2], total_volume=row['total_volume'] or 0
+        )
+    sets = (
+        PerformedSet.objects.annotate(day=TruncDate('performed_exercise__workout__date', tzinfo=dt_timezone.utc))
+        .values('performed_exercise__workout__user_id', 'day', 'performed_exercise__exercise__muscle_group')
+        .annotate(set_count=Count('id'), rep_count=Sum('reps'))
+    )
+    for row in sets:
+        key = (
+            row['performed_exercise__workout__user_id'],
+            row['day'],
+            row['performed_exercise__exercise__muscle_group'],
+        )
+        stats = groups.setdefault(key, DailyMuscleGroupStats(
+            user_id=key[0], day=key[1], muscle_group=key[2], total_volume=0
+        ))
+        stats.set_count = row['set_count']
+        stats.rep_count = row['rep_count'] or 0
+        day_stats = days[key[:2]]
+        day_stats.set_count = (day_stats.set_count or 0) + stats.set_count
+        day_stats.rep_count = (day_stats.rep_count or 0) + stats.rep_count
+
+    DailyStats.objects.bulk_create(days.values(), batch_size=BATCH_SIZE)
+    DailyMuscleGroupStats.objects.bulk_create(groups.values(), batch_size=BATCH_SIZE)
+
+def backwards(apps, schema_editor):
+    apps.get_model('workouts', 'DailyStats').objects.all().delete()
+    apps.get_model('workouts', 'DailyMuscleGroupStats').objects.all().delete()
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0015_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-18 05:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0019_sync_tombstones'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='performedexercise',
+            name='best_weight',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='performedexercise',
+            name='best_weight_reps',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='performedexercise',
+            name='estimated_1rm',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='performedexercise',
+            name='estimated_1rm_brzycki',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='performedexercise',
+            name='max_reps',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='performedexercise',
+            index=models.Index(fields=['exercise', 'workout'], name='performed_ex_exercise_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+
+BATCH_SIZE = 500
+FIELDS = ['best_weight', 'best_weight_reps', 'max_reps', 'estimated_1rm', 'estimated_1rm_brzycki']
+
+def epley(weight, reps):
+    if reps <= 0 or weight <= 0:
+        return 0.0
+    return weight if reps == 1 else weight * (1 + reps / 30)
+
+def brzycki(weight, reps):
+    if reps <= 0 or reps >= 37 or weight <= 0:
+        return 0.0
+    return weight * 36 / (37 - reps)
+
+def session_stats(pe):
+    # Mirrors PerformedExercise.calculate_session_stats at the time of writing
+    weights = pe.weights_per_set or []
+    sets = []
+    for i, r in enumerate(pe.reps_per_set or []):
+        try:
+            sets.append((float((weights[i] if i < len(weights) else 0) or 0), int(r or 0)))
+        except (TypeError, ValueError):
+            continue
+    best_weight, best_weight_reps = max(sets, default=(0.0, 0))
+    return {
+        'best_weight': best_weight,
+        'best_weight_reps': max(best_weight_reps, 0),
+        'max_reps': max((r for _, r in sets), default=0),
+        'estimated_1rm': round(max((epley(w, r) for w, r in sets), default=0.0), 2),
+        'estimated_1rm_brzycki': round(max((brzycki(w, r) for w, r in sets), default=0.0), 2),
+    }
+
+def forwards(apps, schema_editor):
+    PerformedExercise = apps.get_model('workouts', 'PerformedExercise')
+
+    batch = []
+    for pe in PerformedExercise.objects.only('id', 'reps_per_set', 'weights_per_set').iterator(chunk_size=BATCH_SIZE):
+        for field, value in session_stats(pe).items():
+            setattr(pe, field, value)
+        batch.append(pe)
+        if len(batch) >= BATCH_SIZE:
+            PerformedExercise.objects.bulk_update(batch, FIELDS)
+            batch = []
+    if batch:
+        PerformedExercise.objects.bulk_update(batch, FIELDS)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0020_performedexercise_session_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
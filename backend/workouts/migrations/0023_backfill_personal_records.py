@@ -0,0 +1,68 @@
+from django.db import migrations
+
+BATCH_SIZE = 500
+FIELDS = ('weight', 'estimated_1rm', 'volume')
+
+def epley(weight, reps):
+    if reps <= 0 or weight <= 0:
+        return 0.0
+    return weight if reps == 1 else weight * (1 + reps / 30)
+
+def session_bests(pe):
+    # Mirrors PersonalRecordService.session_bests at the time of writing
+    weights = pe.weights_per_set or []
+    bests = {}
+    for i, reps in enumerate(pe.reps_per_set or []):
+        if not reps:
+            continue
+        weight = float((weights[i] if i < len(weights) else 0) or 0)
+        best = bests.setdefault(reps, {'weight': 0.0, 'volume': 0.0})
+        best['weight'] = max(best['weight'], weight)
+        best['volume'] += reps * weight
+    for reps, best in bests.items():
+        best['estimated_1rm'] = round(epley(best['weight'], reps), 2)
+        best['volume'] = round(best['volume'], 2)
+    bests[0] = {'weight': pe.best_weight, 'estimated_1rm': pe.estimated_1rm, 'volume': float(pe.volume)}
+    return bests
+
+def forwards(apps, schema_editor):
+    PerformedExercise = apps.get_model('workouts', 'PerformedExercise')
+    PersonalRecord = apps.get_model('workouts', 'PersonalRecord')
+
+    # Sessions arrive grouped by (user, exercise), oldest first, so each
+    # group's records are complete once the next group starts
+    sessions = PerformedExercise.objects.select_related('workout').only(
+        'id', 'exercise_id', 'reps_per_set', 'weights_per_set', 'best_weight', 'estimated_1rm', 'volume',
+        'workout__user_id',
+    ).order_by('workout__user_id', 'exercise_id', 'id')
+
+    group, records, batch = None, {}, []
+    for pe in sessions.iterator(chunk_size=BATCH_SIZE):
+        key = (pe.workout.user_id, pe.exercise_id)
+        if key != group:
+            batch += records.values()
+            group, records = key, {}
+            if len(batch) >= BATCH_SIZE:
+                PersonalRecord.objects.bulk_create(batch)
+                batch = []
+        for reps, bests in session_bests(pe).items():
+            record = records.setdefault(reps, PersonalRecord(user_id=key[0], exercise_id=key[1], reps=reps))
+            for field in FIELDS:
+                if bests[field] > getattr(record, field) or getattr(record, f'{field}_source_id') is None:
+                    setattr(record, field, bests[field])
+                    setattr(record, f'{field}_source_id', pe.id)
+    batch += records.values()
+    PersonalRecord.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+
+def backwards(apps, schema_editor):
+    apps.get_model('workouts', 'PersonalRecord').objects.all().delete()
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0022_personal_records'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
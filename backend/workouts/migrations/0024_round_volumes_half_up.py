@@ -0,0 +1,94 @@
+from datetime import timezone as dt_timezone
+
+from django.db import migrations
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+BATCH_SIZE = 500
+
+def calc_volume(pe):
+    reps = pe.reps_per_set or []
+    weights = pe.weights_per_set or []
+    total = 0
+    for i, r in enumerate(reps):
+        w = weights[i] if i < len(weights) else 0
+        try:
+            total += float(r or 0) * float(w or 0)
+        except (TypeError, ValueError):
+            continue
+    # Round half up, matching PerformedExerciseService.stored_volume
+    return max(int(total + 0.5), 0)
+
+def forwards(apps, schema_editor):
+    """
+    0012 rounded half to even, so sessions whose volume ends in .5 can be
+    one below what the service stores. Fix those volumes and shift the
+    totals, rollups and session-volume records built from them.
+    """
+    Workout = apps.get_model('workouts', 'Workout')
+    PerformedExercise = apps.get_model('workouts', 'PerformedExercise')
+    DailyStats = apps.get_model('workouts', 'DailyStats')
+    DailyMuscleGroupStats = apps.get_model('workouts', 'DailyMuscleGroupStats')
+    PersonalRecord = apps.get_model('workouts', 'PersonalRecord')
+
+    now = timezone.now()
+    changed, workout_ids, day_deltas, group_deltas, record_keys = [], set(), {}, {}, set()
+    rows = PerformedExercise.objects.select_related('workout', 'exercise').only(
+        'id', 'volume', 'reps_per_set', 'weights_per_set', 'exercise_id',
+        'workout__user_id', 'workout__date', 'exercise__muscle_group',
+    )
+    for pe in rows.iterator(chunk_size=BATCH_SIZE):
+        delta = calc_volume(pe) - pe.volume
+        if not delta:
+            continue
+        pe.volume += delta
+        pe.updated_at = now
+        changed.append(pe)
+        user_id = pe.workout.user_id
+        day = pe.workout.date.astimezone(dt_timezone.utc).date()
+        workout_ids.add(pe.workout_id)
+        day_deltas[(user_id, day)] = day_deltas.get((user_id, day), 0) + delta
+        group_key = (user_id, day, pe.exercise.muscle_group)
+        group_deltas[group_key] = group_deltas.get(group_key, 0) + delta
+        record_keys.add((user_id, pe.exercise_id))
+    PerformedExercise.objects.bulk_update(changed, ['volume', 'updated_at'], batch_size=BATCH_SIZE)
+
+    totals = (
+        PerformedExercise.objects.filter(workout=OuterRef('pk'))
+        .order_by()
+        .values('workout')
+        .annotate(total=Sum('volume'))
+        .values('total')
+    )
+    Workout.objects.filter(pk__in=workout_ids).update(total_volume=Coalesce(Subquery(totals), 0), updated_at=now)
+    for (user_id, day), delta in day_deltas.items():
+        DailyStats.objects.filter(user_id=user_id, day=day).update(total_volume=F('total_volume') + delta)
+    for (user_id, day, muscle_group), delta in group_deltas.items():
+        DailyMuscleGroupStats.objects.filter(user_id=user_id, day=day, muscle_group=muscle_group).update(
+            total_volume=F('total_volume') + delta
+        )
+
+    # Whole-session volume records (reps=0): best volume, earliest session on ties
+    for user_id, exercise_id in record_keys:
+        best = None
+        for pe_id, volume in (
+            PerformedExercise.objects.filter(workout__user_id=user_id, exercise_id=exercise_id)
+            .order_by('pk')
+            .values_list('id', 'volume')
+        ):
+            if best is None or volume > best[1]:
+                best = (pe_id, volume)
+        PersonalRecord.objects.filter(user_id=user_id, exercise_id=exercise_id, reps=0).update(
+            volume=float(best[1]), volume_source_id=best[0]
+        )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0023_backfill_personal_records'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 06:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workouts', '0024_round_volumes_half_up'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='workout',
+            name='workout_user_volume_idx',
+        ),
+        migrations.AddIndex(
+            model_name='workout',
+            index=models.Index(fields=['user', '-total_volume', '-date', '-id'], name='workout_user_volume_idx'),
+        ),
+    ]
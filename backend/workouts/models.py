@@ -76,28 +76,203 @@ class Exercise(models.Model):
     instructions = models.JSONField(default=list)
     category = models.CharField(max_length=30, choices=CATEGORY_CHOICES, default='strength')
     images = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
 
     class Meta:
         db_table = 'exercise'  # Optional: explicitly set table name
+        indexes = [
+            # Serves delta sync of a user's custom exercises
+            models.Index(fields=['owner', 'updated_at'], name='exercise_owner_updated_idx'),
+        ]
 
 class Workout(models.Model):
   user = models.ForeignKey(User, on_delete=models.CASCADE)
   date = models.DateTimeField(default=timezone.now)
   name = models.CharField(max_length=100, default="Untitled Workout")
   total_volume = models.PositiveIntegerField(default=0)
+  updated_at = models.DateTimeField(auto_now=True)
+
+  class Meta:
+    indexes = [
+      # Serves top-N-by-volume queries for a single user, ties newest first
+      models.Index(fields=['user', '-total_volume', '-date', '-id'], name='workout_user_volume_idx'),
+      # Serves per-user change watermarks (max updated_at)
+      models.Index(fields=['user', 'updated_at'], name='workout_user_updated_idx'),
+      # Serves keyset pagination of the workout history on (date, id)
+      models.Index(fields=['user', '-date', '-id'], name='workout_user_date_idx'),
+    ]
 
   def __str__(self):
     return f"{self.user.username}'s workout on {self.date}"
 
+# Bounds on what one performed exercise can log, keeping its volume well
+# inside the integer volume columns
+MAX_SETS = 100
+MAX_SET_REPS = 1000
+MAX_SET_WEIGHT = 2000
+
+def epley_1rm(weight, reps):
+  """Estimated one-rep max, Epley: w * (1 + r / 30)"""
+  if reps <= 0 or weight <= 0:
+    return 0.0
+  return float(weight) if reps == 1 else weight * (1 + reps / 30)
+
+def brzycki_1rm(weight, reps):
+  """Estimated one-rep max, Brzycki: w * 36 / (37 - r); undefined from 37 reps"""
+  if reps <= 0 or reps >= 37 or weight <= 0:
+    return 0.0
+  return weight * 36 / (37 - reps)
+
 class PerformedExercise(models.Model):
   workout = models.ForeignKey(Workout, on_delete=models.CASCADE, related_name='performed_exercises')
   exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE)
   sets = models.IntegerField()
   reps_per_set = models.JSONField()  # e.g., [10, 8, 8]
   weights_per_set = models.JSONField(blank=True, null=True)  # e.g., [100, 100, 90]
+  volume = models.PositiveIntegerField(default=0)  # maintained server-side, rolled up into Workout.total_volume
+  # Per-session bests, derived from the sets on every write (see calculate_session_stats)
+  best_weight = models.FloatField(default=0)
+  best_weight_reps = models.PositiveIntegerField(default=0)
+  max_reps = models.PositiveIntegerField(default=0)
+  estimated_1rm = models.FloatField(default=0)  # Epley
+  estimated_1rm_brzycki = models.FloatField(default=0)
+  updated_at = models.DateTimeField(auto_now=True)
+
+  def calculate_volume(self):
+    """Sum of reps x weight across sets, treating missing weights as 0"""
+    reps = self.reps_per_set or []
+    weights = self.weights_per_set or []
+    total = 0
+    for i, r in enumerate(reps):
+      w = weights[i] if i < len(weights) else 0
+      total += (r or 0) * (w or 0)
+    return total
+
+  def calculate_session_stats(self):
+    """Heaviest set (most reps on ties), most reps in a set and best estimated 1RMs"""
+    weights = self.weights_per_set or []
+    sets = [
+      (float((weights[i] if i < len(weights) else 0) or 0), r or 0)
+      for i, r in enumerate(self.reps_per_set or [])
+    ]
+    best_weight, best_weight_reps = max(sets, default=(0.0, 0))
+    return {
+      'best_weight': best_weight,
+      'best_weight_reps': best_weight_reps,
+      'max_reps': max((r for _, r in sets), default=0),
+      'estimated_1rm': round(max((epley_1rm(w, r) for w, r in sets), default=0.0), 2),
+      'estimated_1rm_brzycki': round(max((brzycki_1rm(w, r) for w, r in sets), default=0.0), 2),
+    }
+
+  class Meta:
+    indexes = [
+      # Serves delta sync (changed rows since a watermark)
+      models.Index(fields=['updated_at'], name='performed_ex_updated_idx'),
+      # Serves per-exercise progression (a user's sessions of one exercise)
+      models.Index(fields=['exercise', 'workout'], name='performed_ex_exercise_idx'),
+    ]
+
+  def __str__(self):
+    return f"{self.exercise.name} in {self.workout} ({self.sets} sets)"
+
+class PerformedSet(models.Model):
+  """One row per logged set, mirroring reps_per_set/weights_per_set for SQL aggregation"""
+  performed_exercise = models.ForeignKey(PerformedExercise, on_delete=models.CASCADE, related_name='performed_sets')
+  position = models.PositiveSmallIntegerField()  # 0-based index into reps_per_set
+  reps = models.PositiveIntegerField()
+  weight = models.FloatField(default=0)
+
+  class Meta:
+    constraints = [
+      models.UniqueConstraint(fields=['performed_exercise', 'position'], name='performed_set_position_unique'),
+    ]
+
+  def __str__(self):
+    return f"Set {self.position + 1} of {self.performed_exercise_id}: {self.reps} x {self.weight}"
+
+class DailyStats(models.Model):
+  """Per-user training totals for one UTC day, maintained as workouts change"""
+  user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_stats')
+  day = models.DateField()
+  total_volume = models.BigIntegerField(default=0)
+  workout_count = models.IntegerField(default=0)
+  set_count = models.IntegerField(default=0)
+  rep_count = models.IntegerField(default=0)
+
+  class Meta:
+    constraints = [
+      models.UniqueConstraint(fields=['user', 'day'], name='daily_stats_user_day_unique'),
+    ]
+
+  def __str__(self):
+    return f"{self.user_id} on {self.day}: {self.total_volume}"
+
+class DailyMuscleGroupStats(models.Model):
+  """Per-user, per-muscle-group training totals for one UTC day"""
+  user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_muscle_group_stats')
+  day = models.DateField()
+  muscle_group = models.CharField(max_length=20, choices=Exercise.MUSCLE_GROUPS)
+  total_volume = models.BigIntegerField(default=0)
+  set_count = models.IntegerField(default=0)
+  rep_count = models.IntegerField(default=0)
+
+  class Meta:
+    constraints = [
+      models.UniqueConstraint(fields=['user', 'day', 'muscle_group'], name='daily_mg_stats_unique'),
+    ]
+
+  def __str__(self):
+    return f"{self.user_id} {self.muscle_group} on {self.day}: {self.total_volume}"
+
+class PersonalRecord(models.Model):
+  """
+  A user's best weight, estimated 1RM (Epley) and session volume for one
+  exercise, over sets of exactly ``reps`` reps; reps=0 holds the bests over
+  every set. Each value points at the performed exercise that set it.
+  """
+  ANY_REPS = 0
+
+  user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='personal_records')
+  exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, related_name='+')
+  reps = models.PositiveIntegerField()
+  weight = models.FloatField(default=0)
+  estimated_1rm = models.FloatField(default=0)
+  volume = models.FloatField(default=0)
+  weight_source = models.ForeignKey(PerformedExercise, null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+  estimated_1rm_source = models.ForeignKey(PerformedExercise, null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+  volume_source = models.ForeignKey(PerformedExercise, null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+
+  class Meta:
+    constraints = [
+      models.UniqueConstraint(fields=['user', 'exercise', 'reps'], name='personal_record_unique'),
+    ]
+
+  def __str__(self):
+    return f"{self.user_id} {self.exercise_id} x{self.reps}: {self.weight}"
+
+class Tombstone(models.Model):
+  """Marks a deleted row so delta sync clients can drop their copy"""
+  WORKOUT = 'workout'
+  PERFORMED_EXERCISE = 'performed_exercise'
+  EXERCISE = 'exercise'
+  KINDS = [
+    (WORKOUT, 'Workout'),
+    (PERFORMED_EXERCISE, 'Performed exercise'),
+    (EXERCISE, 'Exercise'),
+  ]
+
+  user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tombstones')
+  kind = models.CharField(max_length=20, choices=KINDS)
+  object_id = models.BigIntegerField()
+  deleted_at = models.DateTimeField(default=timezone.now)
+
+  class Meta:
+    indexes = [
+      models.Index(fields=['user', 'deleted_at'], name='tombstone_user_deleted_idx'),
+    ]
 
   def __str__(self):
-    return f"{self.exercise.name} in {self.workout} ({self.sets} sets)"
\ No newline at end of file
+    return f"{self.kind} {self.object_id} deleted {self.deleted_at}"
@@ -0,0 +1,59 @@
+# backend/workouts/muscle_load.py
+
+import numpy as np
+
+# Share of a set's volume credited to each primary / secondary muscle
+PRIMARY_WEIGHT = 1.0
+SECONDARY_WEIGHT = 0.5
+
+class MuscleLoadMatrix:
+    """
+    Exercise x muscle weight matrix built from primaryMuscles / secondaryMuscles.
+
+    Row i holds the weights of exercise ``exercise_ids[i]``; a muscle listed
+    as both primary and secondary keeps the primary weight. Per-muscle load
+    for any set of volumes is then one matrix product instead of a loop over
+    exercises and their muscle lists.
+    """
+
+    def __init__(self, rows):
+        rows = list(rows)
+        self.muscles = sorted({
+            muscle
+            for row in rows
+            for muscle in (row.get('primaryMuscles') or []) + (row.get('secondaryMuscles') or [])
+        })
+        columns = {muscle: column for column, muscle in enumerate(self.muscles)}
+        self.exercise_ids = np.array([row['id'] for row in rows], dtype=np.int64)
+        self.positions = {row['id']: position for position, row in enumerate(rows)}
+        self.weights = np.zeros((len(rows), len(self.muscles)))
+        for position, row in enumerate(rows):
+            for muscle in row.get('secondaryMuscles') or []:
+                self.weights[position, columns[muscle]] = SECONDARY_WEIGHT
+            for muscle in row.get('primaryMuscles') or []:
+                self.weights[position, columns[muscle]] = PRIMARY_WEIGHT
+
+    def __contains__(self, exercise_id):
+        return exercise_id in self.positions
+
+    def weights_for(self, exercise_ids, muscles):
+        """
+        Weight rows for ``exercise_ids`` over the ``muscles`` columns, which
+        may include muscles this matrix does not know (all zero)
+        """
+        rows = self.weights[[self.positions[exercise_id] for exercise_id in exercise_ids]]
+        if list(muscles) == self.muscles:
+            return rows
+        known = {muscle: column for column, muscle in enumerate(self.muscles)}
+        picked = np.zeros((len(exercise_ids), len(muscles)))
+        for column, muscle in enumerate(muscles):
+            if muscle in known:
+                picked[:, column] = rows[:, known[muscle]]
+        return picked
+
+def muscle_loads(volumes, weights):
+    """
+    Per-muscle load for each bucket: (buckets x exercises) volumes times
+    (exercises x muscles) weights
+    """
+    return volumes @ weights
@@ -0,0 +1,23 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class WorkoutCursorPagination(CursorPagination):
+    """
+    Keyset pagination over a user's workout history, newest first.
+
+    Pages seek on (date, id) through ``workout_user_date_idx`` rather than
+    using OFFSET, so a page costs the same at any depth. Pagination is
+    opt-in: requests without ``cursor`` or ``page_size`` still receive the
+    full, unpaginated list.
+    """
+    ordering = ('-date', '-id')
+    page_size = settings.WORKOUT_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.WORKOUT_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
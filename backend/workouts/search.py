@@ -0,0 +1,192 @@
+# backend/workouts/search.py
+
+import heapq
+import re
+from collections import Counter
+from difflib import SequenceMatcher
+
+SEARCH_FILTERS = ('muscle_group', 'equipment', 'level', 'category')
+# Row fields the index reads, and the fields returned per result
+SEARCH_INDEX_FIELDS = (
+    'id', 'name', 'muscle_group', 'equipment', 'level', 'category', 'is_custom',
+    'primaryMuscles', 'secondaryMuscles',
+)
+SEARCH_RESULT_FIELDS = ('id', 'name', 'muscle_group', 'equipment', 'level', 'category', 'is_custom', 'score')
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+# Share of a query token's trigrams a name token needs before it is scored
+# fuzzily, and the minimum edit similarity (0-1) for a fuzzy match
+MIN_SHARED_GRAMS = 0.25
+FUZZY_THRESHOLD = 0.75
+# Query tokens whose fuzzy matches are remembered per index
+MAX_MEMOISED_TOKENS = 1024
+# Longest token prefix indexed; longer query tokens fall back to startswith
+MAX_PREFIX = 12
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+def normalise(text):
+    return ' '.join(_TOKEN_RE.findall((text or '').lower()))
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class ExerciseSearchIndex:
+    """
+    Prebuilt in-memory index over exercise rows (serialized dicts).
+
+    Name and keyword tokens (equipment, muscles, muscle group) are indexed
+    by prefix, so a query touches only the postings for its own tokens
+    instead of scanning rows. Typos are handled on the much smaller name
+    vocabulary: query tokens are matched to similar name tokens through a
+    trigram index plus edit similarity, then resolved through postings.
+
+    Ranking, best first: exact name, name prefix, every query token
+    prefixing a name token, every token prefixing a name or keyword token,
+    then fuzzy name similarity. Ties sort by name.
+    """
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.names = []
+        self.name_tokens = []
+        self.prefixes = {}
+        self.name_prefixes = {}
+        self.name_starts = {}
+        self.token_postings = {}
+        self.vocabulary_grams = {}
+        self._similar = {}
+        for position, row in enumerate(self.rows):
+            name = normalise(row['name'])
+            keywords = normalise(' '.join([
+                row.get('equipment') or '',
+                row.get('muscle_group') or '',
+                *(row.get('primaryMuscles') or []),
+                *(row.get('secondaryMuscles') or []),
+            ]))
+            self.names.append(name)
+            self.name_tokens.append(name.split())
+            for end in range(1, min(len(name), MAX_PREFIX) + 1):
+                self.name_starts.setdefault(name[:end], set()).add(position)
+            for token in set(name.split()):
+                self.token_postings.setdefault(token, set()).add(position)
+                for end in range(1, min(len(token), MAX_PREFIX) + 1):
+                    self.name_prefixes.setdefault(token[:end], set()).add(position)
+            for token in set(name.split()) | set(keywords.split()):
+                for end in range(1, min(len(token), MAX_PREFIX) + 1):
+                    self.prefixes.setdefault(token[:end], set()).add(position)
+        for token in self.token_postings:
+            for gram in trigrams(token):
+                self.vocabulary_grams.setdefault(gram, []).append(token)
+        # Alphabetical rank, used to order rows within a tier without sorting names
+        self.rank = [0] * len(self.rows)
+        for rank, position in enumerate(sorted(range(len(self.rows)), key=self.names.__getitem__)):
+            self.rank[position] = rank
+
+    def _matches_filters(self, row, filters):
+        return all(row.get(field) == value for field, value in filters.items())
+
+    def _postings(self, index, token, words):
+        """
+        Rows with an indexed prefix ``token``. Tokens longer than the indexed
+        prefixes are confirmed against ``words(position)``.
+        """
+        postings = index.get(token[:MAX_PREFIX], set())
+        if len(token) > MAX_PREFIX:
+            postings = {p for p in postings if any(w.startswith(token) for w in words(p))}
+        return postings
+
+    def _all_tokens(self, index, tokens, words):
+        candidates = None
+        for token in tokens:
+            postings = self._postings(index, token, words)
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                return set()
+        return candidates
+
+    def _tiers(self, query, tokens):
+        """
+        (score, rows) pairs, best first; later tiers may repeat earlier rows
+        """
+        starts = self._postings(self.name_starts, query, lambda p: (self.names[p],))
+        exact = {p for p in starts if self.names[p] == query}
+        name_words = self.name_tokens.__getitem__
+        return (
+            (4.0, exact),
+            (3.0, starts),
+            (2.0, self._all_tokens(self.name_prefixes, tokens, name_words)),
+            (1.0, self._all_tokens(self.prefixes, tokens, name_words)),
+        )
+
+    def similar_tokens(self, token):
+        """
+        Name tokens within edit similarity of ``token``, as {token: similarity}
+        """
+        similar = self._similar.get(token)
+        if similar is None:
+            grams = trigrams(token)
+            shared = Counter(t for gram in grams for t in self.vocabulary_grams.get(gram, ()))
+            similar = {}
+            for candidate, count in shared.items():
+                if count < len(grams) * MIN_SHARED_GRAMS:
+                    continue
+                similarity = SequenceMatcher(None, token, candidate).ratio()
+                if candidate.startswith(token):
+                    similarity = 1.0
+                if similarity >= FUZZY_THRESHOLD:
+                    similar[candidate] = similarity
+            if len(self._similar) >= MAX_MEMOISED_TOKENS:
+                self._similar.clear()
+            self._similar[token] = similar
+        return similar
+
+    def _fuzzy_scores(self, tokens):
+        """
+        Rows whose name has a similar token for every query token, scored by
+        the mean best similarity and kept below the prefix tiers
+        """
+        totals = None
+        for token in tokens:
+            best = {}
+            for candidate, similarity in self.similar_tokens(token).items():
+                for position in self.token_postings[candidate]:
+                    if similarity > best.get(position, 0):
+                        best[position] = similarity
+            if totals is None:
+                totals = best
+            else:
+                totals = {p: totals[p] + similarity for p, similarity in best.items() if p in totals}
+            if not totals:
+                return {}
+        return {position: min(total / len(tokens), 0.99) for position, total in totals.items()}
+
+    def search(self, query, filters=None, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Ranked rows for ``query``, each with a ``score``; ``filters`` maps
+        field names to exact values. An empty query lists filtered rows by name.
+        """
+        filters = filters or {}
+        query = normalise(query)
+        tokens = query.split()
+        tiers = self._tiers(query, tokens) if tokens else ((0.0, range(len(self.rows))),)
+
+        picked, seen = [], set()
+        for score, rows in tiers:
+            remaining = [
+                p for p in rows
+                if p not in seen and self._matches_filters(self.rows[p], filters)
+            ]
+            for position in heapq.nsmallest(limit - len(picked), remaining, key=self.rank.__getitem__):
+                picked.append((score, position))
+                seen.add(position)
+            if len(picked) >= limit:
+                break
+        if tokens and len(picked) < limit:
+            fuzzy = [
+                (score, p) for p, score in self._fuzzy_scores(tokens).items()
+                if p not in seen and self._matches_filters(self.rows[p], filters)
+            ]
+            picked += heapq.nsmallest(limit - len(picked), fuzzy, key=lambda m: (-m[0], self.rank[m[1]]))
+        return [dict(self.rows[position], score=round(score, 3)) for score, position in picked]
@@ -1,8 +1,16 @@
+import math
 from rest_framework import serializers
-from .models import Exercise, Workout, PerformedExercise
+from .models import MAX_SET_REPS, MAX_SET_WEIGHT, MAX_SETS, Exercise, Workout, PerformedExercise
 from django.contrib.auth.models import User
+from .middleware import SerializerTimingMixin
+from .services.exercise_service import ExerciseService
 
-class ExerciseSerializer(serializers.ModelSerializer):
+# Performed exercise columns computed from the sets on write
+DERIVED_PERFORMED_FIELDS = (
+    'volume', 'best_weight', 'best_weight_reps', 'max_reps', 'estimated_1rm', 'estimated_1rm_brzycki',
+)
+
+class ExerciseSerializer(SerializerTimingMixin, serializers.ModelSerializer):
     """
     Serializer for Exercise objects.
     """
@@ -11,11 +19,20 @@ class ExerciseSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('owner', 'is_custom', 'id')
 
-class PerformedExerciseSerializer(serializers.ModelSerializer):
+class ExerciseSummarySerializer(SerializerTimingMixin, serializers.ModelSerializer):
+    """
+    Minimal exercise representation embedded in performed exercises.
     """
-    Serializer for PerformedExercise objects, including nested exercise details.
+    class Meta:
+        model = Exercise
+        fields = ('id', 'name', 'muscle_group')
+        read_only_fields = fields
+
+class PerformedExerciseSerializer(SerializerTimingMixin, serializers.ModelSerializer):
     """
-    exercise = ExerciseSerializer(read_only=True)
+    Serializer for PerformedExercise objects, including the exercise's id, name and muscle group.
+    """
+    exercise = ExerciseSummarySerializer(read_only=True)
     exercise_id = serializers.PrimaryKeyRelatedField(
         queryset=Exercise.objects.all(), source='exercise', write_only=True
     )
@@ -23,23 +40,74 @@ class PerformedExerciseSerializer(serializers.ModelSerializer):
     class Meta:
         model = PerformedExercise
         fields = '__all__'
+        read_only_fields = DERIVED_PERFORMED_FIELDS
+
+    def validate_reps_per_set(self, value):
+        if not isinstance(value, list) or any(
+            isinstance(r, bool) or not isinstance(r, int) or not 0 <= r <= MAX_SET_REPS for r in value
+        ):
+            raise serializers.ValidationError(f'Expected a list of integers from 0 to {MAX_SET_REPS}.')
+        if len(value) > MAX_SETS:
+            raise serializers.ValidationError(f'At most {MAX_SETS} sets can be logged.')
+        return value
+
+    def validate_weights_per_set(self, value):
+        if value is None:
+            return value
+        if not isinstance(value, list) or any(
+            w is not None and (
+                isinstance(w, bool) or not isinstance(w, (int, float))
+                or not math.isfinite(w) or not 0 <= w <= MAX_SET_WEIGHT
+            )
+            for w in value
+        ):
+            raise serializers.ValidationError(f'Expected a list of numbers from 0 to {MAX_SET_WEIGHT}.')
+        if len(value) > MAX_SETS:
+            raise serializers.ValidationError(f'At most {MAX_SETS} sets can be logged.')
+        return value
+
+class NestedPerformedExerciseSerializer(PerformedExerciseSerializer):
+    """
+    Performed exercise nested in a workout. Exercise ids are resolved in bulk
+    by WorkoutSerializer rather than one lookup per item.
+    """
+    exercise_id = serializers.IntegerField(write_only=True)
+
+    class Meta(PerformedExerciseSerializer.Meta):
+        read_only_fields = DERIVED_PERFORMED_FIELDS + ('workout',)
 
-class WorkoutSerializer(serializers.ModelSerializer):
+class WorkoutSerializer(SerializerTimingMixin, serializers.ModelSerializer):
     """
     Serializer for Workout objects, including nested performed exercises.
+    Performed exercises may be supplied when creating a workout.
     """
-    performed_exercises = PerformedExerciseSerializer(many=True, read_only=True)
+    performed_exercises = NestedPerformedExerciseSerializer(many=True, required=False)
 
     class Meta:
         model = Workout
         fields = '__all__'
-        read_only_fields = ('user',)
+        read_only_fields = ('user', 'total_volume')
+
+    def validate_performed_exercises(self, value):
+        if self.instance is not None:
+            raise serializers.ValidationError(
+                'Performed exercises can only be set when creating a workout; '
+                'use /api/performed-exercises/ to change them.'
+            )
+        ids = {item['exercise_id'] for item in value}
+        exercises = ExerciseService.get_user_exercises(self.context['request'].user).in_bulk(ids)
+        missing = sorted(ids - set(exercises))
+        if missing:
+            raise serializers.ValidationError(f'Unknown exercise ids: {missing}.')
+        for item in value:
+            item['exercise'] = exercises[item.pop('exercise_id')]
+        return value
 
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
 
-class WorkoutSummarySerializer(serializers.ModelSerializer):
+class WorkoutSummarySerializer(SerializerTimingMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for list views when summary=1 is requested.
     Excludes performed_exercises for faster payloads.
@@ -49,7 +117,16 @@ class WorkoutSummarySerializer(serializers.ModelSerializer):
         fields = ('id', 'date', 'name', 'total_volume')
         read_only_fields = ('id', 'date', 'name', 'total_volume')
 
-class UserRegistrationSerializer(serializers.ModelSerializer):
+class WorkoutSyncSerializer(SerializerTimingMixin, serializers.ModelSerializer):
+    """
+    Flat workout rows for delta sync; performed exercises are synced separately.
+    """
+    class Meta:
+        model = Workout
+        fields = ('id', 'date', 'name', 'total_volume', 'updated_at')
+        read_only_fields = fields
+
+class UserRegistrationSerializer(SerializerTimingMixin, serializers.ModelSerializer):
     """
     Serializer for registering a new user.
     """
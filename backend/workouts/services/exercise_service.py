@@ -1,7 +1,13 @@
-from ..models import Exercise
+from ..models import Exercise, PerformedExercise, Tombstone, Workout
+from django.contrib.auth.models import User
+from django.db import transaction
 from typing import List
 from ..exceptions.exceptions import ExerciseNotFoundError
 from django.db.models import Q
+from .rollup_service import RollupService
+from .sync_service import SyncService
+from .workout_service import WorkoutService
+from ..analytics_cache import bump_data_version
 
 class ExerciseService:
     @staticmethod
@@ -23,4 +29,57 @@ class ExerciseService:
         try:
             return Exercise.objects.get(id=exercise_id)
         except Exercise.DoesNotExist:
-            raise ExerciseNotFoundError()
\ No newline at end of file
+            raise ExerciseNotFoundError()
+
+    @staticmethod
+    def update_exercise(exercise: Exercise, data: dict) -> Exercise:
+        """
+        Update an exercise. Cached analytics of everyone who logged it (and
+        its owner) are invalidated; rollups are split by muscle group, so
+        moving it to another group also rebuilds their affected days.
+        """
+        with transaction.atomic():
+            old_muscle_group = exercise.muscle_group
+            for field, value in data.items():
+                setattr(exercise, field, value)
+            exercise.save()
+            days = {}
+            for user_id, date in PerformedExercise.objects.filter(exercise=exercise).values_list(
+                'workout__user_id', 'workout__date'
+            ):
+                days.setdefault(user_id, set()).add(RollupService.rollup_day(date))
+            if exercise.muscle_group != old_muscle_group:
+                # rebuild() bumps the data version itself
+                for user in User.objects.filter(pk__in=days):
+                    RollupService.rebuild(user, days=days.pop(user.pk))
+            for user_id in {*days, exercise.owner_id} - {None}:
+                bump_data_version(user_id)
+        return exercise
+
+    @staticmethod
+    def delete_exercise(exercise: Exercise) -> None:
+        """
+        Delete an exercise. Performed exercises using it are deleted with it,
+        so the affected workouts' totals and rollup days are recomputed and
+        sync clients get tombstones.
+        """
+        with transaction.atomic():
+            performed = PerformedExercise.objects.filter(exercise=exercise)
+            performed_ids, workout_ids, days = {}, set(), {}
+            for user_id, pe_id, workout_id, date in performed.values_list(
+                'workout__user_id', 'id', 'workout_id', 'workout__date'
+            ):
+                performed_ids.setdefault(user_id, []).append(pe_id)
+                workout_ids.add(workout_id)
+                days.setdefault(user_id, set()).add(RollupService.rollup_day(date))
+            tombstones = {user_id: {Tombstone.PERFORMED_EXERCISE: ids} for user_id, ids in performed_ids.items()}
+            if exercise.owner_id is not None:
+                tombstones.setdefault(exercise.owner_id, {})[Tombstone.EXERCISE] = [exercise.pk]
+            for user_id, deleted in tombstones.items():
+                SyncService.record_deletions(user_id, deleted)
+
+            exercise.delete()
+            if workout_ids:
+                WorkoutService.reconcile_total_volume(Workout.objects.filter(pk__in=workout_ids))
+                for user in User.objects.filter(pk__in=days):
+                    RollupService.rebuild(user, days=days[user.pk])
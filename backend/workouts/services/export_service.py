@@ -0,0 +1,117 @@
+import csv
+import json
+from itertools import groupby
+from typing import Iterable, Iterator
+
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+
+from ..models import Workout
+
+# Rows fetched per round trip; with Postgres this is the server-side cursor fetch size
+EXPORT_CHUNK_SIZE = 2000
+
+# One output column per values() lookup, in CSV column order
+EXPORT_FIELDS = {
+    'workout_id': 'id',
+    'date': 'date',
+    'workout_name': 'name',
+    'workout_total_volume': 'total_volume',
+    'performed_exercise_id': 'performed_exercises__id',
+    'exercise_id': 'performed_exercises__exercise_id',
+    'exercise_name': 'performed_exercises__exercise__name',
+    'muscle_group': 'performed_exercises__exercise__muscle_group',
+    'exercise_volume': 'performed_exercises__volume',
+    'set_position': 'performed_exercises__performed_sets__position',
+    'reps': 'performed_exercises__performed_sets__reps',
+    'weight': 'performed_exercises__performed_sets__weight',
+}
+
+# User-typed CSV columns, and the leading characters that make a spreadsheet
+# evaluate a cell as a formula; such cells are written with a leading quote
+TEXT_FIELDS = ('workout_name', 'exercise_name')
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+class _Echo:
+    """File-like object whose write() hands the line back to the caller"""
+    def write(self, value):
+        return value
+
+class ExportService:
+    """
+    Streams a user's full history without materialising it.
+
+    Rows come from a single left-joined values() query read through
+    iterator(), so memory stays flat however long the history is.
+    """
+
+    @staticmethod
+    def rows(user: User, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[dict]:
+        """
+        One flat row per performed set, oldest workout first. Workouts and
+        performed exercises without sets still yield a row with blank set columns.
+        """
+        queryset = (
+            Workout.objects.filter(user=user)
+            .order_by('date', 'id', 'performed_exercises__id', 'performed_exercises__performed_sets__position')
+            .values_list(*EXPORT_FIELDS.values())
+        )
+        for values in queryset.iterator(chunk_size=chunk_size):
+            yield dict(zip(EXPORT_FIELDS, values))
+
+    @staticmethod
+    def escape_cell(value):
+        """Quote a text cell a spreadsheet would otherwise run as a formula"""
+        if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+            return "'" + value
+        return value
+
+    @staticmethod
+    def unescape_cell(value: str) -> str:
+        """Undo escape_cell, so exported files import back unchanged"""
+        if value and value.startswith("'") and value[1:].startswith(FORMULA_PREFIXES):
+            return value[1:]
+        return value
+
+    @staticmethod
+    def csv_lines(rows: Iterable[dict]) -> Iterator[str]:
+        writer = csv.writer(_Echo())
+        yield writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            row['date'] = row['date'].isoformat()
+            for field in TEXT_FIELDS:
+                row[field] = ExportService.escape_cell(row[field])
+            yield writer.writerow(row.values())
+
+    @staticmethod
+    def ndjson_lines(rows: Iterable[dict]) -> Iterator[str]:
+        """
+        One JSON document per workout, with its performed exercises and sets nested
+        """
+        for workout_id, workout_rows in groupby(rows, key=lambda row: row['workout_id']):
+            workout_rows = list(workout_rows)
+            first = workout_rows[0]
+            performed = []
+            for pe_id, pe_rows in groupby(workout_rows, key=lambda row: row['performed_exercise_id']):
+                if pe_id is None:
+                    continue
+                pe_rows = list(pe_rows)
+                performed.append({
+                    'id': pe_id,
+                    'exercise_id': pe_rows[0]['exercise_id'],
+                    'exercise_name': pe_rows[0]['exercise_name'],
+                    'muscle_group': pe_rows[0]['muscle_group'],
+                    'volume': pe_rows[0]['exercise_volume'],
+                    'sets': [
+                        {'position': row['set_position'], 'reps': row['reps'], 'weight': row['weight']}
+                        for row in pe_rows if row['set_position'] is not None
+                    ],
+                })
+            document = {
+                'id': workout_id,
+                'date': first['date'],
+                'name': first['workout_name'],
+                'total_volume': first['workout_total_volume'],
+                'performed_exercises': performed,
+            }
+            yield json.dumps(document, cls=DjangoJSONEncoder) + '\n'
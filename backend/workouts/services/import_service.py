@@ -0,0 +1,271 @@
+import csv
+import math
+import time
+from datetime import datetime, time as dt_time, timezone as dt_timezone
+from itertools import groupby
+from typing import IO, Dict, Iterable, Iterator, List, Tuple
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from ..models import MAX_SET_REPS, MAX_SET_WEIGHT, MAX_SETS, Exercise, PerformedExercise, PerformedSet, Workout
+from ..exceptions.exceptions import InvalidImportFileError
+from .exercise_service import ExerciseService
+from .export_service import ExportService
+from .performed_exercise_service import PerformedExerciseService
+from .personal_record_service import PersonalRecordService
+from .rollup_service import RollupService
+
+DEFAULT_IMPORT_BATCH_SIZE = 500
+# Row errors echoed back in the report; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+class _RowError(ValueError):
+    pass
+
+class ImportService:
+    """
+    Bulk import of workout history from CSV.
+
+    One CSV row is one set. Columns (header names are case-insensitive,
+    spaces become underscores):
+
+    - ``date`` and ``exercise_name`` are required; ``reps`` and ``weight``
+      describe the set (a blank ``reps`` records the exercise without a set)
+    - ``workout_name`` and ``workout_id`` are optional; consecutive rows
+      sharing a workout_id, or else a date and workout_name, form one workout
+    - ``muscle_group`` is used for exercises created with ``create_missing``
+
+    The export CSV from /api/export/ is accepted as-is, including the quote
+    it puts before names that would read as spreadsheet formulas.
+    """
+
+    @staticmethod
+    def exercise_index(user: User) -> Dict[str, Exercise]:
+        """
+        Case-insensitive name -> exercise map of everything the user can log,
+        with their custom exercises shadowing catalog entries of the same name
+        """
+        index = {}
+        exercises = ExerciseService.get_user_exercises(user).only('id', 'name', 'muscle_group', 'owner_id')
+        for exercise in exercises.order_by('owner_id', 'id'):
+            key = exercise.name.strip().lower()
+            if exercise.owner_id is not None or key not in index:
+                index[key] = exercise
+        return index
+
+    @staticmethod
+    def _normalise_header(name: str) -> str:
+        return (name or '').strip().lower().replace(' ', '_')
+
+    @staticmethod
+    def _parse_date(value: str) -> datetime:
+        value = (value or '').strip()
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                raise _RowError(f"invalid date '{value}'")
+            parsed = datetime.combine(day, dt_time.min)
+        if timezone.is_naive(parsed):
+            parsed = parsed.replace(tzinfo=dt_timezone.utc)
+        return parsed
+
+    @staticmethod
+    def _parse_number(value: str, cast, field: str, maximum: float):
+        """
+        A finite number from 0 to ``maximum``; ints must be whole ("8.0" is
+        fine, "8.5" is not). Blank cells give None.
+        """
+        value = (value or '').strip()
+        if not value:
+            return None
+        try:
+            number = float(value)
+        except ValueError:
+            raise _RowError(f"invalid {field} '{value}'")
+        if not math.isfinite(number) or (cast is int and not number.is_integer()):
+            raise _RowError(f"invalid {field} '{value}'")
+        if number < 0:
+            raise _RowError(f"negative {field} '{value}'")
+        if number > maximum:
+            raise _RowError(f"{field} '{value}' is above {maximum}")
+        return cast(number)
+
+    @staticmethod
+    def _workouts(reader: Iterable[dict]) -> Iterator[Tuple[int, List[dict]]]:
+        """
+        Group consecutive rows into workouts, yielding (first line number, rows)
+        """
+        def key(numbered):
+            row = numbered[1]
+            return row.get('workout_id') or (row.get('date'), row.get('workout_name'))
+
+        for _, group in groupby(enumerate(reader, start=2), key=key):
+            group = list(group)
+            yield group[0][0], [row for _, row in group]
+
+    @staticmethod
+    def import_csv(
+        user: User,
+        stream: IO[str],
+        batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
+        create_missing: bool = False,
+    ) -> dict:
+        """
+        Import a CSV text stream for ``user`` and return a report with counts,
+        skipped rows, unknown exercise names and throughput.
+
+        Workouts are written ``batch_size`` at a time, each batch in its own
+        transaction together with the rollups for the days it touches.
+        Invalid rows skip their workout and are reported, not raised.
+        """
+        reader = csv.DictReader(stream)
+        if reader.fieldnames is None:
+            raise InvalidImportFileError('The file is empty.')
+        reader.fieldnames = [ImportService._normalise_header(name) for name in reader.fieldnames]
+        missing_columns = {'date', 'exercise_name'} - set(reader.fieldnames)
+        if missing_columns:
+            raise InvalidImportFileError(f"Missing required column(s): {', '.join(sorted(missing_columns))}.")
+
+        index = ImportService.exercise_index(user)
+        report = {
+            'rows': 0, 'workouts': 0, 'performed_exercises': 0, 'sets': 0,
+            'skipped_rows': 0, 'errors': [], 'unknown_exercises': [], 'created_exercises': [],
+        }
+        unknown = set()
+        started = time.monotonic()
+        batch = []
+
+        for line, rows in ImportService._workouts(reader):
+            report['rows'] += len(rows)
+            try:
+                workout = ImportService._build_workout(user, rows, index, create_missing, report, unknown)
+            except _RowError as error:
+                report['skipped_rows'] += len(rows)
+                if len(report['errors']) < MAX_REPORTED_ERRORS:
+                    report['errors'].append(f"line {line}: {error}")
+                continue
+            batch.append(workout)
+            if len(batch) >= batch_size:
+                ImportService._write_batch(user, batch, report)
+                batch = []
+        if batch:
+            ImportService._write_batch(user, batch, report)
+
+        elapsed = time.monotonic() - started
+        report['unknown_exercises'] = sorted(unknown)
+        report['elapsed_seconds'] = round(elapsed, 3)
+        report['rows_per_second'] = round(report['rows'] / elapsed) if elapsed else report['rows']
+        return report
+
+    @staticmethod
+    def _build_workout(user, rows, index, create_missing, report, unknown):
+        """
+        Turn one workout's rows into unsaved Workout / PerformedExercise / PerformedSet objects.
+
+        Exercises made for ``create_missing`` stay unsaved too; they only join
+        ``index`` once the whole workout has parsed, and write_workouts saves
+        them with the batch. A workout with no known exercise is an error.
+        """
+        first = rows[0]
+        workout = Workout(
+            user=user,
+            date=ImportService._parse_date(first.get('date')),
+            name=ExportService.unescape_cell((first.get('workout_name') or '').strip())[:100] or 'Imported Workout',
+        )
+        performed, new_exercises = [], {}
+        unknown_rows = 0
+        exercise_key = lambda row: (
+            row.get('performed_exercise_id'),
+            ExportService.unescape_cell((row.get('exercise_name') or '').strip()),
+        )
+        for (_, name), exercise_rows in groupby(rows, key=exercise_key):
+            exercise_rows = list(exercise_rows)
+            if not name:
+                continue
+            exercise = index.get(name.lower()) or new_exercises.get(name.lower())
+            if exercise is None:
+                if not create_missing:
+                    unknown.add(name)
+                    unknown_rows += len(exercise_rows)
+                    continue
+                muscle_group = (exercise_rows[0].get('muscle_group') or '').strip().lower()
+                exercise = new_exercises[name.lower()] = Exercise(
+                    name=name[:100],
+                    owner=user,
+                    is_custom=True,
+                    muscle_group=muscle_group if muscle_group in dict(Exercise.MUSCLE_GROUPS) else 'core',
+                )
+
+            reps, weights = [], []
+            for row in exercise_rows:
+                rep_count = ImportService._parse_number(row.get('reps'), int, 'reps', MAX_SET_REPS)
+                if rep_count is None:
+                    continue
+                reps.append(rep_count)
+                weights.append(ImportService._parse_number(row.get('weight'), float, 'weight', MAX_SET_WEIGHT) or 0)
+            if len(reps) > MAX_SETS:
+                raise _RowError(f"more than {MAX_SETS} sets of '{name}'")
+            performed_exercise = PerformedExercise(
+                workout=workout, exercise=exercise, sets=len(reps), reps_per_set=reps, weights_per_set=weights
+            )
+            PerformedExerciseService.refresh_derived_fields(performed_exercise)
+            performed.append(performed_exercise)
+
+        if not performed:
+            raise _RowError('no known exercises to import')
+        index.update(new_exercises)
+        report['skipped_rows'] += unknown_rows
+        workout.total_volume = sum(pe.volume for pe in performed)
+        return workout, performed
+
+    @staticmethod
+    def write_workouts(user: User, batch: List[Tuple[Workout, List[PerformedExercise]]]) -> Tuple[int, int]:
+        """
+        Bulk insert unsaved (workout, performed exercises) pairs with their
+        sets, in one transaction together with any unsaved exercises they
+        refer to and the rollups and personal records they touch. Derived
+        fields must already be set (see
+        PerformedExerciseService.refresh_derived_fields). Returns the
+        performed exercise and set counts.
+        """
+        with transaction.atomic():
+            Exercise.objects.bulk_create(ImportService._unsaved_exercises(batch))
+            Workout.objects.bulk_create([workout for workout, _ in batch])
+            performed = []
+            for workout, workout_performed in batch:
+                for performed_exercise in workout_performed:
+                    performed_exercise.workout = workout
+                    performed.append(performed_exercise)
+            PerformedExercise.objects.bulk_create(performed)
+            sets = [
+                performed_set
+                for performed_exercise in performed
+                for performed_set in PerformedExerciseService.build_sets(performed_exercise)
+            ]
+            PerformedSet.objects.bulk_create(sets)
+            RollupService.rebuild(user, days={RollupService.rollup_day(workout.date) for workout, _ in batch})
+            PersonalRecordService.record_sessions(performed)
+        return len(performed), len(sets)
+
+    @staticmethod
+    def _unsaved_exercises(batch) -> List[Exercise]:
+        exercises = {
+            id(performed_exercise.exercise): performed_exercise.exercise
+            for _, performed in batch
+            for performed_exercise in performed
+            if performed_exercise.exercise.pk is None
+        }
+        return list(exercises.values())
+
+    @staticmethod
+    def _write_batch(user, batch, report) -> None:
+        created = ImportService._unsaved_exercises(batch)
+        performed_count, set_count = ImportService.write_workouts(user, batch)
+        report['created_exercises'].extend(exercise.name for exercise in created)
+        report['workouts'] += len(batch)
+        report['performed_exercises'] += performed_count
+        report['sets'] += set_count
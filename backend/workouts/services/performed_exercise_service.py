@@ -1,7 +1,13 @@
-from ..models import PerformedExercise, Workout
+from ..models import PerformedExercise, PerformedSet, Tombstone, Workout
 from django.contrib.auth.models import User
+from django.db import transaction
 from typing import List
 from ..exceptions.exceptions import WorkoutPermissionError
+from .workout_service import WorkoutService
+from .personal_record_service import PersonalRecordService
+from .rollup_service import RollupService
+from .sync_service import SyncService
+from ..analytics_cache import bump_data_version
 
 class PerformedExerciseService:
     @staticmethod
@@ -9,14 +15,134 @@ class PerformedExerciseService:
         """
         Get all performed exercises for a user's workouts
         """
-        return PerformedExercise.objects.filter(workout__user=user)
+        return PerformedExercise.objects.filter(workout__user=user).select_related('workout', 'exercise')
     
+    @staticmethod
+    def stored_volume(performed_exercise: PerformedExercise) -> int:
+        """
+        Volume as stored in the volume columns, rounded half up like the SQL reconcile
+        """
+        return max(int(performed_exercise.calculate_volume() + 0.5), 0)
+
+    @staticmethod
+    def refresh_derived_fields(performed_exercise: PerformedExercise) -> None:
+        """
+        Recompute the stored volume and per-session bests from the sets
+        """
+        performed_exercise.volume = PerformedExerciseService.stored_volume(performed_exercise)
+        for field, value in performed_exercise.calculate_session_stats().items():
+            setattr(performed_exercise, field, value)
+
+    @staticmethod
+    def build_sets(performed_exercise: PerformedExercise) -> List[PerformedSet]:
+        """
+        Expand reps_per_set/weights_per_set into unsaved PerformedSet rows
+        """
+        weights = performed_exercise.weights_per_set or []
+        return [
+            PerformedSet(
+                performed_exercise=performed_exercise,
+                position=position,
+                reps=reps,
+                weight=(weights[position] if position < len(weights) else 0) or 0,
+            )
+            for position, reps in enumerate(performed_exercise.reps_per_set or [])
+        ]
+
     @staticmethod
     def create_performed_exercise(data: dict) -> PerformedExercise:
         """
         Create a new performed exercise for a workout
         """
-        return PerformedExercise.objects.create(**data)
+        with transaction.atomic():
+            performed_exercise = PerformedExercise(**data)
+            PerformedExerciseService.refresh_derived_fields(performed_exercise)
+            performed_exercise.save()
+            PerformedSet.objects.bulk_create(PerformedExerciseService.build_sets(performed_exercise))
+            WorkoutService.apply_volume_delta(performed_exercise.workout_id, performed_exercise.volume)
+            contribution = RollupService.contribution(performed_exercise)
+            RollupService.apply_contribution(contribution)
+            PersonalRecordService.record_sessions([performed_exercise])
+            bump_data_version(contribution['user_id'])
+        return performed_exercise
+
+    @staticmethod
+    def bulk_create_performed_exercises(workout: Workout, items: List[dict]) -> List[PerformedExercise]:
+        """
+        Add several performed exercises to a workout with bulk inserts,
+        updating its total_volume and rollups once
+        """
+        if not items:
+            return []
+        with transaction.atomic():
+            performed = [PerformedExercise(workout=workout, **item) for item in items]
+            for performed_exercise in performed:
+                PerformedExerciseService.refresh_derived_fields(performed_exercise)
+            PerformedExercise.objects.bulk_create(performed)
+            PerformedSet.objects.bulk_create([
+                performed_set
+                for performed_exercise in performed
+                for performed_set in PerformedExerciseService.build_sets(performed_exercise)
+            ])
+            total = sum(performed_exercise.volume for performed_exercise in performed)
+            WorkoutService.apply_volume_delta(workout.id, total)
+            workout.total_volume += total
+            RollupService.apply_contributions(RollupService.contribution(pe) for pe in performed)
+            PersonalRecordService.record_sessions(performed)
+            bump_data_version(workout.user_id)
+        return performed
+
+    @staticmethod
+    def update_performed_exercise(performed_exercise: PerformedExercise, data: dict) -> PerformedExercise:
+        """
+        Update a performed exercise and move its volume between workout totals
+        """
+        with transaction.atomic():
+            old_workout_id = performed_exercise.workout_id
+            old_volume = performed_exercise.volume
+            old_contribution = RollupService.contribution(performed_exercise)
+            held_records = PersonalRecordService.records_held_by([performed_exercise.pk])
+            for field, value in data.items():
+                setattr(performed_exercise, field, value)
+            PerformedExerciseService.refresh_derived_fields(performed_exercise)
+            performed_exercise.save()
+            if 'reps_per_set' in data or 'weights_per_set' in data:
+                performed_exercise.performed_sets.all().delete()
+                PerformedSet.objects.bulk_create(PerformedExerciseService.build_sets(performed_exercise))
+
+            if performed_exercise.workout_id == old_workout_id:
+                WorkoutService.apply_volume_delta(old_workout_id, performed_exercise.volume - old_volume)
+            else:
+                WorkoutService.apply_volume_delta(old_workout_id, -old_volume)
+                WorkoutService.apply_volume_delta(performed_exercise.workout_id, performed_exercise.volume)
+            new_contribution = RollupService.contribution(performed_exercise)
+            RollupService.apply_contribution(old_contribution, sign=-1)
+            RollupService.apply_contribution(new_contribution)
+            # Records this session held are rebuilt without it, then its new sets count again
+            PersonalRecordService.recompute(held_records, exclude=[performed_exercise.pk])
+            PersonalRecordService.record_sessions([performed_exercise])
+            for user_id in {old_contribution['user_id'], new_contribution['user_id']}:
+                bump_data_version(user_id)
+        return performed_exercise
+
+    @staticmethod
+    def delete_performed_exercise(performed_exercise: PerformedExercise) -> None:
+        """
+        Delete a performed exercise and subtract its volume from the workout
+        """
+        with transaction.atomic():
+            workout_id = performed_exercise.workout_id
+            volume = performed_exercise.volume
+            contribution = RollupService.contribution(performed_exercise)
+            SyncService.record_deletions(contribution['user_id'], {
+                Tombstone.PERFORMED_EXERCISE: [performed_exercise.pk],
+            })
+            held_records = PersonalRecordService.records_held_by([performed_exercise.pk])
+            performed_exercise.delete()
+            WorkoutService.apply_volume_delta(workout_id, -volume)
+            RollupService.apply_contribution(contribution, sign=-1)
+            PersonalRecordService.recompute(held_records)
+            bump_data_version(contribution['user_id'])
     
     @staticmethod
     def verify_workout_ownership(workout: Workout, user: User) -> bool:
@@ -25,4 +151,4 @@ class PerformedExerciseService:
         """
         if workout.user != user:
             raise WorkoutPermissionError()
-        return True
\ No newline at end of file
+        return True
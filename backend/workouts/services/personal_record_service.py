@@ -0,0 +1,184 @@
+from ..models import PerformedExercise, PersonalRecord, epley_1rm
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from typing import Dict, Iterable, List, Set, Tuple
+
+RECORD_FIELDS = ('weight', 'estimated_1rm', 'volume')
+# Columns session_bests() reads from a performed exercise
+SESSION_FIELDS = ('id', 'exercise_id', 'reps_per_set', 'weights_per_set', 'best_weight', 'estimated_1rm', 'volume')
+
+RecordKey = Tuple[int, int, int]  # (user_id, exercise_id, reps)
+
+class PersonalRecordService:
+    """
+    Keeps PersonalRecord rows in step with performed exercise writes.
+
+    New sessions are folded into the existing records; a value only moves
+    when it is beaten, so ties keep the earlier session. Deleting or editing
+    a session recomputes just the records it held, from that user's history
+    of the one exercise.
+    """
+
+    @staticmethod
+    def session_bests(performed_exercise: PerformedExercise) -> Dict[int, dict]:
+        """
+        Best weight, estimated 1RM and volume per rep count in one session,
+        plus the whole-session bests under PersonalRecord.ANY_REPS
+        """
+        weights = performed_exercise.weights_per_set or []
+        bests = {}
+        for position, reps in enumerate(performed_exercise.reps_per_set or []):
+            if not reps:
+                continue
+            weight = float((weights[position] if position < len(weights) else 0) or 0)
+            best = bests.setdefault(reps, {'weight': 0.0, 'volume': 0.0})
+            best['weight'] = max(best['weight'], weight)
+            best['volume'] += reps * weight
+        for reps, best in bests.items():
+            best['estimated_1rm'] = round(epley_1rm(best['weight'], reps), 2)
+            best['volume'] = round(best['volume'], 2)
+        bests[PersonalRecord.ANY_REPS] = {
+            'weight': performed_exercise.best_weight,
+            'estimated_1rm': performed_exercise.estimated_1rm,
+            'volume': float(performed_exercise.volume),
+        }
+        return bests
+
+    @staticmethod
+    def _fold(record: PersonalRecord, performed_exercise: PerformedExercise, bests: dict) -> List[str]:
+        """
+        Apply one session's bests to a record; returns the fields it beat
+        """
+        beaten = []
+        for field in RECORD_FIELDS:
+            value = bests[field]
+            previous = getattr(record, field)
+            if value > previous:
+                beaten.append(field)
+            if value > previous or getattr(record, f'{field}_source_id') is None:
+                setattr(record, field, value)
+                setattr(record, f'{field}_source_id', performed_exercise.pk)
+        return beaten
+
+    @staticmethod
+    def record_sessions(performed_exercises: Iterable[PerformedExercise]) -> List[dict]:
+        """
+        Fold newly saved sessions into their records with one read and at
+        most one insert and one update. Each session gets a ``new_records``
+        list of the records it set; all of them are returned.
+        """
+        performed = sorted(performed_exercises, key=lambda pe: pe.pk)
+        if not performed:
+            return []
+        records = {
+            (record.user_id, record.exercise_id, record.reps): record
+            for record in PersonalRecord.objects.filter(
+                user_id__in={pe.workout.user_id for pe in performed},
+                exercise_id__in={pe.exercise_id for pe in performed},
+            )
+        }
+        created, changed, new_records = [], {}, []
+        for performed_exercise in performed:
+            performed_exercise.new_records = []
+            for reps, bests in PersonalRecordService.session_bests(performed_exercise).items():
+                key = (performed_exercise.workout.user_id, performed_exercise.exercise_id, reps)
+                record = records.get(key)
+                if record is None:
+                    record = records[key] = PersonalRecord(user_id=key[0], exercise_id=key[1], reps=reps)
+                    created.append(record)
+                previous = {
+                    field: getattr(record, field) if getattr(record, f'{field}_source_id') else None
+                    for field in RECORD_FIELDS
+                }
+                beaten = PersonalRecordService._fold(record, performed_exercise, bests)
+                if beaten and record.pk is not None:
+                    changed[key] = record
+                for field in beaten:
+                    performed_exercise.new_records.append({
+                        'performed_exercise': performed_exercise.pk,
+                        'exercise_id': performed_exercise.exercise_id,
+                        'reps': reps,
+                        'record': field,
+                        'value': bests[field],
+                        'previous': previous[field],
+                    })
+            new_records += performed_exercise.new_records
+        PersonalRecord.objects.bulk_create(created)
+        if changed:
+            PersonalRecord.objects.bulk_update(
+                changed.values(), [*RECORD_FIELDS, *(f'{field}_source' for field in RECORD_FIELDS)]
+            )
+        return new_records
+
+    @staticmethod
+    def records_held_by(performed_ids: Iterable[int]) -> Set[RecordKey]:
+        """
+        Keys of the records any of these sessions currently holds
+        """
+        performed_ids = list(performed_ids)
+        if not performed_ids:
+            return set()
+        return set(PersonalRecord.objects.filter(
+            Q(weight_source__in=performed_ids)
+            | Q(estimated_1rm_source__in=performed_ids)
+            | Q(volume_source__in=performed_ids)
+        ).values_list('user_id', 'exercise_id', 'reps'))
+
+    @staticmethod
+    def recompute(keys: Iterable[RecordKey], exclude: Iterable[int] = ()) -> None:
+        """
+        Rebuild the given records from history, ignoring the ``exclude``
+        sessions; records left without any session are deleted
+        """
+        wanted = {}
+        for user_id, exercise_id, reps in keys:
+            wanted.setdefault((user_id, exercise_id), set()).add(reps)
+        with transaction.atomic():
+            for (user_id, exercise_id), reps_wanted in wanted.items():
+                sessions = (
+                    PerformedExercise.objects.filter(workout__user_id=user_id, exercise_id=exercise_id)
+                    .exclude(pk__in=list(exclude))
+                    .only(*SESSION_FIELDS)
+                    .order_by('pk')
+                )
+                existing = {
+                    record.reps: record
+                    for record in PersonalRecord.objects.filter(
+                        user_id=user_id, exercise_id=exercise_id, reps__in=reps_wanted
+                    )
+                }
+                rebuilt = {}
+                for performed_exercise in sessions:
+                    for reps, bests in PersonalRecordService.session_bests(performed_exercise).items():
+                        if reps in reps_wanted:
+                            record = rebuilt.setdefault(reps, PersonalRecord(
+                                pk=getattr(existing.get(reps), 'pk', None),
+                                user_id=user_id, exercise_id=exercise_id, reps=reps,
+                            ))
+                            PersonalRecordService._fold(record, performed_exercise, bests)
+                PersonalRecord.objects.filter(pk__in=[
+                    record.pk for reps, record in existing.items() if reps not in rebuilt
+                ]).delete()
+                PersonalRecord.objects.bulk_create([record for record in rebuilt.values() if record.pk is None])
+                updated = [record for record in rebuilt.values() if record.pk is not None]
+                if updated:
+                    PersonalRecord.objects.bulk_update(
+                        updated, [*RECORD_FIELDS, *(f'{field}_source' for field in RECORD_FIELDS)]
+                    )
+
+    @staticmethod
+    def rebuild(user: User) -> int:
+        """
+        Recompute all of a user's records from scratch; returns how many were written
+        """
+        with transaction.atomic():
+            PersonalRecord.objects.filter(user=user).delete()
+            sessions = (
+                PerformedExercise.objects.filter(workout__user=user)
+                .select_related('workout')
+                .only('workout__user_id', *SESSION_FIELDS)
+                .order_by('pk')
+            )
+            PersonalRecordService.record_sessions(sessions)
+            return PersonalRecord.objects.filter(user=user).count()
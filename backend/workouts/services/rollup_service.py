@@ -0,0 +1,177 @@
+from ..models import DailyStats, DailyMuscleGroupStats, PerformedExercise, PerformedSet, Workout
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from typing import Iterable, Optional
+from ..analytics_cache import bump_data_version
+
+class RollupService:
+    """
+    Keeps DailyStats / DailyMuscleGroupStats in step with workout writes.
+
+    Performed exercise writes apply small deltas to the affected day; workout
+    level changes (date moves, deletes) rebuild just the affected days.
+    Days are UTC calendar days.
+    """
+
+    @staticmethod
+    def rollup_day(moment: datetime) -> date:
+        """
+        The UTC day a workout timestamp rolls up into
+        """
+        return moment.astimezone(dt_timezone.utc).date()
+
+    @staticmethod
+    def _bump(model, lookup: dict, deltas: dict) -> None:
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        row, _ = model.objects.get_or_create(**lookup)
+        model.objects.filter(pk=row.pk).update(
+            **{field: F(field) + delta for field, delta in deltas.items()}
+        )
+
+    @staticmethod
+    def contribution(performed_exercise: PerformedExercise) -> dict:
+        """
+        What a performed exercise adds to its day's rollups
+        """
+        reps = [r or 0 for r in performed_exercise.reps_per_set or []]
+        return {
+            'user_id': performed_exercise.workout.user_id,
+            'day': RollupService.rollup_day(performed_exercise.workout.date),
+            'muscle_group': performed_exercise.exercise.muscle_group,
+            'total_volume': performed_exercise.volume,
+            'set_count': len(reps),
+            'rep_count': sum(reps),
+        }
+
+    @staticmethod
+    def apply_contribution(contribution: dict, sign: int = 1) -> None:
+        """
+        Add (sign=1) or remove (sign=-1) a performed exercise contribution
+        """
+        deltas = {
+            field: sign * contribution[field]
+            for field in ('total_volume', 'set_count', 'rep_count')
+        }
+        day_lookup = {'user_id': contribution['user_id'], 'day': contribution['day']}
+        RollupService._bump(DailyStats, day_lookup, deltas)
+        RollupService._bump(
+            DailyMuscleGroupStats,
+            {**day_lookup, 'muscle_group': contribution['muscle_group']},
+            deltas,
+        )
+
+    @staticmethod
+    def apply_contributions(contributions: Iterable[dict], sign: int = 1) -> None:
+        """
+        Apply many contributions, merged so each affected row is bumped once
+        """
+        merged = {}
+        for contribution in contributions:
+            key = (contribution['user_id'], contribution['day'], contribution['muscle_group'])
+            totals = merged.setdefault(key, dict(contribution, total_volume=0, set_count=0, rep_count=0))
+            for field in ('total_volume', 'set_count', 'rep_count'):
+                totals[field] += contribution[field]
+        days = {}
+        for (user_id, day, _), totals in merged.items():
+            RollupService._bump(
+                DailyMuscleGroupStats,
+                {'user_id': user_id, 'day': day, 'muscle_group': totals['muscle_group']},
+                {field: sign * totals[field] for field in ('total_volume', 'set_count', 'rep_count')},
+            )
+            day_totals = days.setdefault((user_id, day), {'total_volume': 0, 'set_count': 0, 'rep_count': 0})
+            for field in day_totals:
+                day_totals[field] += sign * totals[field]
+        for (user_id, day), deltas in days.items():
+            RollupService._bump(DailyStats, {'user_id': user_id, 'day': day}, deltas)
+
+    @staticmethod
+    def record_workout(workout: Workout, sign: int = 1) -> None:
+        """
+        Count a newly created workout (sign=1) towards its day
+        """
+        RollupService._bump(
+            DailyStats,
+            {'user_id': workout.user_id, 'day': RollupService.rollup_day(workout.date)},
+            {'workout_count': sign},
+        )
+
+    @staticmethod
+    def rebuild(user: User, days: Optional[Iterable[date]] = None, batch_size: int = 1000) -> int:
+        """
+        Recompute rollup rows from the raw tables, for all of a user's
+        history or only the given days. Returns the number of days written.
+        """
+        workouts = Workout.objects.filter(user=user)
+        daily = DailyStats.objects.filter(user=user)
+        muscle = DailyMuscleGroupStats.objects.filter(user=user)
+        if days is not None:
+            days = set(days)
+            if not days:
+                return 0
+            # Bound the scan by the day span, then keep only the requested days;
+            # a single IN stays small in SQL however many days are passed
+            start = datetime.combine(min(days), time.min, tzinfo=dt_timezone.utc)
+            end = datetime.combine(max(days), time.min, tzinfo=dt_timezone.utc) + timedelta(days=1)
+            workouts = (
+                workouts.filter(date__gte=start, date__lt=end)
+                .alias(rollup_day=TruncDate('date', tzinfo=dt_timezone.utc))
+                .filter(rollup_day__in=days)
+            )
+            daily = daily.filter(day__in=days)
+            muscle = muscle.filter(day__in=days)
+
+        utc_day = TruncDate('date', tzinfo=dt_timezone.utc)
+        per_day = (
+            workouts.annotate(day=utc_day)
+            .values('day')
+            .annotate(workout_count=Count('id'), total_volume=Sum('total_volume'))
+        )
+        volumes = (
+            PerformedExercise.objects.filter(workout__in=workouts)
+            .annotate(day=TruncDate('workout__date', tzinfo=dt_timezone.utc))
+            .values('day', 'exercise__muscle_group')
+            .annotate(total_volume=Sum('volume'))
+        )
+        sets = (
+            PerformedSet.objects.filter(performed_exercise__workout__in=workouts)
+            .annotate(day=TruncDate('performed_exercise__workout__date', tzinfo=dt_timezone.utc))
+            .values('day', 'performed_exercise__exercise__muscle_group')
+            .annotate(set_count=Count('id'), rep_count=Sum('reps'))
+        )
+
+        day_rows = {
+            row['day']: DailyStats(
+                user=user,
+                day=row['day'],
+                workout_count=row['workout_count'],
+                total_volume=row['total_volume'] or 0,
+            )
+            for row in per_day
+        }
+        muscle_rows = {}
+        for row in volumes:
+            key = (row['day'], row['exercise__muscle_group'])
+            muscle_rows[key] = DailyMuscleGroupStats(
+                user=user, day=row['day'], muscle_group=key[1], total_volume=row['total_volume'] or 0
+            )
+        for row in sets:
+            key = (row['day'], row['performed_exercise__exercise__muscle_group'])
+            stats = muscle_rows.setdefault(key, DailyMuscleGroupStats(user=user, day=key[0], muscle_group=key[1]))
+            stats.set_count = row['set_count']
+            stats.rep_count = row['rep_count'] or 0
+            day_stats = day_rows[key[0]]
+            day_stats.set_count += stats.set_count
+            day_stats.rep_count += stats.rep_count
+
+        with transaction.atomic():
+            daily.delete()
+            muscle.delete()
+            DailyStats.objects.bulk_create(day_rows.values(), batch_size=batch_size)
+            DailyMuscleGroupStats.objects.bulk_create(muscle_rows.values(), batch_size=batch_size)
+            bump_data_version(user.pk)
+        return len(day_rows)
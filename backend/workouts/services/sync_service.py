@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from ..exceptions.exceptions import InvalidQueryParameterError
+from ..models import Exercise, PerformedExercise, Tombstone, Workout
+
+# Changes are re-sent for this long before the client's token, so rows whose
+# transaction committed after the previous sync read its snapshot are not
+# missed. Clients apply rows as idempotent upserts.
+SYNC_OVERLAP = timedelta(seconds=30)
+
+# Response keys for each kind of tombstone
+DELETED_KEYS = {
+    Tombstone.WORKOUT: 'workouts',
+    Tombstone.PERFORMED_EXERCISE: 'performed_exercises',
+    Tombstone.EXERCISE: 'exercises',
+}
+
+class SyncService:
+    @staticmethod
+    def encode_token(moment: datetime) -> str:
+        return str(int(moment.timestamp() * 1_000_000))
+
+    @staticmethod
+    def decode_token(token: str) -> datetime:
+        try:
+            return datetime.fromtimestamp(int(token) / 1_000_000, tz=dt_timezone.utc)
+        except (TypeError, ValueError, OverflowError, OSError):
+            raise InvalidQueryParameterError(f"Invalid sync token '{token}'.")
+
+    @staticmethod
+    def record_deletions(user_id: int, deleted: Dict[str, Iterable[int]]) -> None:
+        """
+        Leave tombstones for rows about to be deleted, keyed by Tombstone kind
+        """
+        Tombstone.objects.bulk_create([
+            Tombstone(user_id=user_id, kind=kind, object_id=object_id)
+            for kind, ids in deleted.items()
+            for object_id in ids
+        ])
+
+    @staticmethod
+    def changes(user: User, since: Optional[datetime] = None) -> dict:
+        """
+        Rows changed and ids deleted since ``since``, plus the token for the next call.
+
+        Without ``since``, or when it is older than the tombstone retention
+        window, everything is returned with ``full`` set and the client
+        should replace its local copy.
+        """
+        now = timezone.now()
+        full = since is None or since < now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        workouts = Workout.objects.filter(user=user).order_by('id')
+        performed = (
+            PerformedExercise.objects.filter(workout__user=user)
+            .select_related('exercise')
+            .order_by('id')
+        )
+        exercises = Exercise.objects.filter(owner=user).order_by('id')
+        deleted = {key: [] for key in DELETED_KEYS.values()}
+
+        if not full:
+            floor = since - SYNC_OVERLAP
+            workouts = workouts.filter(updated_at__gte=floor)
+            performed = performed.filter(updated_at__gte=floor)
+            exercises = exercises.filter(updated_at__gte=floor)
+            tombstones = Tombstone.objects.filter(user=user, deleted_at__gte=floor)
+            for kind, object_id in tombstones.values_list('kind', 'object_id'):
+                deleted[DELETED_KEYS[kind]].append(object_id)
+
+        return {
+            'token': SyncService.encode_token(now),
+            'full': full,
+            'workouts': workouts,
+            'performed_exercises': performed,
+            'exercises': exercises,
+            'deleted': deleted,
+        }
+
+    @staticmethod
+    def prune_tombstones(older_than: Optional[datetime] = None) -> int:
+        """
+        Drop tombstones past the retention window; returns how many were removed
+        """
+        if older_than is None:
+            older_than = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=older_than).delete()
+        return deleted
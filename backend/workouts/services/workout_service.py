@@ -1,22 +1,89 @@
-from ..models import Workout
+from ..models import Workout, PerformedExercise, PerformedSet, Tombstone
 from django.contrib.auth.models import User
-from typing import List
+from django.db import transaction
+from django.db.models import F, FloatField, IntegerField, OuterRef, Prefetch, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, Floor, Greatest
+from django.utils import timezone
+from typing import List, Optional
 from ..exceptions.exceptions import WorkoutNotFoundError, WorkoutPermissionError
+from .personal_record_service import PersonalRecordService
+from .rollup_service import RollupService
+from .sync_service import SyncService
+from ..analytics_cache import bump_data_version
+
+# Catalog columns the nested workout representation never reads
+EMBEDDED_EXERCISE_DEFERRED = (
+    'exercise__primaryMuscles',
+    'exercise__secondaryMuscles',
+    'exercise__instructions',
+    'exercise__images',
+)
 
 class WorkoutService:
     @staticmethod
-    def get_user_workouts(user: User) -> List[Workout]:
+    def get_user_workouts(user: User, with_exercises: bool = False) -> List[Workout]:
         """
-        Get all workouts for a specific user
+        Get all workouts for a specific user, optionally with their performed
+        exercises and exercise names prefetched in one extra query
         """
-        return Workout.objects.filter(user=user)
+        workouts = Workout.objects.filter(user=user)
+        if with_exercises:
+            performed = (
+                PerformedExercise.objects.select_related('exercise')
+                .defer(*EMBEDDED_EXERCISE_DEFERRED)
+                .order_by('id')
+            )
+            workouts = workouts.prefetch_related(Prefetch('performed_exercises', queryset=performed))
+        return workouts
     
     @staticmethod
     def create_workout(user: User, data: dict) -> Workout:
         """
         Create a new workout for a user
         """
-        return Workout.objects.create(user=user, **data)
+        with transaction.atomic():
+            workout = Workout.objects.create(user=user, **data)
+            RollupService.record_workout(workout)
+            bump_data_version(user.pk)
+        return workout
+
+    @staticmethod
+    def update_workout(workout: Workout, data: dict) -> Workout:
+        """
+        Update a workout, moving its rollups if the date changed days
+        """
+        with transaction.atomic():
+            old_day = RollupService.rollup_day(workout.date)
+            for field, value in data.items():
+                setattr(workout, field, value)
+            # Only write the edited fields so a stale total_volume never
+            # overwrites the deltas applied by performed exercise writes;
+            # updated_at is auto_now and must be listed to be written
+            workout.save(update_fields=[*data, 'updated_at'])
+            new_day = RollupService.rollup_day(workout.date)
+            if new_day != old_day:
+                RollupService.rebuild(workout.user, days={old_day, new_day})
+            bump_data_version(workout.user_id)
+        return workout
+
+    @staticmethod
+    def delete_workout(workout: Workout) -> None:
+        """
+        Delete a workout and its performed exercises, then rebuild its day
+        """
+        with transaction.atomic():
+            day = RollupService.rollup_day(workout.date)
+            user = workout.user
+            performed_ids = list(workout.performed_exercises.values_list('id', flat=True))
+            SyncService.record_deletions(user.pk, {
+                Tombstone.WORKOUT: [workout.pk],
+                Tombstone.PERFORMED_EXERCISE: performed_ids,
+            })
+            held_records = PersonalRecordService.records_held_by(performed_ids)
+            workout.delete()
+            RollupService.rebuild(user, days={day})
+            PersonalRecordService.recompute(held_records)
+            bump_data_version(user.pk)
     
     @staticmethod
     def get_workout_by_id(workout_id: int, user: User) -> Workout:
@@ -29,4 +96,71 @@ class WorkoutService:
                 raise WorkoutPermissionError()
             return workout
         except Workout.DoesNotExist:
-            raise WorkoutNotFoundError()
\ No newline at end of file
+            raise WorkoutNotFoundError()
+
+    @staticmethod
+    def apply_volume_delta(workout_id: int, delta: int) -> None:
+        """
+        Atomically shift a workout's total_volume by delta in the database
+        """
+        if not delta:
+            return
+        Workout.objects.filter(pk=workout_id).update(
+            total_volume=Greatest(F('total_volume') + delta, 0),
+            updated_at=timezone.now(),
+        )
+
+    @staticmethod
+    def reconcile_total_volume(workouts=None, dry_run: bool = False) -> int:
+        """
+        Recompute stored volumes from the set table and fix any drift.
+
+        Both steps are single UPDATE statements: performed exercise volumes
+        are re-aggregated from PerformedSet, then every workout whose
+        total_volume disagrees with the sum of its performed exercises is
+        corrected, and the rollup days of corrected workouts are rebuilt.
+        Returns the number of drifted workouts; with dry_run the changes are
+        rolled back.
+        """
+        if workouts is None:
+            workouts = Workout.objects.all()
+
+        set_volume = Subquery(
+            PerformedSet.objects.filter(performed_exercise=OuterRef('pk'))
+            .order_by()
+            .values('performed_exercise')
+            .annotate(total=Sum(F('reps') * F('weight'), output_field=FloatField()))
+            .values('total')
+        )
+        workout_volume = Coalesce(Subquery(
+            PerformedExercise.objects.filter(workout=OuterRef('pk'))
+            .order_by()
+            .values('workout')
+            .annotate(total=Sum('volume'))
+            .values('total')
+        ), 0)
+
+        pe_volume = Cast(Floor(Coalesce(set_volume, 0.0) + 0.5), IntegerField())
+        now = timezone.now()
+
+        with transaction.atomic():
+            stale = (
+                PerformedExercise.objects.filter(workout__in=workouts)
+                .annotate(actual=pe_volume)
+                .exclude(volume=F('actual'))
+            )
+            PerformedExercise.objects.filter(pk__in=stale.values('pk')).update(volume=pe_volume, updated_at=now)
+            drifted = workouts.annotate(actual=workout_volume).exclude(total_volume=F('actual'))
+            drifted_days = {}
+            for user_id, date in drifted.values_list('user_id', 'date'):
+                drifted_days.setdefault(user_id, set()).add(RollupService.rollup_day(date))
+            count = Workout.objects.filter(pk__in=drifted.values('pk')).update(
+                total_volume=workout_volume, updated_at=now
+            )
+            if dry_run:
+                transaction.set_rollback(True)
+            else:
+                # The rollups summed the drifted volumes too
+                for user in User.objects.filter(pk__in=drifted_days):
+                    RollupService.rebuild(user, days=drifted_days[user.pk])
+        return count
@@ -0,0 +1,170 @@
+# backend/workouts/synthetic.py
+
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+
+from .models import Exercise, PerformedExercise, Workout
+from .services.import_service import ImportService
+from .services.performed_exercise_service import PerformedExerciseService
+
+SYNTHETIC_PASSWORD = 'synthetic'
+DEFAULT_BATCH_SIZE = 200
+
+# Seeded users get an address in the reserved .invalid domain (RFC 2606),
+# which no real account can receive mail at; cleanup deletes only them
+SYNTHETIC_EMAIL_DOMAIN = 'synthetic.invalid'
+
+# Starting working weight range (kg) for an average trainee, by equipment;
+# bodyweight movements log 0
+EQUIPMENT_LOADS = {
+    'barbell': (40, 100),
+    'e-z curl bar': (20, 40),
+    'dumbbell': (8, 30),
+    'kettlebells': (12, 28),
+    'machine': (30, 90),
+    'cable': (15, 50),
+    'bands': (0, 0),
+    'body only': (0, 0),
+}
+# Target reps per set a lifter picks for an exercise, and how often
+REP_TARGETS = ((5, 3), (8, 4), (10, 4), (12, 2), (15, 1))
+# Days between sessions
+REST_DAYS = (1, 2, 2, 3, 3, 4)
+# Exercises in each user's program
+PROGRAM_SIZE = 14
+
+def catalog_pool():
+    """
+    Global catalog exercises suitable for logging sets with weights, as
+    (id, muscle_group, equipment) tuples
+    """
+    return list(
+        Exercise.objects.filter(owner__isnull=True, equipment__in=EQUIPMENT_LOADS)
+        .exclude(category__in=('stretching', 'cardio'))
+        .order_by('id')
+        .values_list('id', 'muscle_group', 'equipment')
+    )
+
+class SyntheticLifter:
+    """
+    One generated user's training history: a fixed program drawn from the
+    catalog, a strength level, and slow progressive overload with noise.
+    All randomness comes from ``rng``, so a seed reproduces the history.
+    """
+
+    def __init__(self, rng, pool):
+        self.rng = rng
+        by_group = {}
+        for entry in pool:
+            by_group.setdefault(entry[1], []).append(entry)
+        # Cover every muscle group before doubling up
+        groups = sorted(by_group)
+        program = []
+        while len(program) < min(PROGRAM_SIZE, len(pool)):
+            group = groups[len(program) % len(groups)]
+            candidates = [entry for entry in by_group[group] if entry not in program] or \
+                [entry for entry in pool if entry not in program]
+            program.append(rng.choice(candidates))
+        strength = rng.uniform(0.6, 1.4)
+        reps, weights = zip(*REP_TARGETS)
+        self.program = [
+            {
+                'exercise_id': exercise_id,
+                'start': rng.uniform(*EQUIPMENT_LOADS[equipment]) * strength,
+                'weekly_gain': rng.uniform(0.002, 0.01),
+                'reps': rng.choices(reps, weights)[0] if EQUIPMENT_LOADS[equipment][1] else rng.randint(8, 20),
+                'sets': rng.randint(3, 5),
+            }
+            for exercise_id, _, equipment in program
+        ]
+
+    def session(self, plan, week):
+        """reps_per_set and weights_per_set for one exercise in a given week"""
+        rng = self.rng
+        load = plan['start'] * min((1 + plan['weekly_gain']) ** week, 1.6) * rng.uniform(0.95, 1.03)
+        weight = round(load / 2.5) * 2.5 if load else 0
+        reps, weights = [], []
+        for position in range(plan['sets']):
+            fatigue = position * rng.choice((0, 0, 1))
+            reps.append(max(1, plan['reps'] - fatigue + rng.choice((-1, 0, 0, 0, 1))))
+            # An occasional lighter back-off set at the end
+            last = position == plan['sets'] - 1
+            weights.append(round(weight * 0.9 / 2.5) * 2.5 if last and weight and rng.random() < 0.2 else weight)
+        return reps, weights
+
+    def workouts(self, user, count, exercises_per_workout, end):
+        """Unsaved (workout, performed exercises) pairs, oldest first, ending around ``end``"""
+        rng = self.rng
+        gaps = [rng.choice(REST_DAYS) for _ in range(count)]
+        start = day = end - timedelta(days=sum(gaps))
+        for gap in gaps:
+            day += timedelta(days=gap)
+            date = day.replace(hour=rng.randint(6, 20), minute=rng.choice((0, 15, 30, 45)))
+            week = (day - start).days // 7
+            workout = Workout(user=user, date=date, name=f'Session {date:%a %d %b}')
+            performed = []
+            for plan in rng.sample(self.program, min(exercises_per_workout, len(self.program))):
+                reps, weights = self.session(plan, week)
+                performed_exercise = PerformedExercise(
+                    workout=workout, exercise_id=plan['exercise_id'],
+                    sets=len(reps), reps_per_set=reps, weights_per_set=weights,
+                )
+                PerformedExerciseService.refresh_derived_fields(performed_exercise)
+                performed.append(performed_exercise)
+            workout.total_volume = sum(pe.volume for pe in performed)
+            yield workout, performed
+
+def synthetic_users(prefix=''):
+    """Users created by seed_users whose usernames start with ``prefix``"""
+    return User.objects.filter(username__startswith=prefix, email__iendswith=f'@{SYNTHETIC_EMAIL_DOMAIN}')
+
+def seed_users(
+    users,
+    workouts_per_user,
+    exercises_per_workout,
+    seed=0,
+    prefix='synthetic',
+    end=None,
+    batch_size=DEFAULT_BATCH_SIZE,
+    pool=None,
+):
+    """
+    Create ``users`` synthetic users with generated histories, written in
+    bulk through ImportService.write_workouts so rollups and personal
+    records are maintained as for real imports. The same arguments always
+    produce the same data. Returns the created users and row counts.
+    """
+    pool = pool if pool is not None else catalog_pool()
+    if not pool:
+        raise ValueError('The exercise catalog has no exercises to log.')
+    # Histories end yesterday, so no session lands in the future
+    end = end or datetime.now(dt_timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+    password = make_password(SYNTHETIC_PASSWORD)
+    usernames = [f'{prefix}{number:04d}' for number in range(users)]
+    created = User.objects.bulk_create([
+        User(username=username, email=f'{username}@{SYNTHETIC_EMAIL_DOMAIN}', password=password)
+        for username in usernames
+    ])
+    created = list(User.objects.filter(username__in=[user.username for user in created]).order_by('username'))
+
+    counts = {'users': len(created), 'workouts': 0, 'performed_exercises': 0, 'sets': 0}
+    for number, user in enumerate(created):
+        lifter = SyntheticLifter(random.Random(f'{seed}:{number}'), pool)
+        batch = []
+        for pair in lifter.workouts(user, workouts_per_user, exercises_per_workout, end):
+            batch.append(pair)
+            if len(batch) >= batch_size:
+                _write(user, batch, counts)
+                batch = []
+        if batch:
+            _write(user, batch, counts)
+    return created, counts
+
+def _write(user, batch, counts):
+    performed, sets = ImportService.write_workouts(user, batch)
+    counts['workouts'] += len(batch)
+    counts['performed_exercises'] += performed
+    counts['sets'] += sets
@@ -1,3 +1,1362 @@
-from django.test import TestCase
+import io
+import json
+import os
+import random
+import tempfile
+import time
+from functools import partial
+from importlib import import_module
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import LiveServerTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .analytics_cache import cache_stats
+from .benchmarks import compare, run_size
+from .loadtest import HISTORY_PAGES, LoadStats, VirtualUser, parse_mix
+from .metrics import REQUEST_LATENCY, REQUESTS, MetricsRegistry
+from .analytics import (
+    calculate_volume_per_set,
+    get_dashboard_data,
+    get_exercise_progression,
+    get_muscle_group_distribution,
+    get_muscle_load,
+    get_rollup_buckets,
+    get_top_workouts_by_volume,
+    get_weekly_volume_data,
+    get_weekly_workout_frequency,
+    range_cache_key,
+)
+from .models import (
+    MAX_SET_REPS, MAX_SET_WEIGHT, MAX_SETS, DailyMuscleGroupStats, DailyStats, Exercise, PerformedExercise,
+    PerformedSet, PersonalRecord, Tombstone, Workout,
+)
+from .services.export_service import ExportService
+from .services.import_service import ImportService
+from .services.performed_exercise_service import PerformedExerciseService
+from .services.personal_record_service import PersonalRecordService
+from .services.rollup_service import RollupService
+from .services.sync_service import SyncService
+from .services.workout_service import WorkoutService
+from .synthetic import SYNTHETIC_PASSWORD, seed_users, synthetic_users
+
+
+@override_settings(REQUEST_TIMING_ENABLED=False)
+class AppTestCase(TestCase):
+    """
+    Development settings turn request timing on, where slow test requests
+    would each log a slow_request line; the timing tests turn it back on
+    """
+
+
+def log_workout(user, date, entries):
+    """Log a workout through the service layer, as the API does"""
+    workout = WorkoutService.create_workout(user, {'date': date})
+    for exercise, reps, weights in entries:
+        PerformedExerciseService.create_performed_exercise({
+            'workout': workout,
+            'exercise': exercise,
+            'sets': len(reps),
+            'reps_per_set': reps,
+            'weights_per_set': weights,
+        })
+    workout.refresh_from_db()
+    return workout
+
+
+def rollup_snapshot(user):
+    daily = DailyStats.objects.filter(user=user).exclude(
+        total_volume=0, workout_count=0, set_count=0, rep_count=0
+    )
+    muscle = DailyMuscleGroupStats.objects.filter(user=user).exclude(
+        total_volume=0, set_count=0, rep_count=0
+    )
+    return (
+        sorted(daily.values_list('day', 'total_volume', 'workout_count', 'set_count', 'rep_count')),
+        sorted(muscle.values_list('day', 'muscle_group', 'total_volume', 'set_count', 'rep_count')),
+    )
+
+
+def legacy_weekly_volume(user, start_date, end_date):
+    """The original Python bucketing, kept as the reference output"""
+    weekly = {}
+    workouts = Workout.objects.filter(user=user, date__range=(start_date, end_date))
+    for workout in workouts.prefetch_related('performed_exercises'):
+        year, week, _ = workout.date.isocalendar()
+        key = f"{year}-W{week:02d}"
+        volume = sum(calculate_volume_per_set(pe) for pe in workout.performed_exercises.all())
+        bucket = weekly.setdefault(key, {'total_volume': 0, 'workout_count': 0})
+        bucket['total_volume'] += volume
+        bucket['workout_count'] += 1
+    return [
+        {
+            'week': key,
+            'avgVolumePerWorkout': round(data['total_volume'] / data['workout_count'], 2),
+            'totalVolume': round(data['total_volume'], 2),
+            'workoutCount': data['workout_count'],
+        }
+        for key, data in sorted(weekly.items())
+    ]
+
+
+def legacy_weekly_frequency(user, start_date, end_date):
+    counts = {}
+    for workout in Workout.objects.filter(user=user, date__range=(start_date, end_date)):
+        year, week, _ = workout.date.isocalendar()
+        key = f"{year}-W{week:02d}"
+        counts[key] = counts.get(key, 0) + 1
+    return [{'week': key, 'workoutCount': count} for key, count in sorted(counts.items())]
+
+
+class WeeklyAnalyticsTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='lifter', password='pw')
+        cls.other = User.objects.create_user(username='other', password='pw')
+        cls.bench = Exercise.objects.create(name='Bench Press', muscle_group='chest')
+        cls.squat = Exercise.objects.create(name='Squat', muscle_group='legs')
+
+        cls.start = datetime(2024, 12, 1, tzinfo=dt_timezone.utc)
+        cls.end = datetime(2025, 3, 1, tzinfo=dt_timezone.utc)
+
+        # Spread workouts over several ISO weeks, including the 2024/2025
+        # year boundary and late-Sunday / early-Monday sessions.
+        dates = [
+            datetime(2024, 12, 2, 18, 0, tzinfo=dt_timezone.utc),
+            datetime(2024, 12, 4, 7, 30, tzinfo=dt_timezone.utc),
+            datetime(2024, 12, 29, 23, 30, tzinfo=dt_timezone.utc),
+            datetime(2024, 12, 30, 0, 15, tzinfo=dt_timezone.utc),
+            datetime(2025, 1, 5, 12, 0, tzinfo=dt_timezone.utc),
+            datetime(2025, 2, 10, 2, 0, tzinfo=dt_timezone.utc),
+            datetime(2025, 2, 11, 19, 45, tzinfo=dt_timezone.utc),
+        ]
+        for i, date in enumerate(dates):
+            cls._log_workout(cls.user, date, [
+                (cls.bench, [10, 8, 8], [100, 105, 110 + i]),
+                (cls.squat, [5, 5, 5], [200 + 5 * i, 200, None]),
+            ])
+        # An empty workout still counts towards frequency.
+        cls._log_workout(cls.user, datetime(2025, 1, 8, tzinfo=dt_timezone.utc), [])
+        # Out-of-range and other-user workouts must be ignored.
+        cls._log_workout(cls.user, datetime(2025, 6, 1, tzinfo=dt_timezone.utc), [(cls.bench, [1], [300])])
+        cls._log_workout(cls.other, datetime(2025, 1, 6, tzinfo=dt_timezone.utc), [(cls.bench, [10], [50])])
+
+    @classmethod
+    def _log_workout(cls, user, date, entries):
+        return log_workout(user, date, entries)
+
+    def test_weekly_volume_matches_python_implementation(self):
+        expected = legacy_weekly_volume(self.user, self.start, self.end)
+        with self.assertNumQueries(1):
+            actual = get_weekly_volume_data(self.user, self.start, self.end)
+        self.assertEqual(actual, expected)
+        self.assertIn('2025-W01', [row['week'] for row in actual])
+
+    def test_weekly_frequency_matches_python_implementation(self):
+        expected = legacy_weekly_frequency(self.user, self.start, self.end)
+        with self.assertNumQueries(1):
+            actual = get_weekly_workout_frequency(self.user, self.start, self.end)
+        self.assertEqual(actual, expected)
+
+    def test_default_range_matches_python_implementation(self):
+        now = datetime(2025, 3, 1, tzinfo=dt_timezone.utc)
+        expected = legacy_weekly_volume(self.user, now - timedelta(days=180), now)
+        self.assertEqual(get_weekly_volume_data(self.user, end_date=now), expected)
+
+    def test_dashboard_reads_weekly_sections_once(self):
+        weekly_only = ('weekly_volume', 'weekly_frequency', 'current_week')
+        with self.assertNumQueries(1):
+            data = get_dashboard_data(self.user, weekly_only, self.start, self.end)
+        self.assertEqual(data['weekly_volumes'], get_weekly_volume_data(self.user, self.start, self.end))
+        self.assertEqual(data['weekly_frequency'], get_weekly_workout_frequency(self.user, self.start, self.end))
+        self.assertEqual(data['current_week']['week'], '2025-W09')
+        self.assertEqual(data['current_week']['workoutCount'], 0)
+
+        with self.assertNumQueries(2):
+            data = get_dashboard_data(self.user, start_date=self.start, end_date=self.end, top_limit=3)
+        self.assertEqual(data['top_workouts'], get_top_workouts_by_volume(self.user, 3))
+
+    def test_weeks_are_truncated_in_requested_timezone(self):
+        new_york = ZoneInfo('America/New_York')
+        utc_weeks = get_weekly_workout_frequency(self.user, self.start, self.end)
+        local_weeks = get_weekly_workout_frequency(self.user, self.start, self.end, tz=new_york)
+
+        # Monday 2025-02-10 02:00 UTC is still Sunday evening in New York.
+        self.assertIn({'week': '2025-W07', 'workoutCount': 2}, utc_weeks)
+        self.assertIn({'week': '2025-W06', 'workoutCount': 1}, local_weeks)
+        self.assertIn({'week': '2025-W07', 'workoutCount': 1}, local_weeks)
+        self.assertEqual(
+            sum(row['workoutCount'] for row in utc_weeks),
+            sum(row['workoutCount'] for row in local_weeks),
+        )
+
+
+class TopWorkoutsTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.bench = Exercise.objects.create(name='Bench Press', muscle_group='chest')
+        self.row = Exercise.objects.create(name='Barbell Row', muscle_group='back')
+        day = datetime(2025, 1, 6, 18, 0, tzinfo=dt_timezone.utc)
+        self.light = log_workout(self.user, day, [(self.bench, [10], [50])])
+        self.heavy = log_workout(self.user, day + timedelta(days=1), [
+            (self.bench, [5, 5], [100, 100]), (self.row, [8], [80]),
+        ])
+        self.middle = log_workout(self.user, day + timedelta(days=2), [(self.row, [10], [70])])
+        other = User.objects.create_user(username='other', password='pw')
+        log_workout(other, day, [(self.bench, [10], [500])])
+
+    def test_orders_by_volume_with_exercise_counts_and_clamps_limit(self):
+        top = get_top_workouts_by_volume(self.user, limit=500)
+        self.assertEqual(
+            [(row['id'], row['total_volume'], row['exercise_count']) for row in top],
+            [(self.heavy.pk, 1640, 2), (self.middle.pk, 700, 1), (self.light.pk, 500, 1)],
+        )
+        self.assertEqual([row['id'] for row in get_top_workouts_by_volume(self.user, limit=0)], [self.heavy.pk])
+
+    def test_equal_volumes_are_ordered_newest_first(self):
+        day = self.light.date
+        same_day = log_workout(self.user, day, [(self.row, [10], [50])])
+        newer = log_workout(self.user, day + timedelta(days=5), [(self.bench, [5], [100])])
+        top = get_top_workouts_by_volume(self.user, limit=10)
+        self.assertEqual([row['id'] for row in top][2:], [newer.pk, same_day.pk, self.light.pk])
+
+    def test_equivalent_limits_share_a_cache_entry(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        client.get('/api/analytics/top-workouts/', {'limit': 500})
+        misses = cache_stats()['misses']
+        response = client.get('/api/analytics/top-workouts/', {'limit': 100})
+        self.assertEqual(cache_stats()['misses'], misses)
+        self.assertEqual(len(response.data['top_workouts']), 3)
+
+
+class WorkoutVolumeTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.bench = Exercise.objects.create(name='Bench Press', muscle_group='chest')
+        self.monday = datetime(2025, 1, 6, 18, 0, tzinfo=dt_timezone.utc)
+        self.first = log_workout(self.user, self.monday, [(self.bench, [10, 8], [100, 110])])
+        self.second = log_workout(self.user, self.monday + timedelta(days=1), [(self.bench, [5], [100])])
+
+    def totals(self):
+        return list(Workout.objects.filter(pk__in=[self.first.pk, self.second.pk]).order_by('id').values_list(
+            'total_volume', flat=True,
+        ))
+
+    def test_performed_exercise_writes_apply_volume_deltas(self):
+        self.assertEqual(self.totals(), [1880, 500])
+        pe = PerformedExerciseService.create_performed_exercise({
+            'workout': self.first, 'exercise': self.bench, 'sets': 1, 'reps_per_set': [3], 'weights_per_set': [120.5],
+        })
+        self.assertEqual((pe.volume, self.totals()), (362, [2242, 500]))
+
+        PerformedExerciseService.update_performed_exercise(pe, {'reps_per_set': [4], 'weights_per_set': [100]})
+        self.assertEqual(self.totals(), [2280, 500])
+
+        PerformedExerciseService.update_performed_exercise(pe, {'workout': self.second})
+        self.assertEqual(self.totals(), [1880, 900])
+
+        PerformedExerciseService.delete_performed_exercise(pe)
+        self.assertEqual(self.totals(), [1880, 500])
+
+    def test_reconcile_repairs_drifted_volumes_and_rollups(self):
+        expected = self.totals(), rollup_snapshot(self.user)
+        PerformedExercise.objects.filter(workout=self.first).update(volume=7)
+        Workout.objects.filter(pk=self.first.pk).update(total_volume=7)
+        Workout.objects.filter(pk=self.second.pk).update(total_volume=0)
+        DailyStats.objects.filter(user=self.user).update(total_volume=1)
+        DailyMuscleGroupStats.objects.filter(user=self.user).update(total_volume=1)
+
+        self.assertEqual(WorkoutService.reconcile_total_volume(dry_run=True), 2)
+        self.assertEqual(self.totals(), [7, 0])
+        self.assertEqual(WorkoutService.reconcile_total_volume(), 2)
+        self.assertEqual((self.totals(), rollup_snapshot(self.user)), expected)
+        self.assertEqual(WorkoutService.reconcile_total_volume(), 0)
+
+
+class RollupMaintenanceTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.bench = Exercise.objects.create(name='Bench Press', muscle_group='chest')
+        self.row = Exercise.objects.create(name='Barbell Row', muscle_group='back')
+        self.monday = datetime(2025, 1, 6, 18, 0, tzinfo=dt_timezone.utc)
+
+    def assertRollupsMatchRebuild(self):
+        incremental = rollup_snapshot(self.user)
+        RollupService.rebuild(self.user)
+        self.assertEqual(incremental, rollup_snapshot(self.user))
+
+    def test_incremental_updates_match_full_rebuild(self):
+        first = log_workout(self.user, self.monday, [(self.bench, [10, 8], [100, 110])])
+        second = log_workout(self.user, self.monday + timedelta(days=2), [(self.row, [12], [80])])
+        pe = first.performed_exercises.get()
+
+        PerformedExerciseService.update_performed_exercise(pe, {
+            'exercise': self.row,
+            'reps_per_set': [5, 5, 5],
+            'weights_per_set': [120, 120, 125],
+        })
+        self.assertRollupsMatchRebuild()
+
+        PerformedExerciseService.update_performed_exercise(pe, {'workout': second})
+        self.assertRollupsMatchRebuild()
+
+        WorkoutService.update_workout(second, {'date': self.monday + timedelta(days=9)})
+        self.assertRollupsMatchRebuild()
+
+        PerformedExerciseService.delete_performed_exercise(pe)
+        WorkoutService.delete_workout(first)
+        self.assertRollupsMatchRebuild()
+
+    def test_changing_an_exercise_muscle_group_moves_its_rollups(self):
+        log_workout(self.user, self.monday, [(self.bench, [10], [100]), (self.row, [10], [50])])
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.patch(f'/api/exercises/{self.bench.pk}/', {'muscle_group': 'legs'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(DailyMuscleGroupStats.objects.filter(user=self.user).values_list('muscle_group', 'total_volume')),
+            {('legs', 1000), ('back', 500)},
+        )
+        self.assertRollupsMatchRebuild()
+
+    def test_volume_rounding_migration_repairs_half_even_volumes(self):
+        workout = log_workout(self.user, self.monday, [(self.bench, [5], [22.5]), (self.row, [3], [20.5])])
+        expected = rollup_snapshot(self.user), records_snapshot(self.user), workout.total_volume
+        # What 0012 left behind when it rounded 112.5 and 61.5 half to even
+        bench, row = workout.performed_exercises.order_by('id')
+        PerformedExercise.objects.filter(pk=bench.pk).update(volume=112)
+        Workout.objects.filter(pk=workout.pk).update(total_volume=112 + 62)
+        DailyStats.objects.filter(user=self.user).update(total_volume=174)
+        DailyMuscleGroupStats.objects.filter(user=self.user, muscle_group='chest').update(total_volume=112)
+        PersonalRecord.objects.filter(exercise=self.bench, reps=PersonalRecord.ANY_REPS).update(volume=112.0)
+
+        import_module('workouts.migrations.0024_round_volumes_half_up').forwards(django_apps, None)
+        workout.refresh_from_db()
+        self.assertEqual((rollup_snapshot(self.user), records_snapshot(self.user), workout.total_volume), expected)
+
+    def test_rollups_compose_into_buckets(self):
+        log_workout(self.user, self.monday, [(self.bench, [10, 10], [100, 100])])
+        log_workout(self.user, self.monday + timedelta(days=1), [(self.row, [8], [90])])
+        log_workout(self.user, self.monday + timedelta(days=31), [(self.bench, [5], [150])])
+
+        start, end = self.monday - timedelta(days=1), self.monday + timedelta(days=60)
+        months = list(get_rollup_buckets(self.user, 'month', start, end))
+        self.assertEqual([row['workout_count'] for row in months], [2, 1])
+        self.assertEqual(months[0]['total_volume'], 2000 + 720)
+        self.assertEqual(months[0]['set_count'], 3)
+        self.assertEqual(months[0]['rep_count'], 28)
+
+        by_group = list(get_rollup_buckets(self.user, 'week', start, end, by_muscle_group=True))
+        self.assertEqual(
+            [(row['muscle_group'], row['total_volume']) for row in by_group],
+            [('back', 720), ('chest', 2000), ('chest', 750)],
+        )
+
+
+class AnalyticsCacheTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.curl = Exercise.objects.create(name='Curl', muscle_group='arms', is_custom=True, owner=self.user)
+        log_workout(self.user, timezone.now() - timedelta(days=2), [(self.curl, [10], [20])])
+
+    def lookup(self, path, **params):
+        before = cache_stats()
+        response = self.client.get(path, params)
+        after = cache_stats()
+        return response, after['hits'] - before['hits'], after['misses'] - before['misses']
+
+    def test_hits_until_a_write_or_exercise_edit(self):
+        url = '/api/analytics/weekly-volume/'
+        self.assertEqual(self.lookup(url, tz='Europe/Berlin')[1:], (0, 1))
+        self.assertEqual(self.lookup(url, tz='Europe/Berlin')[1:], (1, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            log_workout(self.user, timezone.now() - timedelta(days=1), [(self.curl, [10], [30])])
+        response, hits, misses = self.lookup(url, tz='Europe/Berlin')
+        self.assertEqual((hits, misses), (0, 1))
+        self.assertEqual(sum(week['totalVolume'] for week in response.data['weekly_volumes']), 500)
+
+        self.lookup('/api/analytics/muscle-groups/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/exercises/{self.curl.pk}/', {'name': 'Hammer Curl'}, format='json')
+        self.assertEqual(self.lookup('/api/analytics/muscle-groups/')[1:], (0, 1))
+
+    def test_timezone_range_key_uses_local_days(self):
+        berlin = ZoneInfo('Europe/Berlin')
+        morning = datetime(2025, 1, 6, 8, 0, tzinfo=dt_timezone.utc)
+        self.assertEqual(
+            range_cache_key(None, morning, berlin), range_cache_key(None, morning + timedelta(hours=12), berlin),
+        )
+        # 23:30 UTC is already the next day in Berlin
+        self.assertNotEqual(
+            range_cache_key(None, morning, berlin), range_cache_key(None, morning + timedelta(hours=15, minutes=30), berlin),
+        )
+
+    def test_timezone_ranges_query_the_local_days_they_are_keyed_on(self):
+        berlin = ZoneInfo('Europe/Berlin')
+        morning = datetime(2025, 1, 6, 8, 0, tzinfo=dt_timezone.utc)
+        evening = morning + timedelta(hours=12)
+        # Logged that afternoon, after the morning request's end_date
+        log_workout(self.user, morning + timedelta(hours=6), [(self.curl, [10], [30])])
+
+        self.assertEqual(range_cache_key(None, morning, berlin), range_cache_key(None, evening, berlin))
+        weekly = get_weekly_volume_data(self.user, None, morning, berlin)
+        self.assertEqual(sum(week['totalVolume'] for week in weekly), 300)
+        self.assertEqual(weekly, get_weekly_volume_data(self.user, None, evening, berlin))
+        self.assertEqual(
+            get_muscle_load(self.user, 'week', None, morning, berlin),
+            get_muscle_load(self.user, 'week', None, evening, berlin),
+        )
+
+
+class ConditionalGetTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.curl = Exercise.objects.create(name='Curl', muscle_group='arms', is_custom=True, owner=self.user)
+        self.workout = log_workout(self.user, timezone.now() - timedelta(days=2), [(self.curl, [10], [20])])
+
+    def validators(self, url):
+        """ETag and Last-Modified of ``url`` once every change is an hour old"""
+        earlier = timezone.now() - timedelta(hours=1)
+        for model in (Workout, PerformedExercise, Exercise):
+            model.objects.update(updated_at=earlier)
+        Tombstone.objects.update(deleted_at=earlier)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag'], response['Last-Modified']
+
+    def revalidate(self, url, etag, last_modified):
+        return (
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code,
+            self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code,
+        )
+
+    def test_workout_list_revalidates_until_create_update_or_delete(self):
+        url = '/api/workouts/?summary=1'
+        self.assertEqual(self.revalidate(url, *self.validators(url)), (304, 304))
+
+        for change in (
+            lambda: self.client.post('/api/workouts/', {'date': '2025-01-06T18:00:00Z', 'name': 'New'}, format='json'),
+            lambda: self.client.patch(f'/api/workouts/{self.workout.pk}/', {'name': 'Renamed'}, format='json'),
+            lambda: self.client.delete(f'/api/workouts/{self.workout.pk}/'),
+        ):
+            validators = self.validators(url)
+            self.assertLess(change().status_code, 300)
+            self.assertEqual(self.revalidate(url, *validators), (200, 200))
+
+    def test_analytics_revalidate_after_custom_exercise_edits(self):
+        url = '/api/analytics/muscle-groups/'
+        validators = self.validators(url)
+        self.assertEqual(self.revalidate(url, *validators), (304, 304))
+        self.client.patch(f'/api/exercises/{self.curl.pk}/', {'muscle_group': 'back'}, format='json')
+        self.assertEqual(self.revalidate(url, *validators), (200, 200))
+
+    def test_recent_changes_send_no_last_modified(self):
+        self.assertNotIn('Last-Modified', self.client.get('/api/workouts/'))
+
+
+class MuscleGroupDistributionTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.bench = Exercise.objects.create(name='Bench Press', muscle_group='chest')
+        self.row = Exercise.objects.create(name='Barbell Row', muscle_group='back')
+        self.monday = datetime(2025, 1, 6, 12, 0, tzinfo=dt_timezone.utc)
+        log_workout(self.user, self.monday, [(self.bench, [10, 10], [100, 100]), (self.row, [8], [90])])
+        log_workout(self.user, self.monday + timedelta(days=2), [(self.bench, [5], [120])])
+        log_workout(self.user, self.monday + timedelta(days=28), [(self.row, [10, 10], [80, 80])])
+        self.range = (self.monday - timedelta(days=1), self.monday + timedelta(days=60))
+
+    def test_groups_sets_and_volume_per_bucket_in_the_database(self):
+        with self.assertNumQueries(1):
+            weekly = get_muscle_group_distribution(self.user, 'week', *self.range)
+        self.assertEqual([bucket['period'] for bucket in weekly['buckets']], ['2025-W02', '2025-W06'])
+        self.assertEqual(weekly['buckets'][0]['groups'], {
+            'back': {'sets': 1, 'reps': 8, 'volume': 720},
+            'chest': {'sets': 3, 'reps': 25, 'volume': 2600},
+        })
+        self.assertEqual(weekly['totals']['back'], {'sets': 3, 'reps': 28, 'volume': 2320})
+
+        monthly = get_muscle_group_distribution(self.user, 'month', *self.range)
+        self.assertEqual([bucket['period'] for bucket in monthly['buckets']], ['2025-01', '2025-02'])
+        self.assertEqual(monthly['totals'], weekly['totals'])
+
+        # The raw path used for other timezones agrees with the rollups
+        with self.assertNumQueries(2):
+            raw = get_muscle_group_distribution(self.user, 'week', *self.range, tz=ZoneInfo('Europe/Berlin'))
+        self.assertEqual(raw, weekly)
+
+    def test_endpoint_validates_period(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/analytics/muscle-groups/', {
+            'period': 'month', 'start_date': '2025-01-01', 'end_date': '2025-03-01',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['totals']['chest']['sets'], 3)
+        self.assertEqual(client.get('/api/analytics/muscle-groups/', {'period': 'day'}).status_code, 400)
+
+
+class MuscleLoadTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.bench = Exercise.objects.create(
+            name='Bench Press', muscle_group='chest',
+            primaryMuscles=['chest'], secondaryMuscles=['shoulders', 'triceps'],
+        )
+        self.dip = Exercise.objects.create(
+            name='Dips', muscle_group='arms', primaryMuscles=['triceps'], secondaryMuscles=['chest'],
+        )
+        self.custom = Exercise.objects.create(
+            name='Sled Push', muscle_group='legs', owner=self.user, is_custom=True, primaryMuscles=['quads'],
+        )
+        self.monday = datetime(2025, 1, 6, 12, 0, tzinfo=dt_timezone.utc)
+        self.range = (self.monday - timedelta(days=1), self.monday + timedelta(days=30))
+
+    def reference_loads(self):
+        """Nested-loop reference over every performed exercise"""
+        loads = {}
+        for pe in PerformedExercise.objects.filter(workout__user=self.user).select_related('exercise'):
+            for muscle in pe.exercise.secondaryMuscles:
+                loads[muscle] = loads.get(muscle, 0) + pe.volume * 0.5
+            for muscle in pe.exercise.primaryMuscles:
+                loads[muscle] = loads.get(muscle, 0) + pe.volume
+        return loads
+
+    def test_matrix_product_matches_nested_loops(self):
+        log_workout(self.user, self.monday, [(self.bench, [10], [100]), (self.dip, [10, 10], [20, 20])])
+        log_workout(self.user, self.monday + timedelta(days=8), [(self.custom, [3], [200]), (self.bench, [5], [120])])
+
+        data = get_muscle_load(self.user, 'week', *self.range)
+        self.assertEqual(data['periods'], ['2025-W02', '2025-W03'])
+        self.assertEqual(data['muscles'][-1], 'quads')
+        totals = {muscle: value for muscle, value in data['totals'].items() if value}
+        self.assertEqual(totals, self.reference_loads())
+        week = dict(zip(data['muscles'], data['loads'][0]))
+        self.assertEqual((week['chest'], week['triceps']), (1000 + 200, 400 + 500))
+
+    def test_endpoint_reports_unassigned_volume(self):
+        plank = Exercise.objects.create(name='Plank', muscle_group='core')
+        log_workout(self.user, self.monday, [(plank, [1], [50])])
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/analytics/muscle-load/', {'start_date': '2025-01-01', 'end_date': '2025-02-01'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['unassigned_volume'], 50)
+        self.assertEqual(response.data['loads'], [[0.0] * len(response.data['muscles'])])
+
+
+class WorkoutPaginationTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        base = datetime(2025, 1, 6, 18, 0, tzinfo=dt_timezone.utc)
+        # Two workouts share a timestamp so ties are ordered by id.
+        dates = [base, base, base + timedelta(days=1), base + timedelta(days=3), base - timedelta(days=2)]
+        self.workouts = [Workout.objects.create(user=self.user, date=date) for date in dates]
+
+    def walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 2)
+            ids += [row['id'] for row in response.data['results']]
+            url = response.data['next']
+        return ids
+
+    def test_pages_cover_history_newest_first(self):
+        expected = [w.id for w in sorted(self.workouts, key=lambda w: (w.date, w.id), reverse=True)]
+        self.assertEqual(self.walk('/api/workouts/?page_size=2'), expected)
+        self.assertEqual(self.walk('/api/workouts/?summary=1&page_size=2'), expected)
+
+    def test_unpaginated_without_page_params(self):
+        response = self.client.get('/api/workouts/?summary=1')
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), len(self.workouts))
+
+
+class WorkoutListQueryCountTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.exercises = [
+            Exercise.objects.create(name=f'Exercise {i}', muscle_group=group)
+            for i, group in enumerate(['chest', 'back', 'legs'])
+        ]
+        self.day = datetime(2025, 1, 6, 18, 0, tzinfo=dt_timezone.utc)
+
+    def log_history(self, count):
+        for _ in range(count):
+            log_workout(self.user, self.day, [(exercise, [10, 8], [60, 70]) for exercise in self.exercises])
+            self.day += timedelta(days=1)
+
+    def test_list_query_count_is_independent_of_history_size(self):
+        # watermark and latest deletion, workouts, performed exercises with their exercises
+        self.log_history(1)
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/workouts/')
+        self.assertEqual(
+            response.data[0]['performed_exercises'][0]['exercise'],
+            {'id': self.exercises[0].id, 'name': 'Exercise 0', 'muscle_group': 'chest'},
+        )
+
+        self.log_history(5)
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/workouts/')
+        self.assertEqual(len(response.data), 6)
+        with self.assertNumQueries(4):
+            self.client.get('/api/workouts/?page_size=4')
+
+
+class NestedWorkoutCreateTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.bench = Exercise.objects.create(name='Bench Press', muscle_group='chest')
+        self.squat = Exercise.objects.create(name='Squat', muscle_group='legs')
+
+    def post_workout(self, performed):
+        return self.client.post('/api/workouts/', {
+            'date': '2025-01-06T18:00:00Z',
+            'name': 'Push',
+            'performed_exercises': performed,
+        }, format='json')
+
+    def entry(self, exercise, reps, weights):
+        return {'exercise_id': exercise.id, 'sets': len(reps), 'reps_per_set': reps, 'weights_per_set': weights}
+
+    def test_creates_workout_exercises_and_sets_in_one_request(self):
+        response = self.post_workout([
+            self.entry(self.bench, [10, 8], [100, 110.5]),
+            self.entry(self.squat, [5, 5, 5], [140, 140, None]),
+        ])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['total_volume'], 1884 + 1400)
+        self.assertEqual(
+            [pe['exercise']['name'] for pe in response.data['performed_exercises']],
+            ['Bench Press', 'Squat'],
+        )
+        workout = Workout.objects.get(pk=response.data['id'])
+        self.assertEqual(workout.total_volume, 3284)
+        self.assertEqual(PerformedSet.objects.filter(performed_exercise__workout=workout).count(), 5)
+
+        incremental = rollup_snapshot(self.user)
+        RollupService.rebuild(self.user)
+        self.assertEqual(incremental, rollup_snapshot(self.user))
+
+    def test_query_count_does_not_grow_with_exercise_count(self):
+        def create_queries(count):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.post_workout([self.entry(self.bench, [5], [100])] * count)
+            self.assertEqual(response.status_code, 201)
+            return len(queries)
+
+        create_queries(1)  # creates the day's rollup rows
+        self.assertEqual(create_queries(2), create_queries(8))
+
+    def test_unknown_exercise_rejects_whole_workout(self):
+        hidden = Exercise.objects.create(
+            name='Private', muscle_group='back', is_custom=True,
+            owner=User.objects.create_user(username='other', password='pw'),
+        )
+        response = self.post_workout([
+            self.entry(self.bench, [5], [100]),
+            self.entry(hidden, [5], [100]),
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Workout.objects.filter(user=self.user).exists())
+
+
+class PerformedSetTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.bench = Exercise.objects.create(name='Bench Press', muscle_group='chest')
+        self.workout = log_workout(self.user, datetime(2025, 1, 6, 18, 0, tzinfo=dt_timezone.utc), [
+            (self.bench, [10, 8], [100, 110]),
+        ])
+        self.performed = self.workout.performed_exercises.get()
+
+    def sets(self):
+        return list(self.performed.performed_sets.order_by('position').values_list('position', 'reps', 'weight'))
+
+    def test_sets_follow_updates(self):
+        response = self.client.patch(f'/api/performed-exercises/{self.performed.pk}/', {
+            'sets': 3, 'reps_per_set': [5, 5, 3], 'weights_per_set': [120, 120],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.sets(), [(0, 5, 120.0), (1, 5, 120.0), (2, 3, 0.0)])
+
+        self.client.patch(f'/api/performed-exercises/{self.performed.pk}/', {'sets': 3}, format='json')
+        self.assertEqual(len(self.sets()), 3)
+
+    def test_rejects_non_finite_fractional_and_oversized_sets(self):
+        url = f'/api/performed-exercises/{self.performed.pk}/'
+        for body in (
+            '{"weights_per_set": [1e308, 100]}',
+            '{"weights_per_set": [1e400, 100]}',
+            '{"weights_per_set": [NaN, 100]}',
+            '{"reps_per_set": [8.7, 8]}',
+            '{"reps_per_set": [5000, 8]}',
+            json.dumps({'reps_per_set': [5] * (MAX_SETS + 1)}),
+        ):
+            response = self.client.patch(url, body, content_type='application/json')
+            self.assertEqual(response.status_code, 400, body)
+        self.assertEqual(self.sets(), [(0, 10, 100.0), (1, 8, 110.0)])
+
+    def test_backfill_expands_stored_lists(self):
+        backfill = import_module('workouts.migrations.0014_backfill_performedset')
+        PerformedSet.objects.all().delete()
+        PerformedExercise.objects.filter(pk=self.performed.pk).update(
+            reps_per_set=[6, None, '4'], weights_per_set=[80, 'heavy'],
+        )
+        backfill.forwards(django_apps, None)
+        self.assertEqual(self.sets(), [(0, 6, 80.0), (1, 0, 0.0), (2, 4, 0.0)])
+
+
+class ExportTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        bench = Exercise.objects.create(name='Bench Press', muscle_group='chest')
+        monday = datetime(2025, 1, 6, 18, 0, tzinfo=dt_timezone.utc)
+        self.first = log_workout(self.user, monday, [(bench, [10, 8], [100, 110])])
+        self.empty = log_workout(self.user, monday + timedelta(days=1), [])
+        other = User.objects.create_user(username='other', password='pw')
+        log_workout(other, monday, [(bench, [1], [1])])
+
+    def test_csv_has_one_row_per_set(self):
+        response = self.client.get('/api/export/?type=csv')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertTrue(lines[0].startswith('workout_id,date,workout_name'))
+        self.assertEqual(len(lines), 1 + 2 + 1)
+        self.assertTrue(lines[2].endswith(',Bench Press,chest,1880,1,8,110.0'))
+        self.assertTrue(lines[3].startswith(f'{self.empty.id},'))
+
+    def test_ndjson_nests_exercises_and_sets(self):
+        response = self.client.get('/api/export/?type=ndjson')
+        documents = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([doc['id'] for doc in documents], [self.first.id, self.empty.id])
+        self.assertEqual(documents[0]['total_volume'], 1880)
+        self.assertEqual(
+            documents[0]['performed_exercises'][0]['sets'],
+            [{'position': 0, 'reps': 10, 'weight': 100.0}, {'position': 1, 'reps': 8, 'weight': 110.0}],
+        )
+        self.assertEqual(documents[1]['performed_exercises'], [])
+        self.assertEqual(self.client.get('/api/export/?type=xml').status_code, 400)
+
+    def test_csv_quotes_formula_like_names_and_imports_them_back(self):
+        pullup = Exercise.objects.create(name='-Pull-up', muscle_group='back', is_custom=True, owner=self.user)
+        Workout.objects.filter(pk=self.first.pk).update(name='=HYPERLINK("http://example.com")')
+        log_workout(self.user, self.first.date + timedelta(days=3), [(pullup, [8], [0])])
+        lines = list(ExportService.csv_lines(ExportService.rows(self.user)))
+
+        self.assertIn('"\'=HYPERLINK(""http://example.com"")"', lines[1])
+        self.assertIn(",'-Pull-up,back,", lines[-1])
+        self.assertFalse(any(',=' in line or ',-P' in line for line in lines))
+
+        importer = User.objects.create_user(username='importer', password='pw')
+        Exercise.objects.create(name='-Pull-up', muscle_group='back', is_custom=True, owner=importer)
+        ImportService.import_csv(importer, io.StringIO(''.join(lines)))
+        self.assertEqual(
+            list(Workout.objects.filter(user=importer).order_by('date').values_list(
+                'name', 'performed_exercises__exercise__name',
+            )),
+            [('=HYPERLINK("http://example.com")', 'Bench Press'), ('Untitled Workout', '-Pull-up')],
+        )
+
+
+class ImportTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.bench = Exercise.objects.create(name='Bench Press', muscle_group='chest')
+
+    def test_export_round_trips_through_import(self):
+        source = User.objects.create_user(username='source', password='pw')
+        monday = datetime(2025, 1, 6, 18, 0, tzinfo=dt_timezone.utc)
+        log_workout(source, monday, [(self.bench, [10, 8], [100, 110.5])])
+        log_workout(source, monday + timedelta(days=2), [(self.bench, [5], [140])])
+        log_workout(source, monday + timedelta(days=2), [(self.bench, [3], [150])])
+        exported = ''.join(ExportService.csv_lines(ExportService.rows(source)))
+
+        report = ImportService.import_csv(self.user, io.StringIO(exported), batch_size=2)
+
+        self.assertEqual((report['workouts'], report['performed_exercises'], report['sets']), (3, 3, 4))
+        self.assertEqual(report['skipped_rows'], 0)
+        self.assertEqual(
+            sorted(Workout.objects.filter(user=self.user).values_list('date', 'total_volume')),
+            sorted(Workout.objects.filter(user=source).values_list('date', 'total_volume')),
+        )
+        imported = rollup_snapshot(self.user)
+        RollupService.rebuild(self.user)
+        self.assertEqual(imported, rollup_snapshot(self.user))
+
+    def test_upload_reports_bad_rows_and_unknown_exercises(self):
+        upload = SimpleUploadedFile('history.csv', (
+            'Date,Workout Name,Exercise Name,Reps,Weight\n'
+            '2025-01-06,Push,bench press,10,100\n'
+            '2025-01-06,Push,Cable Fly,12,20\n'
+            '2025-01-08,Push,Bench Press,ten,100\n'
+        ).encode(), content_type='text/csv')
+        response = self.client.post('/api/import/', {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['workouts'], 1)
+        self.assertEqual(response.data['skipped_rows'], 2)
+        self.assertEqual(response.data['unknown_exercises'], ['Cable Fly'])
+        self.assertEqual(response.data['errors'], ["line 4: invalid reps 'ten'"])
+        self.assertEqual(Workout.objects.get(user=self.user).total_volume, 1000)
+
+    def test_rejects_non_finite_fractional_and_oversized_numbers(self):
+        bad_cells = ['1e400', 'inf', 'nan', '8.5', '5000']
+        rows = ''.join(f'2025-01-{day:02d},Bench Press,{reps},100\n' for day, reps in enumerate(bad_cells, start=1))
+        rows += '2025-01-10,Bench Press,8.0,1e9\n2025-01-11,Bench Press,8.0,102.5\n'
+        report = ImportService.import_csv(self.user, io.StringIO('date,exercise_name,reps,weight\n' + rows))
+
+        self.assertEqual((report['workouts'], report['skipped_rows']), (1, 6))
+        self.assertEqual(report['errors'], [
+            "line 2: invalid reps '1e400'",
+            "line 3: invalid reps 'inf'",
+            "line 4: invalid reps 'nan'",
+            "line 5: invalid reps '8.5'",
+            f"line 6: reps '5000' is above {MAX_SET_REPS}",
+            f"line 7: weight '1e9' is above {MAX_SET_WEIGHT}",
+        ])
+        self.assertEqual(PerformedExercise.objects.get(workout__user=self.user).reps_per_set, [8])
+
+    def test_create_missing_only_saves_exercises_of_imported_workouts(self):
+        rows = (
+            'date,exercise_name,muscle_group,reps,weight\n'
+            '2025-01-06,Zercher Squat,legs,5,100\n'
+            '2025-01-06,Bench Press,,ten,100\n'
+            '2025-01-08,Landmine Press,chest,8,40\n'
+            '2025-01-09,landmine press,,8,45\n'
+        )
+        report = ImportService.import_csv(self.user, io.StringIO(rows), batch_size=1, create_missing=True)
+
+        self.assertEqual((report['workouts'], report['skipped_rows']), (2, 2))
+        self.assertEqual(report['created_exercises'], ['Landmine Press'])
+        landmine = Exercise.objects.get(owner=self.user)
+        self.assertEqual((landmine.name, landmine.muscle_group), ('Landmine Press', 'chest'))
+        self.assertEqual(PerformedExercise.objects.filter(exercise=landmine).count(), 2)
+
+    def test_skips_and_reports_workouts_without_a_known_exercise(self):
+        rows = (
+            'date,workout_name,exercise_name,reps,weight\n'
+            '2025-01-06,Push,Cable Fly,12,20\n'
+            '2025-01-07,Rest,,,\n'
+            '2025-01-08,Push,Bench Press,10,100\n'
+        )
+        report = ImportService.import_csv(self.user, io.StringIO(rows))
+
+        self.assertEqual((report['workouts'], report['skipped_rows']), (1, 2))
+        self.assertEqual(report['unknown_exercises'], ['Cable Fly'])
+        self.assertEqual(report['errors'], [
+            'line 2: no known exercises to import',
+            'line 3: no known exercises to import',
+        ])
+        self.assertEqual(list(Workout.objects.filter(user=self.user).values_list('total_volume', flat=True)), [1000])
+
+
+class SyncTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.bench = Exercise.objects.create(name='Bench Press', muscle_group='chest')
+        self.custom = Exercise.objects.create(name='Landmine Press', muscle_group='shoulders', owner=self.user, is_custom=True)
+        monday = datetime(2025, 1, 6, 18, 0, tzinfo=dt_timezone.utc)
+        self.kept = log_workout(self.user, monday, [(self.bench, [10], [100]), (self.custom, [8], [40])])
+        self.dropped = log_workout(self.user, monday + timedelta(days=1), [(self.bench, [5], [120])])
+
+        # Pretend everything so far was synced an hour ago.
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        for model in (Workout, PerformedExercise, Exercise):
+            model.objects.update(updated_at=an_hour_ago)
+        self.token = SyncService.encode_token(an_hour_ago + timedelta(minutes=5))
+
+    def sync(self, token=None):
+        response = self.client.get('/api/sync/', {'since': token} if token else {})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_returns_only_changes_and_tombstones_since_token(self):
+        self.assertEqual(self.sync(self.token)['workouts'], [])
+
+        self.client.patch(f'/api/workouts/{self.kept.id}/', {'name': 'Renamed'}, format='json')
+        dropped_pe = self.dropped.performed_exercises.get().id
+        self.client.delete(f'/api/workouts/{self.dropped.id}/')
+
+        changes = self.sync(self.token)
+        self.assertFalse(changes['full'])
+        self.assertEqual([w['name'] for w in changes['workouts']], ['Renamed'])
+        self.assertEqual(changes['performed_exercises'], [])
+        self.assertEqual(changes['deleted']['workouts'], [self.dropped.id])
+        self.assertEqual(changes['deleted']['performed_exercises'], [dropped_pe])
+
+    def test_deleting_custom_exercise_tombstones_it_and_fixes_totals(self):
+        custom_pe = self.kept.performed_exercises.get(exercise=self.custom).id
+        self.assertEqual(self.client.delete(f'/api/exercises/{self.custom.id}/').status_code, 204)
+
+        changes = self.sync(self.token)
+        self.assertEqual(changes['deleted']['exercises'], [self.custom.id])
+        self.assertEqual(changes['deleted']['performed_exercises'], [custom_pe])
+        self.assertEqual([(w['id'], w['total_volume']) for w in changes['workouts']], [(self.kept.id, 1000)])
+        incremental = rollup_snapshot(self.user)
+        RollupService.rebuild(self.user)
+        self.assertEqual(incremental, rollup_snapshot(self.user))
+
+    def test_missing_or_expired_token_gets_full_snapshot(self):
+        changes = self.sync()
+        self.assertTrue(changes['full'])
+        self.assertEqual(len(changes['workouts']), 2)
+        self.assertEqual(len(changes['performed_exercises']), 3)
+        self.assertEqual([e['id'] for e in changes['exercises']], [self.custom.id])
+        self.assertTrue(self.sync(SyncService.encode_token(timezone.now() - timedelta(days=365)))['full'])
+        self.assertEqual(self.client.get('/api/sync/', {'since': 'yesterday'}).status_code, 400)
+
+
+class ExerciseCatalogTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.bench = Exercise.objects.create(name='Bench Press', muscle_group='chest', instructions=['Lie down'])
+        self.custom = Exercise.objects.create(name='Landmine Press', muscle_group='shoulders', owner=self.user, is_custom=True)
+        other = User.objects.create_user(username='other', password='pw')
+        Exercise.objects.create(name='Secret', owner=other, is_custom=True)
+
+    def test_list_merges_custom_exercises_and_supports_sparse_fields(self):
+        full = self.client.get('/api/exercises/').data
+        self.assertEqual([row['name'] for row in full], ['Bench Press', 'Landmine Press'])
+        self.assertEqual(full[0]['instructions'], ['Lie down'])
+
+        slim = self.client.get('/api/exercises/?fields=id,name,muscle_group').data
+        self.assertEqual(slim[1], {'id': self.custom.id, 'name': 'Landmine Press', 'muscle_group': 'shoulders'})
+        self.assertEqual(self.client.get('/api/exercises/?fields=name,secret').status_code, 400)
+
+    def test_catalog_is_shared_and_revalidates_on_change(self):
+        response = self.client.get('/api/exercises/catalog/?fields=id,name')
+        self.assertEqual(json.loads(response.content), [{'id': self.bench.id, 'name': 'Bench Press'}])
+        self.assertTrue(response['Cache-Control'].startswith('public, max-age='))
+
+        with self.assertNumQueries(1):
+            cached = self.client.get('/api/exercises/catalog/?fields=id,name', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+        self.bench.name = 'Barbell Bench Press'
+        self.bench.save()
+        changed = self.client.get('/api/exercises/catalog/?fields=id,name', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(json.loads(changed.content)[0]['name'], 'Barbell Bench Press')
+
+
+class ExerciseSearchTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        catalog = [
+            ('Bench Press', 'chest', 'barbell', ['chest', 'triceps']),
+            ('Incline Bench Press', 'chest', 'barbell', ['chest']),
+            ('Dumbbell Bench Press', 'chest', 'dumbbell', ['chest']),
+            ('Bent Over Row', 'back', 'barbell', ['lats']),
+            ('Squat', 'legs', 'barbell', ['quadriceps']),
+        ]
+        for name, group, equipment, muscles in catalog:
+            Exercise.objects.create(name=name, muscle_group=group, equipment=equipment, primaryMuscles=muscles)
+        Exercise.objects.create(name='Bench Dip', muscle_group='arms', owner=self.user, is_custom=True)
+
+    def search(self, **params):
+        response = self.client.get('/api/exercises/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return [row['name'] for row in response.data]
+
+    def test_ranks_exact_and_prefix_matches_first(self):
+        self.assertEqual(
+            self.search(q='bench press'),
+            ['Bench Press', 'Dumbbell Bench Press', 'Incline Bench Press'],
+        )
+        self.assertEqual(self.search(q='ben')[:2], ['Bench Dip', 'Bench Press'])
+        self.assertEqual(self.search(q='quad'), ['Squat'])
+
+    def test_fuzzy_matches_and_filters(self):
+        self.assertEqual(self.search(q='sqaut'), ['Squat'])
+        self.assertEqual(self.search(q='bench', equipment='dumbbell'), ['Dumbbell Bench Press'])
+        self.assertEqual(self.search(q='bench', muscle_group='arms'), ['Bench Dip'])
+        with self.assertNumQueries(2):
+            self.search(q='row', limit=1)
+
+
+class ExerciseProgressionTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.bench = Exercise.objects.create(name='Bench Press', muscle_group='chest')
+        self.monday = datetime(2025, 1, 6, 18, 0, tzinfo=dt_timezone.utc)
+
+    def test_session_stats_are_stored_on_write(self):
+        workout = log_workout(self.user, self.monday, [(self.bench, [10, 5, 5], [80, 100, 100])])
+        pe = workout.performed_exercises.get()
+        self.assertEqual((pe.best_weight, pe.best_weight_reps, pe.max_reps), (100.0, 5, 10))
+        self.assertEqual(pe.estimated_1rm, round(100 * (1 + 5 / 30), 2))
+        self.assertEqual(pe.estimated_1rm_brzycki, round(100 * 36 / 32, 2))
+
+        PerformedExerciseService.update_performed_exercise(pe, {'reps_per_set': [1], 'weights_per_set': [120]})
+        pe.refresh_from_db()
+        self.assertEqual((pe.best_weight, pe.estimated_1rm), (120.0, 120.0))
+
+    def test_progression_flags_records_per_session(self):
+        log_workout(self.user, self.monday, [(self.bench, [5], [100])])
+        log_workout(self.user, self.monday + timedelta(days=3), [(self.bench, [12], [70])])
+        # Logged twice in one workout: merged into a single session.
+        log_workout(self.user, self.monday + timedelta(days=7), [
+            (self.bench, [3], [110]),
+            (self.bench, [8], [60]),
+        ])
+
+        with self.assertNumQueries(1):
+            data = get_exercise_progression(self.user, self.bench.id)
+        sessions = data['sessions']
+        self.assertEqual(len(sessions), 3)
+        self.assertEqual(sessions[2]['best_set'], {'weight': 110.0, 'reps': 3})
+        self.assertEqual(sessions[2]['volume'], 330 + 480)
+        self.assertEqual(sessions[1]['records'], ['max_reps', 'volume'])
+        self.assertEqual(sessions[2]['records'], ['estimated_1rm', 'weight'])
+
+        response = self.client.get(
+            f'/api/analytics/exercises/{self.bench.id}/progression/',
+            {'formula': 'brzycki', 'start_date': '2025-01-08'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([s['records'] for s in response.data['sessions']], [['max_reps', 'volume'], ['estimated_1rm', 'weight']])
+        self.assertEqual(response.data['records']['estimated_1rm'], round(110 * 36 / 34, 2))
+        self.assertEqual(self.client.get('/api/analytics/exercises/999999/progression/').status_code, 404)
+
+
+def records_snapshot(user):
+    return sorted(PersonalRecord.objects.filter(user=user).values_list(
+        'exercise_id', 'reps', 'weight', 'estimated_1rm', 'volume',
+        'weight_source', 'estimated_1rm_source', 'volume_source',
+    ))
+
+
+class PersonalRecordTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.bench = Exercise.objects.create(name='Bench Press', muscle_group='chest')
+        self.squat = Exercise.objects.create(name='Squat', muscle_group='legs')
+        self.monday = datetime(2025, 1, 6, 18, 0, tzinfo=dt_timezone.utc)
+
+    def assertRecordsMatchRebuild(self):
+        incremental = records_snapshot(self.user)
+        PersonalRecordService.rebuild(self.user)
+        self.assertEqual(incremental, records_snapshot(self.user))
+
+    def test_incremental_records_match_rebuild(self):
+        first = log_workout(self.user, self.monday, [(self.bench, [5, 5], [100, 100])])
+        second = log_workout(self.user, self.monday + timedelta(days=2), [(self.bench, [5, 3], [105, 110])])
+        self.assertRecordsMatchRebuild()
+        five = PersonalRecord.objects.get(user=self.user, exercise=self.bench, reps=5)
+        self.assertEqual((five.weight, five.volume), (105, 1000))
+
+        pe = second.performed_exercises.get()
+        PerformedExerciseService.update_performed_exercise(pe, {'exercise': self.squat})
+        self.assertRecordsMatchRebuild()
+        five = PersonalRecord.objects.get(user=self.user, exercise=self.bench, reps=5)
+        self.assertEqual(five.weight, 100)
+        self.assertFalse(PersonalRecord.objects.filter(exercise=self.bench, reps=3).exists())
+
+        PerformedExerciseService.update_performed_exercise(pe, {'exercise': self.bench})
+        WorkoutService.delete_workout(first)
+        self.assertRecordsMatchRebuild()
+        PerformedExerciseService.delete_performed_exercise(pe)
+        self.assertEqual(records_snapshot(self.user), [])
+
+    def test_logging_returns_badges_and_records_endpoint_reads_them(self):
+        log_workout(self.user, self.monday, [(self.bench, [5], [100])])
+        workout = WorkoutService.create_workout(self.user, {'date': self.monday + timedelta(days=2)})
+        response = self.client.post('/api/performed-exercises/', {
+            'workout': workout.id,
+            'exercise_id': self.bench.id,
+            'sets': 2,
+            'reps_per_set': [5, 8],
+            'weights_per_set': [102.5, 80],
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        badges = {(record['reps'], record['record']): record['previous'] for record in response.data['new_records']}
+        self.assertEqual(badges[(5, 'weight')], 100)
+        self.assertIsNone(badges[(8, 'weight')])
+        self.assertEqual(badges[(0, 'volume')], 500)
+
+        # three watermark queries, then the records
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/analytics/records/', {'exercise_id': self.bench.id})
+        [entry] = response.data['records']
+        self.assertEqual(entry['best'], {'weight': 102.5, 'estimated_1rm': round(102.5 * (1 + 5 / 30), 2), 'volume': 1153.0})
+        self.assertEqual([rep_max['reps'] for rep_max in entry['rep_maxes']], [5, 8])
+
+
+class RequestTimingMiddlewareTests(AppTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='lifter', password='pw')
+        bench = Exercise.objects.create(name='Bench Press', muscle_group='chest')
+        log_workout(self.user, datetime(2025, 1, 6, tzinfo=dt_timezone.utc), [(bench, [5], [100])])
+
+    @override_settings(REQUEST_TIMING_ENABLED=True, REQUEST_TIMING_SLOW_MS=0)
+    def test_server_timing_header_and_slow_request_log(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.assertLogs('workouts.performance', 'WARNING') as logs:
+            response = client.get('/api/performed-exercises/')
+        self.assertEqual(response.status_code, 200)
+        timings = {
+            part.split(';')[0].strip(): float(part.split('dur=')[1].split(';')[0])
+            for part in response['Server-Timing'].split(',')
+        }
+        self.assertEqual(set(timings), {'db', 'view', 'serialize', 'render', 'total'})
+        self.assertLessEqual(timings['serialize'], timings['view'])
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual((line['event'], line['route']), ('slow_request', 'performedexercise-list'))
+        self.assertGreaterEqual(line['queries'], 1)
+        self.assertIn('serialize_ms', line)
+
+    @override_settings(REQUEST_TIMING_ENABLED=False)
+    def test_disabled_by_default(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertNotIn('Server-Timing', client.get('/api/performed-exercises/'))
+
+
+class MetricsTests(AppTestCase):
+    def test_requests_are_counted_per_route_and_exposed_to_staff(self):
+        user = User.objects.create_user(username='lifter', password='pw')
+        staff = User.objects.create_user(username='ops', password='pw', is_staff=True)
+        client = APIClient()
+        client.force_authenticate(user)
+        client.get('/api/analytics/weekly-volume/')
+        self.assertEqual(client.get('/api/metrics/').status_code, 403)
+
+        client.force_authenticate(staff)
+        response = client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('http_requests_total{route="weekly-volume-analytics",method="GET",status="200"}', body)
+        self.assertIn('http_request_duration_seconds_bucket{route="prometheus-metrics",method="GET",le="+Inf"}', body)
+
+    def test_shared_directory_merges_worker_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            worker = MetricsRegistry(directory)
+            other = MetricsRegistry()
+            for registry in (worker, other):
+                registry.register(REQUESTS)
+                registry.register(REQUEST_LATENCY)
+            worker.record(REQUESTS, ('workout-list', 'GET', 200))
+            worker.record(REQUEST_LATENCY, ('workout-list', 'GET'), 0.02)
+            other.record(REQUESTS, ('workout-list', 'GET', 200), 2)
+            other.record(REQUEST_LATENCY, ('workout-list', 'GET'), 3.0)
+            # Another worker's flushed file, as MetricsRegistry.flush writes it
+            with open(f'{directory}/metrics-999999.json', 'w') as handle:
+                json.dump(other.snapshot(), handle)
+
+            body = worker.render()
+        self.assertIn('http_requests_total{route="workout-list",method="GET",status="200"} 3', body)
+        self.assertIn('http_request_duration_seconds_bucket{route="workout-list",method="GET",le="0.025"} 1', body)
+        self.assertIn('http_request_duration_seconds_bucket{route="workout-list",method="GET",le="5.0"} 2', body)
+        self.assertIn('http_request_duration_seconds_count{route="workout-list",method="GET"} 2', body)
+
+    def test_workers_flush_to_their_own_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            workers = [MetricsRegistry(directory, flush_interval=0) for _ in range(2)]
+            for worker in workers:
+                worker.register(REQUESTS)
+                worker.record(REQUESTS, ('workout-list', 'GET', 200))
+            # Same pid, distinct tokens, no temporary files left behind
+            names = sorted(os.listdir(directory))
+            self.assertEqual(len(names), 2)
+            self.assertTrue(all(name.startswith(f'metrics-{os.getpid()}-') and name.endswith('.json') for name in names))
+            self.assertIn('http_requests_total{route="workout-list",method="GET",status="200"} 2', workers[0].render())
+
+    def test_stale_worker_files_are_pruned(self):
+        with tempfile.TemporaryDirectory() as directory:
+            worker = MetricsRegistry(directory, stale_after=60)
+            worker.register(REQUESTS)
+            exited = MetricsRegistry()
+            exited.register(REQUESTS)
+            exited.record(REQUESTS, ('workout-list', 'GET', 200), 5)
+            for name in ('metrics-999999-dead.json', 'metrics-999999-dead.1234.tmp', 'metrics-999998-live.json'):
+                with open(f'{directory}/{name}', 'w') as handle:
+                    json.dump(exited.snapshot(), handle)
+            an_hour_ago = time.time() - 3600
+            for name in ('metrics-999999-dead.json', 'metrics-999999-dead.1234.tmp'):
+                os.utime(f'{directory}/{name}', (an_hour_ago, an_hour_ago))
+
+            body = worker.render()
+            self.assertEqual(os.listdir(directory), ['metrics-999998-live.json'])
+        self.assertIn('http_requests_total{route="workout-list",method="GET",status="200"} 5', body)
+
+    def test_failed_flush_is_logged_not_raised(self):
+        with tempfile.NamedTemporaryFile() as not_a_directory:
+            worker = MetricsRegistry(f'{not_a_directory.name}/metrics', flush_interval=0)
+            worker.register(REQUESTS)
+            with self.assertLogs('workouts.performance', 'WARNING'):
+                worker.record(REQUESTS, ('workout-list', 'GET', 200))
+        self.assertIn('status="200"} 1', worker.render())
+
+
+@override_settings(PROFILING_ENABLED=True)
+class ProfilingMiddlewareTests(AppTestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='ops', password='pw', is_staff=True)
+        self.user = User.objects.create_user(username='lifter', password='pw')
+
+    def get(self, user, path, **headers):
+        return APIClient().get(path, HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}', **headers)
+
+    def test_staff_can_download_a_profile_with_sql(self):
+        response = self.get(self.staff, '/api/analytics/dashboard/', HTTP_X_PROFILE='download')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="profile.txt"')
+        report = response.content.decode()
+        self.assertIn('GET /api/analytics/dashboard/ -> 200', report)
+        self.assertIn('SQL, in order:', report)
+        self.assertIn('by cumulative time', report)
+
+    def test_stores_reports_and_ignores_non_staff(self):
+        with tempfile.TemporaryDirectory() as directory, self.settings(PROFILING_DIR=directory):
+            response = self.get(self.staff, '/api/analytics/top-workouts/?profile=1')
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('top_workouts', response.data)
+            name = response['X-Profile-Report']
+            self.assertTrue(name.endswith('top-workouts-by-volume'))
+            with open(f'{directory}/{name}.txt') as handle:
+                self.assertIn('queries', handle.read())
+
+            response = self.get(self.user, '/api/analytics/top-workouts/', HTTP_X_PROFILE='download')
+            self.assertNotIn('X-Profile-Report', response)
+            self.assertIn('top_workouts', response.data)
+
+    def test_only_known_modes_profile_and_old_reports_are_pruned(self):
+        with tempfile.TemporaryDirectory() as directory, self.settings(PROFILING_DIR=directory, PROFILING_MAX_REPORTS=2):
+            self.assertNotIn('X-Profile-Report', self.get(self.staff, '/api/analytics/top-workouts/?profile=yes'))
+            names = [
+                self.get(self.staff, '/api/analytics/top-workouts/', HTTP_X_PROFILE='1')['X-Profile-Report']
+                for _ in range(3)
+            ]
+            self.assertEqual(sorted(os.listdir(directory)), sorted(
+                f'{name}.{suffix}' for name in names[1:] for suffix in ('prof', 'txt')
+            ))
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled_by_default(self):
+        response = self.get(self.staff, '/api/analytics/top-workouts/', HTTP_X_PROFILE='download')
+        self.assertNotIn('Content-Disposition', response)
+        self.assertNotIn('X-Profile-Report', response)
+
+
+class SyntheticDataTests(AppTestCase):
+    def setUp(self):
+        for number, (group, equipment) in enumerate([
+            ('chest', 'barbell'), ('back', 'cable'), ('legs', 'machine'),
+            ('shoulders', 'dumbbell'), ('arms', 'e-z curl bar'), ('core', 'body only'),
+        ] * 2):
+            Exercise.objects.create(name=f'Lift {number}', muscle_group=group, equipment=equipment)
+
+    def history(self, user):
+        return list(PerformedExercise.objects.filter(workout__user=user).order_by('workout__date', 'id').values_list(
+            'workout__date', 'exercise__name', 'reps_per_set', 'weights_per_set',
+        ))
+
+    def test_seeding_is_deterministic_and_maintains_derived_tables(self):
+        end = datetime(2025, 6, 1, tzinfo=dt_timezone.utc)
+        (first,), counts = seed_users(1, 30, 4, seed=7, prefix='a', end=end, batch_size=8)
+        (second,), _ = seed_users(1, 30, 4, seed=7, prefix='b', end=end)
+        self.assertEqual(counts['workouts'], 30)
+        self.assertEqual(counts['performed_exercises'], 120)
+        self.assertEqual(self.history(first), self.history(second))
+
+        rollups, records = rollup_snapshot(first), records_snapshot(first)
+        RollupService.rebuild(first)
+        PersonalRecordService.rebuild(first)
+        self.assertEqual(rollups, rollup_snapshot(first))
+        self.assertEqual(records, records_snapshot(first))
+
+    def test_reset_deletes_only_seeded_users_and_needs_force_without_debug(self):
+        real = User.objects.create_user(username='synthetic_sam', password='pw')
+        seed = partial(call_command, 'seed_synthetic', users=2, workouts=3, exercises=2, stdout=io.StringIO())
+        with self.assertRaisesMessage(CommandError, 'pass --force'):
+            seed()
+        seed(force=True)
+        with self.assertRaisesMessage(CommandError, 'pass --reset'):
+            seed(force=True)
+        seed(force=True, reset=True)
+
+        self.assertTrue(User.objects.filter(pk=real.pk).exists())
+        self.assertEqual(
+            sorted(synthetic_users('synthetic').values_list('username', 'email')),
+            [('synthetic0000', 'synthetic0000@synthetic.invalid'), ('synthetic0001', 'synthetic0001@synthetic.invalid')],
+        )
+        User.objects.create_user(username='real0000', password='pw')
+        with self.assertRaisesMessage(CommandError, 'Real accounts use these usernames: real0000'):
+            seed(force=True, prefix='real')
+
+    def test_benchmark_run_rolls_back_and_flags_regressions(self):
+        results = {'small': run_size('small', ['workouts.list.summary', 'analytics.dashboard'], repeat=1)}
+        self.assertFalse(User.objects.filter(username__startswith='bench-').exists())
+        self.assertEqual(compare(results, results), [])
+
+        faster = json.loads(json.dumps(results))
+        faster['small']['analytics.dashboard']['queries'] -= 1
+        faster['small']['workouts.list.summary']['median_ms'] = -10
+        self.assertEqual(
+            [(name, reason.split()[0]) for _, name, reason in compare(results, faster)],
+            [('workouts.list.summary', 'median'), ('analytics.dashboard', 'queries')],
+        )
+
+
+@override_settings(REQUEST_TIMING_ENABLED=False)
+class LoadTestTests(LiveServerTestCase):
+    def test_scripted_sessions_run_against_a_live_server(self):
+        for number, equipment in enumerate(('barbell', 'dumbbell', 'cable', 'machine')):
+            Exercise.objects.create(name=f'Lift {number}', muscle_group='chest', equipment=equipment)
+        (user,), _ = seed_users(1, 50, 3, prefix='load')
+        stats = LoadStats()
+        client = VirtualUser(self.live_server_url, user.username, SYNTHETIC_PASSWORD, stats, random.Random(0), 0)
+        self.assertTrue(client.login())
+        for scenario in parse_mix('dashboard=3,history=2,log_workout=1'):
+            getattr(client, scenario)()
+
+        summary = stats.summary(1.0)
+        self.assertEqual(summary['total']['failures'], 0)
+        self.assertEqual(summary['endpoints']['workouts.page']['requests'], 1 + HISTORY_PAGES + 1)
+        self.assertEqual(set(summary['endpoints']), {
+            'login', 'analytics.dashboard', 'workouts.page', 'workouts.detail', 'exercises.catalog', 'workouts.create',
+        })
+        self.assertTrue(Workout.objects.filter(user=user, name='Load test session').exists())
+        with self.assertRaises(ValueError):
+            parse_mix('dashboard=1,checkout=2')
@@ -25,4 +25,8 @@ urlpatterns = router.urls + [
     path('register/', UserRegistrationView.as_view(), name='user-register'),
     path('analytics/', include('workouts.api.analytics.urls')),
     path('analytics/weekly-frequency/', weekly_frequency, name='weekly-frequency'),
+    path('export/', include('workouts.api.export.urls')),
+    path('import/', include('workouts.api.imports.urls')),
+    path('sync/', include('workouts.api.sync.urls')),
+    path('metrics/', include('workouts.api.metrics.urls')),
 ]
\ No newline at end of file
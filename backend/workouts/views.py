@@ -10,15 +10,30 @@ from .serializers import (
     WorkoutSummarySerializer
 )
 from django.contrib.auth.models import User
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
 from .services.workout_service import WorkoutService
 from .services.exercise_service import ExerciseService
 from .services.performed_exercise_service import PerformedExerciseService
 from .permissions.permissions import IsOwnerOfWorkout
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.utils.dateparse import parse_datetime
-from .analytics import get_weekly_workout_frequency
+from .analytics import get_weekly_workout_frequency, parse_date_param, parse_timezone, range_cache_key
+from .analytics_cache import cached_analytics
+from .pagination import WorkoutCursorPagination
+from .catalog import get_catalog, get_search_index, parse_fields_param, project
+from .search import (
+    DEFAULT_SEARCH_LIMIT,
+    MAX_SEARCH_LIMIT,
+    SEARCH_FILTERS,
+    SEARCH_INDEX_FIELDS,
+    SEARCH_RESULT_FIELDS,
+    ExerciseSearchIndex,
+)
+from .conditional import analytics_watermark, conditional_get, exercise_watermark, workout_watermark
 
 # Create your views here.
 class ExerciseViewSet(viewsets.ModelViewSet):
@@ -27,7 +42,14 @@ class ExerciseViewSet(viewsets.ModelViewSet):
     Return the given exercise.
 
     list:
-    Return a list of all exercises.
+    Return the global catalog plus the user's custom exercises. Pass
+    ?fields=id,name,muscle_group for a slim list.
+
+    catalog:
+    Return the global catalog only, cacheable by clients and proxies.
+
+    search:
+    Ranked exercise search for pickers and autocomplete.
 
     create:
     Create a new exercise.
@@ -48,17 +70,70 @@ class ExerciseViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return ExerciseService.get_user_exercises(self.request.user)
 
+    @conditional_get(exercise_watermark)
+    def list(self, request, *args, **kwargs):
+        # Shared catalog from the per-process cache, the user's custom exercises on top
+        fields = parse_fields_param(request.query_params.get('fields'))
+        _, catalog_rows, _ = get_catalog(fields)
+        custom = ExerciseSerializer(
+            Exercise.objects.filter(owner=request.user).order_by('id'), many=True
+        ).data
+        return Response(catalog_rows + project(custom, fields))
+
+    @action(detail=False, methods=['get'])
+    def catalog(self, request):
+        """
+        The global catalog only, identical for every user, with a strong
+        ETag and long-lived cache headers. Supports ?fields= like list.
+        """
+        etag, _, rendered = get_catalog(parse_fields_param(request.query_params.get('fields')))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(rendered, content_type='application/json')
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={settings.EXERCISE_CATALOG_MAX_AGE}'
+        return response
+
     def perform_create(self, serializer):
         # Force custom, owned by creator
         serializer.save(owner=self.request.user, is_custom=True)
 
+    def perform_update(self, serializer):
+        serializer.instance = ExerciseService.update_exercise(serializer.instance, serializer.validated_data)
+
+    def perform_destroy(self, instance):
+        ExerciseService.delete_exercise(instance)
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Ranked prefix and fuzzy search over exercise names, equipment and
+        muscles: ?q=, optional muscle_group / equipment / level / category
+        filters and limit.
+        """
+        params = request.query_params
+        query = params.get('q', '')
+        filters = {field: params[field] for field in SEARCH_FILTERS if params.get(field)}
+        try:
+            limit = max(1, min(int(params.get('limit', DEFAULT_SEARCH_LIMIT)), MAX_SEARCH_LIMIT))
+        except ValueError:
+            limit = DEFAULT_SEARCH_LIMIT
+
+        results = get_search_index().search(query, filters, limit)
+        custom = Exercise.objects.filter(owner=request.user, **filters).values(*SEARCH_INDEX_FIELDS)
+        if custom:
+            results += ExerciseSearchIndex(custom).search(query, filters, limit)
+            results.sort(key=lambda row: (-row['score'], row['name'].lower()))
+        return Response(project(results[:limit], SEARCH_RESULT_FIELDS))
+
 class WorkoutViewSet(viewsets.ModelViewSet):
     """
     retrieve:
     Return the given workout.
 
     list:
-    Return a list of all workouts for the authenticated user.
+    Return the authenticated user's workouts, newest first. Pass page_size
+    (and then the returned cursor) to page through history.
 
     create:
     Create a new workout for the authenticated user.
@@ -74,10 +149,18 @@ class WorkoutViewSet(viewsets.ModelViewSet):
     """
     serializer_class = WorkoutSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = WorkoutCursorPagination
     queryset = Workout.objects.all()
 
     def get_queryset(self):
-        return WorkoutService.get_user_workouts(self.request.user)
+        return WorkoutService.get_user_workouts(
+            self.request.user,
+            with_exercises=self.get_serializer_class() is WorkoutSerializer,
+        )
+
+    @conditional_get(workout_watermark)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     def get_serializer_class(self):
         # Use summary serializer only for list when ?summary=1
@@ -88,7 +171,25 @@ class WorkoutViewSet(viewsets.ModelViewSet):
         return WorkoutSerializer
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        data = dict(serializer.validated_data)
+        performed = data.pop('performed_exercises', [])
+        with transaction.atomic():
+            workout = WorkoutService.create_workout(self.request.user, data)
+            performed = PerformedExerciseService.bulk_create_performed_exercises(workout, performed)
+        serializer.instance = self.get_queryset().get(pk=workout.pk) if performed else workout
+        self.new_records = [record for pe in performed for record in pe.new_records]
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        # Personal records set by the logged sets, for PR badges
+        response.data['new_records'] = self.new_records
+        return response
+
+    def perform_update(self, serializer):
+        serializer.instance = WorkoutService.update_workout(serializer.instance, serializer.validated_data)
+
+    def perform_destroy(self, instance):
+        WorkoutService.delete_workout(instance)
 
 class PerformedExerciseViewSet(viewsets.ModelViewSet):
     """
@@ -118,7 +219,22 @@ class PerformedExerciseViewSet(viewsets.ModelViewSet):
         return PerformedExerciseService.get_user_performed_exercises(self.request.user)
 
     def perform_create(self, serializer):
-        PerformedExerciseService.create_performed_exercise(serializer.validated_data)
+        serializer.instance = PerformedExerciseService.create_performed_exercise(serializer.validated_data)
+        self.new_records = serializer.instance.new_records
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        # Personal records set by the logged sets, for PR badges
+        response.data['new_records'] = self.new_records
+        return response
+
+    def perform_update(self, serializer):
+        serializer.instance = PerformedExerciseService.update_performed_exercise(
+            serializer.instance, serializer.validated_data
+        )
+
+    def perform_destroy(self, instance):
+        PerformedExerciseService.delete_performed_exercise(instance)
 
 class UserRegistrationView(generics.CreateAPIView):
     """
@@ -131,10 +247,17 @@ class UserRegistrationView(generics.CreateAPIView):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_get(analytics_watermark)
 def weekly_frequency(request):
     start_raw = request.query_params.get('start_date')
     end_raw = request.query_params.get('end_date')
-    start_date = parse_datetime(start_raw) if start_raw else None
-    end_date = parse_datetime(end_raw) if end_raw else None
-    data = get_weekly_workout_frequency(request.user, start_date, end_date)
+    start_date = parse_date_param(start_raw, 'start_date')
+    end_date = parse_date_param(end_raw, 'end_date')
+    tz = parse_timezone(request.query_params.get('tz'))
+    data = cached_analytics(
+        request.user,
+        'weekly-frequency',
+        {'range': range_cache_key(start_date, end_date, tz), 'tz': tz},
+        lambda: get_weekly_workout_frequency(request.user, start_date, end_date, tz),
+    )
     return Response({'weekly_frequency': data})
\ No newline at end of file
@@ -12,8 +12,10 @@ export const getWorkouts = async () => {
   return response.data
 }
 
-export const getWorkoutSummaries = async () => {
-  const response = await api.get(`${API_BASE}/api/workouts/?summary=1`)
+// One page of workout summaries; pass the previous page's `next` URL to continue
+export const getWorkoutSummaryPage = async (next = null, pageSize = 20) => {
+  const url = next || `${API_BASE}/api/workouts/?summary=1&page_size=${pageSize}`
+  const response = await api.get(url)
   return response.data
 }
 
@@ -53,23 +55,21 @@ export const createPerformedExercise = async (workoutId, data) => {
   return response.data
 }
 
-export const createWorkoutWithExercises = async (date, performedExercises, name, total_volume) => {
+export const createWorkoutWithExercises = async (date, performedExercises, name) => {
   try {
-    // First create the workout (include precomputed volume)
-    const workout = await createWorkout(date, name, total_volume)
-    console.log("Created workout:", workout)
-    
-    // Then create all performed exercises for this workout
-    const createdExercises = await Promise.all(
-      performedExercises.map(exercise => 
-        createPerformedExercise(workout.id, exercise)
-      )
-    )
-    
-    return {
-      ...workout,
-      performed_exercises: createdExercises
-    }
+    // One request: the server creates the workout and its exercises atomically
+    // and returns it with total_volume already computed
+    const response = await api.post(`${API_BASE}/api/workouts/`, {
+      date,
+      name,
+      performed_exercises: performedExercises.map(exercise => ({
+        exercise_id: exercise.exercise,
+        sets: exercise.sets,
+        reps_per_set: exercise.reps_per_set,
+        weights_per_set: exercise.weights_per_set
+      }))
+    })
+    return response.data
   } catch (error) {
     console.error('Error creating workout:', error)
     throw error
@@ -86,23 +86,14 @@ export const updateWorkout = async (workoutId, data) => {
   return response.data;
 };
 
-export const getWeeklyVolumeAnalytics = async (startDate, endDate, config = {}) => {
-  const response = await api.get(
-    `analytics/weekly-volume/?start_date=${startDate}&end_date=${endDate}`,
-    config
-  );
+export const getAnalyticsDashboard = async (
+  { startDate, endDate, sections, limit = 5 } = {},
+  config = {}
+) => {
+  const params = { limit };
+  if (startDate) params.start_date = startDate;
+  if (endDate) params.end_date = endDate;
+  if (sections) params.sections = sections.join(',');
+  const response = await api.get('analytics/dashboard/', { ...config, params });
   return response.data;
 };
-
-export const getWeeklyFrequencyAnalytics = async (startDate, endDate, config = {}) => {
-  const response = await api.get(
-    `analytics/weekly-frequency/?start_date=${startDate}&end_date=${endDate}`,
-    config
-  );
-  return response.data;
-};
-
-export const getTopWorkouts = async (limit = 5, config = {}) => {
-  const response = await api.get(`analytics/top-workouts/?limit=${limit}`, config);
-  return response.data;
-};
\ No newline at end of file
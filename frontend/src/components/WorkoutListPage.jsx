@@ -446,8 +446,11 @@ export default function WorkoutListPage() {
   const {
     workouts,
     loading,
+    loadingMore,
+    hasMore,
     error,
     loadWorkouts,
+    loadMore,
     deleteWorkout: deleteWorkoutFromContext,
     loadWorkoutDetail, // NEW
   } = useWorkouts();
@@ -475,9 +478,12 @@ export default function WorkoutListPage() {
     const targetId = m ? Number(m[1]) : null;
     if (!targetId) return;
 
-    // wait until workouts are loaded and contain the id
+    // wait until workouts are loaded and contain the id, paging back if needed
     const exists = workouts.some(w => w.id === targetId);
-    if (!exists) return;
+    if (!exists) {
+      if (hasMore) loadMore().catch(() => {});
+      return;
+    }
 
     setExpanded(targetId);
     // smooth scroll to the title with an offset so it's not cut off
@@ -492,7 +498,7 @@ export default function WorkoutListPage() {
 
     // clear hash so back button feels normal
     navigate(location.pathname + location.search, { replace: true });
-  }, [workouts]);
+  }, [workouts, hasMore]);
 
   // Fetch details when a workout is expanded (deduped and cached in context)
   useEffect(() => {
@@ -557,6 +563,24 @@ export default function WorkoutListPage() {
             );
           })}
         </AnimatePresence>
+        {hasMore && (
+          <div className="flex justify-center pt-2">
+            <Button
+              variant="outline"
+              onClick={() => loadMore().catch(() => {
+                toast({
+                  title: "Error",
+                  description: "Failed to load older workouts. Please try again.",
+                  variant: "destructive",
+                  duration: 3000,
+                });
+              })}
+              disabled={loadingMore}
+            >
+              {loadingMore ? "Loading..." : "Load more"}
+            </Button>
+          </div>
+        )}
       </div>
     );
   };
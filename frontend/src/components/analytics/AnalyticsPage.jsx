@@ -2,9 +2,12 @@ import { Tabs, TabsList, TabsTrigger, TabsContent } from "../ui/tabs";
 import OverallProgressTab from "./tabs/OverallProgressTab";
 import MuscleGroupsTab from "./tabs/MuscleGroupsTab";
 import ExercisesTab from "./tabs/ExercisesTab";
+import useAnalyticsDashboard from "../../hooks/useAnalyticsDashboard";
 
 export default function AnalyticsPage() {
   console.log('AnalyticsPage rendered');
+  // One request feeds every card on the Overall tab
+  const { dashboard, isLoading, error } = useAnalyticsDashboard();
 
   return (
     <div className="container mx-auto p-4 max-w-7xl">
@@ -21,7 +24,7 @@ export default function AnalyticsPage() {
         </TabsList>*/}
 
         <TabsContent value="overall">
-          <OverallProgressTab />
+          <OverallProgressTab dashboard={dashboard} isLoading={isLoading} error={error} />
         </TabsContent>
 
         <TabsContent value="muscle-groups">
@@ -1,58 +1,17 @@
 // frontend/src/components/analytics/cards/CurrentWeekCard.jsx
-import { useEffect, useState } from "react";
 import { Card, CardHeader, CardTitle } from "../../ui/card";
 import { Dumbbell, TrendingUp, TrendingDown, CalendarDays } from "lucide-react";
-import { subMonths, startOfISOWeek, endOfISOWeek } from "date-fns";
-import { getWeeklyVolumeAnalytics } from "../../../api";
-
-export default function CurrentWeekCard() {
-  const [loading, setLoading] = useState(true);
-  const [stats, setStats] = useState({
-    latest: 0,     // current week-to-date total
-    workouts: 0,   // workouts so far this week
-    avg: 0,        // avg vol/workout this week
-    prevAvg: 0,    // last week's avg vol/workout
-    prevTotal: 0,  // last week's total volume
-  });
-
-  useEffect(() => {
-    let cancelled = false;
-
-    (async () => {
-      try {
-        const startDate = subMonths(new Date(), 6).toISOString();
-        const endDate = new Date().toISOString();
-        const resp = await getWeeklyVolumeAnalytics(startDate, endDate);
-        const arr = resp?.weekly_volumes || [];
-
-        if (!arr.length) {
-          if (!cancelled) setStats({ latest: 0, workouts: 0, avg: 0, prevAvg: 0, prevTotal: 0 });
-          return;
-        }
-
-        const current = arr[arr.length - 1] || {};
-        const latest = Number(current.totalVolume || 0);
-        const avg = Number(current.avgVolumePerWorkout || 0);
-        const workouts = current.workoutCount ?? (avg ? Math.round(latest / avg) : 0);
-
-        const prev = arr[arr.length - 2] || {};
-        const prevAvg = Number(prev.avgVolumePerWorkout || 0);
-        const prevTotal = Number(prev.totalVolume || 0);
-
-        if (!cancelled) {
-          setStats({ latest, workouts, avg, prevAvg, prevTotal });
-        }
-      } catch {
-        if (!cancelled) setStats({ latest: 0, workouts: 0, avg: 0, prevAvg: 0, prevTotal: 0 });
-      } finally {
-        if (!cancelled) setLoading(false);
-      }
-    })();
-
-    return () => {
-      cancelled = true;
-    };
-  }, []);
+import { startOfISOWeek, endOfISOWeek } from "date-fns";
+
+export default function CurrentWeekCard({ currentWeek, loading }) {
+  const previous = currentWeek?.previous || {};
+  const stats = {
+    latest: Number(currentWeek?.totalVolume || 0),          // current week-to-date total
+    workouts: currentWeek?.workoutCount || 0,                // workouts so far this week
+    avg: Number(currentWeek?.avgVolumePerWorkout || 0),     // avg vol/workout this week
+    prevAvg: Number(previous.avgVolumePerWorkout || 0),     // last week's avg vol/workout
+    prevTotal: Number(previous.totalVolume || 0),           // last week's total volume
+  };
 
   // Styles
   const chipBase =
@@ -1,7 +1,6 @@
-import { useEffect, useMemo, useRef, useState } from "react";
+import { useMemo, useRef, useState } from "react";
 import { Card, CardHeader, CardTitle, CardContent } from "../../ui/card";
 import { Separator } from "../../ui/separator";
-import { getTopWorkouts } from "../../../api";
 import { format } from "date-fns";
 import { TrophyIcon } from "lucide-react";
 
@@ -37,37 +36,10 @@ function StatPill({ icon: Icon, value, label }) {
   );
 }
 
-export default function TopWorkoutsCard() {
-  const [data, setData] = useState(null);
+export default function TopWorkoutsCard({ topWorkouts, isLoading, error }) {
   const [visibleCount, setVisibleCount] = useState(10);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState(null);
   const scrollRef = useRef(null);
-
-  useEffect(() => {
-    const controller = new AbortController();
-    const fetchTopWorkouts = async () => {
-      try {
-        const res = await getTopWorkouts(100, { signal: controller.signal });
-        const list = res?.top_workouts ?? res?.results ?? res?.items ?? res ?? [];
-        setData(Array.isArray(list) ? list : []);
-      } catch (e) {
-        const isAbort =
-          e?.name === "AbortError" ||
-          e?.name === "CanceledError" ||
-          e?.code === "ERR_CANCELED" ||
-          String(e?.message || "").toLowerCase().includes("abort");
-        if (!isAbort) {
-          setError("Failed to load top workouts");
-          setData([]);
-        }
-      } finally {
-        setLoading(false);
-      }
-    };
-    fetchTopWorkouts();
-    return () => controller.abort();
-  }, []);
+  const data = isLoading ? null : topWorkouts ?? [];
 
   const hasMore = visibleCount < (data?.length || 0);
   const visible = useMemo(() => data?.slice(0, visibleCount), [data, visibleCount]);
@@ -109,7 +81,7 @@ export default function TopWorkoutsCard() {
             ))}
           </div>
         ) : error ? (
-          <div className="text-destructive text-center py-4">{error}</div>
+          <div className="text-destructive text-center py-4">Failed to load top workouts</div>
         ) : data.length === 0 ? (
           <div className="text-muted-foreground text-center py-8">No top workouts yet.</div>
         ) : (
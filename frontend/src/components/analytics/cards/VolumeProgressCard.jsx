@@ -2,7 +2,7 @@ import { Card, CardHeader, CardTitle, CardContent } from "../../ui/card";
 import WeeklyVolumeChart from "../charts/WeeklyVolumeChart";
 import { LineChart } from "lucide-react";
 
-export default function VolumeProgressCard() {
+export default function VolumeProgressCard({ weeklyVolumes, isLoading, error }) {
   return (
     <Card className="relative rounded-2xl border bg-card/60 ring-1 ring-border/50 pb-4">
       <div
@@ -22,7 +22,7 @@ export default function VolumeProgressCard() {
       </CardHeader>
 
       <CardContent className="pt-6">
-        <WeeklyVolumeChart />
+        <WeeklyVolumeChart weeklyVolumes={weeklyVolumes} isLoading={isLoading} error={error} />
       </CardContent>
     </Card>
   );
@@ -3,7 +3,7 @@ import WeeklyFrequencyChart from "../charts/WeeklyFrequencyChart";
 import { BarChart } from "lucide-react";
 import { useState } from 'react';
 
-export default function WorkoutFrequencyCard() {
+export default function WorkoutFrequencyCard({ weeklyFrequency, isLoading, error }) {
   const [stats, setStats] = useState({ avg: 0, max: 0, weeks: 0 });
 
   const chip =
@@ -52,7 +52,12 @@ export default function WorkoutFrequencyCard() {
           </div>
         </div>
 
-        <WeeklyFrequencyChart onStats={setStats} />
+        <WeeklyFrequencyChart
+          weeklyFrequency={weeklyFrequency}
+          isLoading={isLoading}
+          error={error}
+          onStats={setStats}
+        />
       </CardContent>
     </Card>
   );
@@ -12,8 +12,7 @@ import {
   Cell,
   LabelList,
 } from 'recharts';
-import { subMonths, format, startOfISOWeek, endOfISOWeek, isSameMonth } from 'date-fns';
-import { getWeeklyFrequencyAnalytics } from '../../../api';
+import { format, startOfISOWeek, endOfISOWeek, isSameMonth } from 'date-fns';
 
 const getAccentColor = () => {
   if (typeof window === 'undefined') return '#22c55e';
@@ -54,49 +53,15 @@ const formatWeekRangeLabel = (weekStr) => {
   }
 };
 
-const WeeklyFrequencyChart = ({ onHover, onStats }) => {
-  const [data, setData] = useState([]);
-  const [isLoading, setIsLoading] = useState(true);
-  const [error, setError] = useState(null);
+const WeeklyFrequencyChart = ({ weeklyFrequency, isLoading, error, onHover, onStats }) => {
   const [hoverIndex, setHoverIndex] = useState(-1);
   const gradId = useId();
 
-  useEffect(() => {
-    const controller = new AbortController();
-
-    const fetchData = async () => {
-      try {
-        const startDate = subMonths(new Date(), 6).toISOString();
-        const endDate = new Date().toISOString();
-
-        const response = await getWeeklyFrequencyAnalytics(startDate, endDate, {
-          signal: controller.signal,
-        });
-        const weekly = response.weekly_frequency || [];
-
-        // Exclude current in-progress ISO week
-        const currentIsoWeek = format(new Date(), "RRRR-'W'II");
-        const filtered = weekly.filter((d) => d?.week !== currentIsoWeek);
-
-        setData(filtered);
-        setError(null);
-      } catch (err) {
-        if (
-          err.code !== 'ERR_CANCELED' &&
-          err.name !== 'CanceledError' &&
-          err.name !== 'AbortError'
-        ) {
-          console.error('Error fetching frequency analytics:', err);
-          setError('Failed to load workout frequency');
-        }
-      } finally {
-        setIsLoading(false);
-      }
-    };
-
-    fetchData();
-    return () => controller.abort();
-  }, []);
+  // Exclude current in-progress ISO week
+  const data = useMemo(() => {
+    const currentIsoWeek = format(new Date(), "RRRR-'W'II");
+    return (weeklyFrequency || []).filter((d) => d?.week !== currentIsoWeek);
+  }, [weeklyFrequency]);
 
   // Aggregate stats for chips and reference line
   const avg = useMemo(() => {
@@ -129,7 +94,7 @@ const WeeklyFrequencyChart = ({ onHover, onStats }) => {
       </div>
     );
 
-  if (error) return <div className="text-red-500 text-center p-4">{error}</div>;
+  if (error) return <div className="text-red-500 text-center p-4">Failed to load workout frequency</div>;
 
   if (!data.length)
     return (
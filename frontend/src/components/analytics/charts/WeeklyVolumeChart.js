@@ -1,5 +1,5 @@
 // frontend/src/components/analytics/WeeklyVolumeChart.js
-import { useState, useEffect } from 'react';
+import { useMemo } from 'react';
 import {
   ComposedChart,
   Area,
@@ -10,8 +10,6 @@ import {
   ResponsiveContainer,
   CartesianGrid,
 } from 'recharts';
-import { subMonths } from 'date-fns';
-import { getWeeklyVolumeAnalytics } from '../../../api';
 import { format, startOfISOWeek, endOfISOWeek, isSameMonth } from 'date-fns';
 
 const getAccentColor = () => {
@@ -51,48 +49,12 @@ const formatWeekRangeLabel = (weekStr) => {
   }
 };
 
-const WeeklyVolumeChart = () => {
-  const [data, setData] = useState([]);
-  const [isLoading, setIsLoading] = useState(true);
-  const [error, setError] = useState(null);
-
-  useEffect(() => {
-    const controller = new AbortController();
-
-    const fetchData = async () => {
-      try {
-        const startDate = subMonths(new Date(), 6).toISOString();
-        const endDate = new Date().toISOString();
-
-        const response = await getWeeklyVolumeAnalytics(startDate, endDate, {
-          signal: controller.signal,
-        });
-
-        const weekly = response.weekly_volumes || [];
-
-        // Exclude the current (in-progress) ISO week from the chart
-        const currentIsoWeek = format(new Date(), "RRRR-'W'II");
-        const filtered = weekly.filter((d) => d?.week !== currentIsoWeek);
-
-        setData(filtered);
-        setError(null);
-      } catch (error) {
-        if (
-          error.code !== 'ERR_CANCELED' &&
-          error.name !== 'CanceledError' &&
-          error.name !== 'AbortError'
-        ) {
-          console.error('Error fetching analytics:', error);
-          setError('Failed to load workout data');
-        }
-      } finally {
-        setIsLoading(false);
-      }
-    };
-
-    fetchData();
-    return () => controller.abort();
-  }, []);
+const WeeklyVolumeChart = ({ weeklyVolumes, isLoading, error }) => {
+  // Exclude the current (in-progress) ISO week from the chart
+  const data = useMemo(() => {
+    const currentIsoWeek = format(new Date(), "RRRR-'W'II");
+    return (weeklyVolumes || []).filter((d) => d?.week !== currentIsoWeek);
+  }, [weeklyVolumes]);
 
   if (isLoading)
     return (
@@ -102,7 +64,7 @@ const WeeklyVolumeChart = () => {
     );
 
   if (error)
-    return <div className="text-red-500 text-center p-4">{error}</div>;
+    return <div className="text-red-500 text-center p-4">Failed to load workout data</div>;
 
   const accent = getAccentColor();
 
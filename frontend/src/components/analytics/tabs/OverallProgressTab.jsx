@@ -4,19 +4,19 @@ import TopWorkoutsCard from "../cards/TopWorkoutsCard";
 import WorkoutFrequencyCard from "../cards/WorkoutFrequencyCard";
 import CurrentWeekCard from "../cards/CurrentWeekCard";
 
-export default function OverallProgressTab() {
+export default function OverallProgressTab({ dashboard, isLoading, error }) {
   console.log('OverallProgressTab rendered');
   
   return (
     <div className="grid gap-4">
-      <CurrentWeekCard />
+      <CurrentWeekCard currentWeek={dashboard?.current_week} loading={isLoading} />
       
       
       <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
-        <VolumeProgressCard />
-        <WorkoutFrequencyCard /> 
+        <VolumeProgressCard weeklyVolumes={dashboard?.weekly_volumes} isLoading={isLoading} error={error} />
+        <WorkoutFrequencyCard weeklyFrequency={dashboard?.weekly_frequency} isLoading={isLoading} error={error} /> 
         <div>
-          <TopWorkoutsCard />
+          <TopWorkoutsCard topWorkouts={dashboard?.top_workouts} isLoading={isLoading} error={error} />
         </div>
       </div>
     </div>
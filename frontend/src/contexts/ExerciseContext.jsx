@@ -40,7 +40,10 @@ export function ExerciseProvider({ children }) {
   const isFresh = useCallback((ts) => Date.now() - ts < TTL_MS, []);
 
   const fetchExercises = useCallback(async () => {
-    const res = await api.get("exercises/");
+    // Pickers only need these; the full catalog entries stay on the server
+    const res = await api.get("exercises/", {
+      params: { fields: "id,name,muscle_group,is_custom" },
+    });
     const list = Array.isArray(res.data) ? res.data : [];
     setExercises(list);
     lastFetchedRef.current = Date.now();
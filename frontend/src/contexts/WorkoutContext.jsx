@@ -1,5 +1,5 @@
 import { createContext, useContext, useEffect, useMemo, useRef, useState, useCallback } from "react";
-import { getWorkoutSummaries as apiGetWorkoutSummaries, deleteWorkout as apiDeleteWorkout, getWorkoutDetail as apiGetWorkoutDetail } from "../api";
+import { getWorkoutSummaryPage as apiGetWorkoutSummaryPage, deleteWorkout as apiDeleteWorkout, getWorkoutDetail as apiGetWorkoutDetail } from "../api";
 import { useAuth } from "./AuthContext";
 
 const TTL_MS = 2 * 60 * 1000; // 2 minutes
@@ -23,7 +23,7 @@ function userCacheSuffix(token) {
 
 function makeCacheKey(userToken) {
   const suffix = userToken ? userCacheSuffix(userToken) : "anon";
-  return `WORKOUTS_CACHE_v2_${suffix}`; // bump to v2 to avoid stale collisions
+  return `WORKOUTS_CACHE_v3_${suffix}`; // v3 caches the loaded pages and the next cursor
 }
 
 const sortByDateDesc = (arr) => {
@@ -34,10 +34,14 @@ export function WorkoutProvider({ children }) {
   const { user } = useAuth();
   const cacheKey = makeCacheKey(user?.token);
   const [workouts, setWorkouts] = useState([]);
+  const [nextPage, setNextPage] = useState(null); // cursor URL of the next older page, if any
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
   const lastFetchedRef = useRef(null);
   const inFlightRef = useRef(null);
+  const moreInFlightRef = useRef(null);
+  const nextPageRef = useRef(null); // cursor written with every cache update
   const pendingDeleteIds = useRef(new Set()); // barrier for optimistic deletes
   const detailInFlightRef = useRef(new Map()); // workoutId -> Promise
 
@@ -52,9 +56,10 @@ export function WorkoutProvider({ children }) {
     }
   }, [cacheKey]);
 
-  const writeCache = useCallback((data) => {
+  const writeCache = useCallback((data, next = nextPageRef.current) => {
+    nextPageRef.current = next;
     try {
-      localStorage.setItem(cacheKey, JSON.stringify({ ts: Date.now(), data }));
+      localStorage.setItem(cacheKey, JSON.stringify({ ts: Date.now(), data, next }));
     } catch {}
   }, [cacheKey]);
 
@@ -82,10 +87,13 @@ export function WorkoutProvider({ children }) {
     return list.filter(w => !pendingDeleteIds.current.has(w.id));
   }, []);
 
+  // Newest page only; older pages are fetched on demand with loadMore
   const fetchWorkouts = useCallback(async () => {
-    const data = await apiGetWorkoutSummaries();
-    const list = sortByDateDesc(Array.isArray(data) ? data : []);
+    const page = await apiGetWorkoutSummaryPage();
+    const list = sortByDateDesc(Array.isArray(page?.results) ? page.results : []);
     const masked = applyPendingDeletes(list);
+    const next = page?.next || null;
+    setNextPage(next);
 
     // Preserve existing details (performed_exercises) for unchanged workouts
     setWorkouts(prev => {
@@ -97,7 +105,7 @@ export function WorkoutProvider({ children }) {
           : w;
       });
       lastFetchedRef.current = Date.now();
-      writeCache(merged);
+      writeCache(merged, next);
       return merged;
     });
   }, [applyPendingDeletes, writeCache]);
@@ -127,6 +135,8 @@ export function WorkoutProvider({ children }) {
         const sorted = sortByDateDesc(cached.data);
         const masked = applyPendingDeletes(sorted);
         setWorkouts(masked);
+        setNextPage(cached.next || null);
+        nextPageRef.current = cached.next || null;
         lastFetchedRef.current = cached.ts;
 
         if (isFresh(cached.ts)) {
@@ -138,6 +148,32 @@ export function WorkoutProvider({ children }) {
     await doFetch(true);
   }, [readCache, isFresh, doFetch, applyPendingDeletes]);
 
+  // Append the next older page of summaries (deduped while in flight)
+  const loadMore = useCallback(async () => {
+    if (!nextPage) return;
+    if (moreInFlightRef.current) return moreInFlightRef.current;
+    const p = (async () => {
+      try {
+        setLoadingMore(true);
+        const page = await apiGetWorkoutSummaryPage(nextPage);
+        const older = applyPendingDeletes(Array.isArray(page?.results) ? page.results : []);
+        const next = page?.next || null;
+        setNextPage(next);
+        setWorkouts(prev => {
+          const seen = new Set(prev.map(w => w.id));
+          const merged = [...prev, ...older.filter(w => !seen.has(w.id))];
+          writeCache(merged, next);
+          return merged;
+        });
+      } finally {
+        setLoadingMore(false);
+        moreInFlightRef.current = null;
+      }
+    })();
+    moreInFlightRef.current = p;
+    return p;
+  }, [nextPage, applyPendingDeletes, writeCache]);
+
   // Delete with barrier + explicit post-success sync
   const deleteWorkout = useCallback(async (workoutId) => {
     const prev = workouts;
@@ -202,10 +238,14 @@ export function WorkoutProvider({ children }) {
   useEffect(() => {
     if (!user) {
       setWorkouts([]);
+      setNextPage(null);
       setError(null);
       setLoading(false);
+      setLoadingMore(false);
       lastFetchedRef.current = null;
+      nextPageRef.current = null;
       inFlightRef.current = null;
+      moreInFlightRef.current = null;
       pendingDeleteIds.current.clear();
       detailInFlightRef.current.clear();
       clearCache();
@@ -237,13 +277,13 @@ export function WorkoutProvider({ children }) {
     return () => { cancelled = true; };
   }, [workouts, loadWorkoutDetail]);
 
-  // Add a one-time cleanup effect (remove any old v1 keys):
+  // Add a one-time cleanup effect (remove any old v1/v2 keys):
   useEffect(() => {
     try {
       const keysToRemove = [];
       for (let i = 0; i < localStorage.length; i++) {
         const k = localStorage.key(i);
-        if (k && k.startsWith("WORKOUTS_CACHE_v1_")) keysToRemove.push(k);
+        if (k && (k.startsWith("WORKOUTS_CACHE_v1_") || k.startsWith("WORKOUTS_CACHE_v2_"))) keysToRemove.push(k);
       }
       keysToRemove.forEach(k => localStorage.removeItem(k));
     } catch {}
@@ -259,15 +299,18 @@ export function WorkoutProvider({ children }) {
   const value = useMemo(() => ({
     workouts,
     loading,
+    loadingMore,
+    hasMore: Boolean(nextPage),
     error,
     lastFetched: lastFetchedRef.current,
     loadWorkouts,
+    loadMore,
     refresh: () => loadWorkouts({ force: true }),
     deleteWorkout,
     upsertWorkout,
     setWorkouts,
     loadWorkoutDetail,
-  }), [workouts, loading, error, loadWorkouts, deleteWorkout, upsertWorkout, loadWorkoutDetail]);
+  }), [workouts, loading, loadingMore, nextPage, error, loadWorkouts, loadMore, deleteWorkout, upsertWorkout, loadWorkoutDetail]);
 
   return (
     <WorkoutContext.Provider value={value}>
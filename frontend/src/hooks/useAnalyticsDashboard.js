@@ -0,0 +1,51 @@
+import { useState, useEffect } from 'react';
+import { subMonths } from 'date-fns';
+import { getAnalyticsDashboard } from '../api';
+
+// Top workouts the Progress page can scroll through (the server's maximum)
+const TOP_WORKOUTS_LIMIT = 100;
+
+const isAbort = (error) =>
+  error?.code === 'ERR_CANCELED' ||
+  error?.name === 'CanceledError' ||
+  error?.name === 'AbortError';
+
+// Every Progress card's data for the last 6 months, from one dashboard request
+const useAnalyticsDashboard = () => {
+  const [dashboard, setDashboard] = useState(null);
+  const [isLoading, setIsLoading] = useState(true);
+  const [error, setError] = useState(null);
+
+  useEffect(() => {
+    const controller = new AbortController();
+
+    const fetchDashboard = async () => {
+      try {
+        const data = await getAnalyticsDashboard(
+          {
+            startDate: subMonths(new Date(), 6).toISOString(),
+            endDate: new Date().toISOString(),
+            limit: TOP_WORKOUTS_LIMIT,
+          },
+          { signal: controller.signal }
+        );
+        setDashboard(data);
+        setError(null);
+      } catch (err) {
+        if (!isAbort(err)) {
+          console.error('Error fetching analytics dashboard:', err);
+          setError(err);
+        }
+      } finally {
+        if (!controller.signal.aborted) setIsLoading(false);
+      }
+    };
+
+    fetchDashboard();
+    return () => controller.abort();
+  }, []);
+
+  return { dashboard, isLoading, error };
+};
+
+export default useAnalyticsDashboard;